@@ -1,20 +1,97 @@
 # api.py
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List
 import core
+import metricas
+
+# Pool de procesos para las etapas de CPU (pdfminer + regex).  Se crea al
+# arrancar el servidor; si no existe (p. ej. en tests) se usa el pool de
+# hilos por defecto del event loop.
+_EXECUTOR: ProcessPoolExecutor | None = None
+
+
+def _n_procesos() -> int:
+    try:
+        return int(os.environ.get("OSPRO_PROCESOS") or core._cfg.get("procesos") or os.cpu_count() or 1)
+    except ValueError:
+        return os.cpu_count() or 1
 
-app = FastAPI(title="Generador OSPRO")
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI):
+    global _EXECUTOR
+    _EXECUTOR = ProcessPoolExecutor(max_workers=_n_procesos())
+    try:
+        yield
+    finally:
+        _EXECUTOR.shutdown(wait=False, cancel_futures=True)
+        _EXECUTOR = None
+
+
+app = FastAPI(title="Generador OSPRO", lifespan=_lifespan)
 
 @app.post("/autocompletar")
 async def autocompletar(file: UploadFile = File(...)):
     try:
-        datos = core.procesar_sentencia(await file.read(), file.filename)
+        datos = await core.procesar_sentencia_async(
+            await file.read(), file.filename, executor=_EXECUTOR
+        )
         return datos
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/autocompletar/batch")
+async def autocompletar_batch(files: List[UploadFile] = File(...)):
+    """Procesa varias sentencias; responde NDJSON, una línea por archivo terminado."""
+    archivos = [(f.filename, await f.read()) for f in files]
+
+    async def _ndjson():
+        async for res in core.procesar_lote_async(archivos, executor=_EXECUTOR):
+            yield json.dumps(res, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(_ndjson(), media_type="application/x-ndjson")
+
+
+@app.post("/autocompletar/stream")
+async def autocompletar_stream(file: UploadFile = File(...), formato: str = "ndjson"):
+    """Eventos de progreso de una sentencia, como NDJSON o SSE (``formato=sse``).
+
+    El último evento es ``listo`` (con los datos completos) o ``error``.
+    """
+    data = await file.read()
+    sse = formato.lower() == "sse"
+
+    def _linea(ev: dict) -> str:
+        cuerpo = json.dumps(ev, ensure_ascii=False)
+        return f"event: {ev['evento']}\ndata: {cuerpo}\n\n" if sse else cuerpo + "\n"
+
+    async def _eventos():
+        try:
+            async for ev in core.procesar_sentencia_eventos(data, file.filename, executor=_EXECUTOR):
+                yield _linea(ev)
+        except Exception as e:
+            yield _linea({"evento": "error", "detalle": str(e)})
+
+    media = "text/event-stream" if sse else "application/x-ndjson"
+    return StreamingResponse(_eventos(), media_type=media)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Contadores y tiempos por etapa en formato de texto de Prometheus."""
+    return PlainTextResponse(
+        metricas.exportar_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 class Message(BaseModel):
     role: str
     content: str
@@ -38,4 +115,3 @@ async def chat(req: ChatRequest):
         if hasattr(rsp, "to_dict"):
             return rsp.to_dict()
         return rsp
-
@@ -3,6 +3,8 @@ import re
 import uuid
 import html
 import json
+import os
+import time
 from datetime import datetime
 
 import streamlit as st
@@ -18,8 +20,10 @@ from core import (
     MAX_IMPUTADOS,
 )  # lógica de autocompletado y listas
 from helpers import dialog_link, strip_dialog_links, create_clipboard_html
+import metricas
 
 CARACTER_ENTREGA = ["definitivo", "de depositario judicial"]
+_T0_RERUN = time.perf_counter()
 
 # ────────── util: copiar al portapapeles ────────────────────────────
 def copy_to_clipboard(texto: str) -> None:
@@ -86,13 +90,17 @@ span.editable {
     text-decoration: none !important;
     cursor: pointer !important;
 }
-/* Scroll horizontal para los títulos de las pestañas de oficios */
-div[role="tablist"] {
+/* Scroll horizontal para la barra de oficios */
+div[role="radiogroup"] {
+    flex-wrap: nowrap !important;
     overflow-x: auto;
     overflow-y: hidden;
     padding-bottom: 8px;
 }
-div[role="tablist"]::-webkit-scrollbar {
+div[role="radiogroup"] label {
+    white-space: nowrap;
+}
+div[role="radiogroup"]::-webkit-scrollbar {
     height: 8px;
 }
 </style>
@@ -100,7 +108,7 @@ div[role="tablist"]::-webkit-scrollbar {
 (function() {
   const doc = window.parent.document;
   function bindWheel() {
-    const el = doc.querySelector('div[role="tablist"]');
+    const el = doc.querySelector('div[role="radiogroup"]');
     if (!el || el.dataset.wheelbound) return;
     el.dataset.wheelbound = '1';
     el.addEventListener('wheel', (evt) => {
@@ -338,14 +346,45 @@ if isinstance(edit_event, dict):
 
 
 # ────────── procesamiento diferido del autocompletar ────────────────
+def _texto_etapa(ev: dict) -> str | None:
+    """Mensaje legible para un evento de progreso del autocompletar."""
+    nombre = ev["evento"]
+    if nombre == "texto_extraido":
+        return f"Texto extraído ({ev['caracteres']:,} caracteres)"
+    if nombre == "pies_limpios":
+        return "Pies de página limpiados"
+    if nombre == "bloque_imputados":
+        return "Bloque de imputados encontrado" if ev["encontrado"] else "Sin bloque de imputados: se usa el texto completo"
+    if nombre == "segmentados":
+        return f"{ev['bloques']} bloque(s) segmentado(s), {ev['imputados']} imputado(s)"
+    if nombre == "llm_inicio":
+        return "Consultando al modelo…"
+    if nombre == "llm_fin":
+        return f"Respuesta del modelo en {ev['ms'] / 1000:.1f} s"
+    if nombre == "postproceso":
+        return "Ajustes finales listos"
+    if nombre == "cache":
+        return "Sentencia ya procesada: datos tomados de la caché"
+    return None
+
+
 if "pending_autocompletar" in st.session_state:
     file_bytes, filename = st.session_state.pop("pending_autocompletar")
-    try:
-        autocompletar(file_bytes, filename)
-    except RuntimeError as exc:
-        st.session_state["ac_error"] = str(exc)
-    else:
-        st.session_state["ac_success"] = True
+    with st.status("Procesando sentencia…", expanded=True) as estado:
+        def _progreso(ev: dict) -> None:
+            msg = _texto_etapa(ev)
+            if msg:
+                estado.update(label=msg)
+                st.write(msg)
+
+        try:
+            autocompletar(file_bytes, filename, progreso=_progreso)
+        except RuntimeError as exc:
+            st.session_state["ac_error"] = str(exc)
+            estado.update(label="Error al procesar la sentencia", state="error")
+        else:
+            st.session_state["ac_success"] = True
+            estado.update(label="Sentencia procesada", state="complete", expanded=False)
 
 def html_copy_button(label: str, html_fragment: str, *, key: str | None = None):
     btn_id    = key or f"btn_{uuid.uuid4().hex}"
@@ -387,7 +426,7 @@ def html_copy_button(label: str, html_fragment: str, *, key: str | None = None):
         components.html(js, height=40)              # Streamlit ≤ 1.29
 
 def connect_tabs(a: str, b: str) -> None:
-    """Draw a line between two tabs identified by their titles."""
+    """Draw a line between two oficios of the bar identified by their titles."""
     uid = re.sub(r"\W+", "_", f"related_indicator_{a}_{b}")
     js = f"""
     <script>
@@ -397,7 +436,7 @@ def connect_tabs(a: str, b: str) -> None:
       function draw() {{
         const id = {json.dumps(uid)};
         const old = doc.getElementById(id); if (old) old.remove();
-        const tabs = Array.from(doc.querySelectorAll('button[role="tab"]'));
+        const tabs = Array.from(doc.querySelectorAll('div[role="radiogroup"] label'));
         const ta = tabs.find(el => el.innerText.trim() === {json.dumps(a)});
         const tb = tabs.find(el => el.innerText.trim() === {json.dumps(b)});
         if (!ta || !tb) return;
@@ -419,7 +458,7 @@ def connect_tabs(a: str, b: str) -> None:
       doc.addEventListener('click', draw);
       win.addEventListener('resize', draw);
       win.addEventListener('scroll', draw, {{passive: true}});
-      const tabList = doc.querySelector('div[role="tablist"]');
+      const tabList = doc.querySelector('div[role="radiogroup"]');
       if (tabList) tabList.addEventListener('scroll', draw, {{passive: true}});
     }})();
     </script>
@@ -428,15 +467,9 @@ def connect_tabs(a: str, b: str) -> None:
 
 
 
-def switch_tab(name: str) -> None:
-    js = f"""
-    <script>
-      const tabs = parent.document.querySelectorAll('button[role="tab"]');
-      const t = Array.from(tabs).find(el => el.innerText.trim() === {json.dumps(name)});
-      if (t) t.click();
-    </script>
-    """
-    _html_compat(js, height=0)
+def _ir_a_oficio() -> None:
+    """La barra de oficios manda: la lateral ("Ir a oficio") la sigue."""
+    st.session_state.tab_select = st.session_state.tab_barra
 
 
 # ────────── helpers: acceso dinámico a imputados ───────────────────
@@ -523,6 +556,17 @@ with st.sidebar:
         st.error(err)
     elif st.session_state.pop("ac_success", False):
         st.success("Campos cargados. Revisá y editá donde sea necesario.")
+
+    # panel de depuración: OSPRO_DEBUG=1 o ?debug=1 en la URL
+    if os.environ.get("OSPRO_DEBUG") or st.query_params.get("debug"):
+        with st.expander("Métricas del motor", expanded=False):
+            foto = metricas.instantanea()
+            if foto["tiempos_ms"]:
+                st.table([{"serie": k, **v} for k, v in foto["tiempos_ms"].items()])
+            if foto["contadores"]:
+                st.json(foto["contadores"])
+            if not (foto["tiempos_ms"] or foto["contadores"]):
+                st.caption("Todavía no se procesó ninguna sentencia.")
     with imp_expanders_slot:   # 👈 se dibujan debajo de "Número de imputados"
         # pestañas de imputados en sidebar
         for i in range(st.session_state.n_imputados):
@@ -562,12 +606,18 @@ st.selectbox(
     key="imp_sel",
 )
 
-tabs = st.tabs(TAB_NAMES)
+# Sólo se arma el oficio visible: los demás se construyen al elegirlos
+# (con st.tabs Streamlit corría y enviaba los 17 en cada rerun).
+st.session_state.tab_barra = tab_dest
+st.radio(
+    "Oficio", TAB_NAMES, key="tab_barra", horizontal=True,
+    label_visibility="collapsed", on_change=_ir_a_oficio,
+)
 connect_tabs("Registro Automotor", "Decomiso (Reg. Automotor)")
 connect_tabs("Decomiso Con Traslado", "Comisaría Traslado")
-switch_tab(tab_dest)
+tab_activa = TAB_NAMES.index(tab_dest)
 # ───── TAB 0 : Migraciones ─────────────────────────────────────────
-with tabs[0]:
+if tab_activa == 0:
     loc_a  = dialog_link(loc, 'loc')
     fecha  = fecha_alineada(loc_a, punto=True)
 
@@ -606,7 +656,7 @@ with tabs[0]:
     html_copy_button("Copiar", fecha_html + cuerpo_html + saludo_html, key="copy_migr")
 
 # ───── TAB 1 : Consulado ───────────────────────────────────────────
-with tabs[1]:
+if tab_activa == 1:
     loc_a  = dialog_link(loc, 'loc')
     fecha  = fecha_alineada(loc_a, punto=True)
 
@@ -641,7 +691,7 @@ with tabs[1]:
     html_copy_button("Copiar", fecha_html + cuerpo_html + saludo_html, key="copy_cons")
 
 # ───── TAB 2 : Juez Electoral ──────────────────────────────────────
-with tabs[2]:
+if tab_activa == 2:
     loc_a  = dialog_link(loc, 'loc')
     fecha  = fecha_alineada(loc_a, punto=True)
 
@@ -675,7 +725,7 @@ with tabs[2]:
 
     html_copy_button("Copiar", fecha_html + cuerpo_html + saludo_html, key="copy_electoral")
 # ───── TAB 3 : Policía Documentación ────────────────────────────────
-with tabs[3]:
+if tab_activa == 3:
     loc_a  = dialog_link(loc, 'loc')
     fecha  = fecha_alineada(loc_a, punto=True)
 
@@ -715,7 +765,7 @@ with tabs[3]:
     html_copy_button("Copiar", fecha_html + cuerpo_html + saludo_html, key="copy_poldoc")
 
 # ───── TAB 4 : Registro Civil ───────────────────────────────────────
-with tabs[4]:
+if tab_activa == 4:
     loc_a  = dialog_link(loc, 'loc')
     fecha  = fecha_alineada(loc_a, punto=True)
 
@@ -749,7 +799,7 @@ with tabs[4]:
     html_copy_button("Copiar", fecha_html + cuerpo_html + saludo_html, key="copy_regciv")
 
 # ───── TAB 5 : Reg. Condenados Sexuales ────────────────────────────
-with tabs[5]:
+if tab_activa == 5:
     loc_a  = dialog_link(loc, 'loc')
     fecha  = fecha_alineada(loc_a, punto=True)
 
@@ -808,7 +858,7 @@ with tabs[5]:
     html_copy_button("Copiar", fecha_html + cuerpo_html + saludo_html, key="copy_rcs")
 
 # ───── TAB 6 : RNR ─────────────────────────────────────────────────
-with tabs[6]:
+if tab_activa == 6:
     loc_a  = dialog_link(loc, 'loc')
     fecha  = fecha_alineada(loc_a, punto=True)
 
@@ -848,7 +898,7 @@ with tabs[6]:
     html_copy_button("Copiar", fecha_html + cuerpo_html + saludo_html, key="copy_rnr")
 
 # ───── TAB 7 : Complejo Carcelario ────────────────────────────────
-with tabs[7]:
+if tab_activa == 7:
     loc_a  = dialog_link(loc, 'loc')
     fecha  = fecha_alineada(loc_a)
 
@@ -880,7 +930,7 @@ with tabs[7]:
     html_copy_button("Copiar", fecha_html + cuerpo_html + saludo_html, key="copy_comcar")
 
 # ───── TAB 8 : Juzgado Niñez-Adolescencia ─────────────────────────
-with tabs[8]:
+if tab_activa == 8:
     loc_a  = dialog_link(loc, 'loc')
     fecha  = fecha_alineada(loc_a, punto=True)
 
@@ -919,7 +969,7 @@ with tabs[8]:
     html_copy_button("Copiar", fecha_html + cuerpo_html + saludo_html, key="copy_jninez")
 
 # ───── TAB 9 : RePAT ───────────────────────────────────────────────
-with tabs[9]:
+if tab_activa == 9:
     loc_a  = dialog_link(loc, 'loc')
     fecha  = fecha_alineada(loc_a, punto=True)
 
@@ -953,7 +1003,7 @@ with tabs[9]:
     html_copy_button("Copiar", fecha_html + cuerpo_html + saludo_html, key="copy_repat")
 
 # ───── TAB 10 : Fiscalía Instrucción ───────────────────────────────
-with tabs[10]:
+if tab_activa == 10:
     loc_a  = dialog_link(loc, 'loc')
     fecha  = fecha_alineada(loc_a, punto=True)
 
@@ -990,7 +1040,7 @@ with tabs[10]:
     html_copy_button("Copiar", fecha_html + cuerpo_html + saludo_html, key="copy_fiscinst")
 
 # ───── TAB 11 : Automotores Secuestrados ───────────────────────────
-with tabs[11]:
+if tab_activa == 11:
     loc_a  = dialog_link(loc, 'loc')
     fecha  = fecha_alineada(loc_a, punto=True)
 
@@ -1023,7 +1073,7 @@ with tabs[11]:
     html_copy_button("Copiar", fecha_html + cuerpo_html + saludo_html, key="copy_autosec")
 
 # ───── TAB 12 : Registro Automotor ─────────────────────────────────
-with tabs[12]:
+if tab_activa == 12:
     loc_a  = dialog_link(loc, 'loc')
     fecha  = fecha_alineada(loc_a, punto=True)
 
@@ -1056,7 +1106,7 @@ with tabs[12]:
     html_copy_button("Copiar", fecha_html + cuerpo_html + saludo_html, key="copy_regauto")
 
 # ───── TAB 13 : Decomiso (Reg. Automotor) ──────────────────────────
-with tabs[13]:
+if tab_activa == 13:
     loc_a  = dialog_link(loc, 'loc')
     fecha  = fecha_alineada(loc_a, punto=True)
 
@@ -1093,7 +1143,7 @@ with tabs[13]:
     html_copy_button("Copiar", fecha_html + cuerpo_html + saludo_html, key="copy_decomregauto")
 
 # ───── TAB 14 : Decomiso Con Traslado ──────────────────────────
-with tabs[14]:
+if tab_activa == 14:
     loc_a  = dialog_link(loc, 'loc')
     fecha  = fecha_alineada(loc_a, punto=True)
 
@@ -1128,7 +1178,7 @@ with tabs[14]:
     html_copy_button("Copiar", fecha_html + cuerpo_html + saludo_html, key="copy_decom_ct")
 
 # ───── TAB 15 : Comisaría Traslado ─────────────────────────────
-with tabs[15]:
+if tab_activa == 15:
     loc_a  = dialog_link(loc, 'loc')
     fecha  = fecha_alineada(loc_a, punto=True)
 
@@ -1164,7 +1214,7 @@ with tabs[15]:
     html_copy_button("Copiar", fecha_html + cuerpo_html + saludo_html, key="copy_comis_trasl")
 
 # ───── TAB 16 : Decomiso Sin Traslado ─────────────────────────
-with tabs[16]:
+if tab_activa == 16:
     loc_a  = dialog_link(loc, 'loc')
     fecha  = fecha_alineada(loc_a, punto=True)
 
@@ -1196,5 +1246,6 @@ with tabs[16]:
     st.markdown(saludo_html, unsafe_allow_html=True)
 
     html_copy_button("Copiar", fecha_html + cuerpo_html + saludo_html, key="copy_decom_st")
+metricas.observar("etapa_ms", (time.perf_counter() - _T0_RERUN) * 1000, etapa="rerun_app")
 if st.session_state.pop("_carat_norm_rerun", False):
     st.rerun()
\ No newline at end of file
@@ -0,0 +1,68 @@
+# benchmarks/bench_app.py
+"""
+Tiempo de un rerun de la app Streamlit (``app.py``) al editar la barra lateral.
+
+Usa ``streamlit.testing.v1.AppTest``: corre el script completo sin navegador
+ni servidor, igual que lo haría Streamlit al confirmar un campo.  Carga
+``--imputados`` imputados con datos, después edita ``--ediciones`` veces la
+localidad y mide cada rerun.  Emite JSON con los percentiles y cuántos
+elementos Markdown e iframes (``components.html``) quedaron en la página::
+
+    python benchmarks/bench_app.py
+    python benchmarks/bench_app.py --imputados 5 --ediciones 30
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+from comun import RAIZ, percentiles
+
+
+def _contar(at) -> dict:
+    iframes = 0
+    pila = [at._tree]
+    while pila:
+        nodo = pila.pop()
+        if getattr(nodo, "type", "") in ("iframe", "unknown"):
+            iframes += 1
+        pila.extend(getattr(nodo, "children", {}).values())
+    return {"markdown": len(at.markdown), "iframes": iframes}
+
+
+def medir(imputados: int, ediciones: int) -> dict:
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(RAIZ / "app.py"), default_timeout=60)
+    at.run()
+    at.number_input(key="n_imp").set_value(imputados).run()
+    for i in range(imputados):
+        at.session_state[f"imp{i}_datos"] = "de 30 años, D.N.I. N° 30.123.456, argentino " * 4
+    at.session_state["sres"] = "I) Declarar... II) Ordenar el decomiso del automotor... " * 6
+    at.run()
+
+    tiempos = []
+    for n in range(ediciones):
+        campo = at.text_input(key="loc")
+        t0 = time.perf_counter()
+        campo.set_value(f"Córdoba {n}").run()
+        tiempos.append((time.perf_counter() - t0) * 1000)
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+    return {"imputados": imputados, "rerun_ms": percentiles(tiempos), "pagina": _contar(at)}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--imputados", type=int, default=3)
+    parser.add_argument("--ediciones", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    resultado = medir(args.imputados, args.ediciones)
+    print(json.dumps({"benchmark": "app_rerun", "resultado": resultado}, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,91 @@
+# benchmarks/bench_import.py
+"""
+Tiempo de ``import`` de los módulos del motor en un intérprete nuevo.
+
+Cada medición lanza ``python -X importtime -c "import <módulo>"`` y resta el
+arranque de un intérprete vacío, así que refleja lo que paga un worker de
+la API o un ``lote.py`` al iniciar.  Emite JSON con p50 por módulo, los
+imports más caros y las dependencias pesadas que se hayan cargado::
+
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py core --repeticiones 20 --max-ms 150
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+from comun import RAIZ, percentiles
+
+# No deben cargarse con ``import core``: se importan recién al usarlas
+PESADAS = ("streamlit", "pdfminer", "PyQt6", "PyQt5", "PySide6", "openai", "httpx", "docx2txt")
+
+
+def _correr(codigo: str) -> tuple[float, str]:
+    t0 = time.perf_counter()
+    res = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=RAIZ, capture_output=True, text=True, check=True,
+    )
+    return (time.perf_counter() - t0) * 1000, res.stderr
+
+
+def _mas_caros(importtime: str, n: int = 8) -> list[dict]:
+    """Los ``n`` imports con más tiempo acumulado según ``-X importtime``."""
+    filas = []
+    for linea in importtime.splitlines():
+        if not linea.startswith("import time:") or "cumulative" in linea:
+            continue
+        propio, acumulado, nombre = linea.split(":", 1)[1].split("|")
+        filas.append({
+            "modulo": nombre.strip(),
+            "propio_ms": int(propio) / 1000,
+            "acumulado_ms": int(acumulado) / 1000,
+        })
+    return sorted(filas, key=lambda f: -f["acumulado_ms"])[:n]
+
+
+def _pesadas_cargadas(modulo: str) -> list[str]:
+    codigo = f"import json, sys, {modulo}; print(json.dumps([m for m in {PESADAS!r} if m in sys.modules]))"
+    res = subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, capture_output=True, text=True, check=True)
+    return json.loads(res.stdout)
+
+
+def medir(modulo: str, repeticiones: int) -> dict:
+    vacio = [_correr("pass")[0] for _ in range(repeticiones)]
+    base = percentiles(vacio)["p50"]
+    tiempos, ultimo = [], ""
+    for _ in range(repeticiones):
+        ms, ultimo = _correr(f"import {modulo}")
+        tiempos.append(max(ms - base, 0.0))
+    return {
+        "import_ms": percentiles(tiempos),
+        "mas_caros": _mas_caros(ultimo),
+        "pesadas_cargadas": _pesadas_cargadas(modulo),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("modulos", nargs="*", default=["core", "extraccion_pdf", "metricas", "cache_sentencias"])
+    parser.add_argument("--repeticiones", type=int, default=10)
+    parser.add_argument("--max-ms", type=float, help="código 1 si el p50 de algún módulo lo supera")
+    args = parser.parse_args(argv)
+
+    resultados = {m: medir(m, args.repeticiones) for m in args.modulos}
+    print(json.dumps({"benchmark": "import", "resultados": resultados}, ensure_ascii=False, indent=2))
+
+    lentos = [m for m, r in resultados.items() if args.max_ms and r["import_ms"]["p50"] > args.max_ms]
+    pesados = [m for m, r in resultados.items() if r["pesadas_cargadas"]]
+    for m in lentos:
+        print(f"LENTO {m}: {resultados[m]['import_ms']['p50']} ms > {args.max_ms} ms", file=sys.stderr)
+    for m in pesados:
+        print(f"PESADO {m}: carga {resultados[m]['pesadas_cargadas']}", file=sys.stderr)
+    return 1 if lentos or pesados else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
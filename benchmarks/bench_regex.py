@@ -0,0 +1,87 @@
+# benchmarks/bench_regex.py
+"""
+Costo de las expresiones regulares por documento.
+
+Arma el mapa de secciones y corre la cadena de extractores locales (bloque
+de imputados, segmentación, datos personales, carátula, tribunal,
+resuelvo, firmantes…), cada uno sobre su sección, con
+sentencias sintéticas nuevas en cada repetición, de modo que ninguna caché
+por texto ayude entre corridas, y emite JSON con p50/p95 por función::
+
+    python benchmarks/bench_regex.py --imputados 5 --paginas 40 --repeticiones 30
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from collections import defaultdict
+
+from comun import generar_sentencia, percentiles, sin_red
+
+import core
+
+TRIBUNAL_SUCIO = "Cámara en lo Criminal y Correccional de Sexta Nominación, Segundo Turno"
+
+
+def _cadena(texto: str) -> dict[str, float]:
+    """Ejecuta los extractores y devuelve ms por función."""
+    tiempos: dict[str, float] = {}
+
+    def medir(nombre, fn, *args):
+        t0 = time.perf_counter()
+        res = fn(*args)
+        tiempos[nombre] = tiempos.get(nombre, 0.0) + (time.perf_counter() - t0) * 1000
+        return res
+
+    # como AnalisisDocumento: cada extractor sobre su sección del mapa
+    mapa = medir("mapear_secciones", core.mapear_secciones, texto)
+    encabezado = mapa.tramo("encabezado")
+    dispositivo = mapa.desde("resuelvo") or texto
+    bloque = medir("extraer_bloque_imputados", core.extraer_bloque_imputados, encabezado)
+    base = bloque or texto
+    bloques = medir("segmentar_imputados", core.segmentar_imputados, base)
+    for b in bloques:
+        medir("_es_bloque_valido", core._es_bloque_valido, b)
+        medir("es_multipersona", core.es_multipersona, b)
+        medir("extraer_datos_personales", core.extraer_datos_personales, b)
+    medir("extraer_caratula", core.extraer_caratula, encabezado)
+    medir("extraer_tribunal", core.extraer_tribunal, encabezado)
+    medir("extraer_resuelvo", core.extraer_resuelvo, dispositivo)
+    medir("extraer_firmantes", core.extraer_firmantes, dispositivo)
+    medir("_sanitize_dp_text", core._sanitize_dp_text, TRIBUNAL_SUCIO)
+    medir("_alinear_a_opcion", core._alinear_a_opcion, TRIBUNAL_SUCIO, core.TRIBUNALES)
+    return tiempos
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--imputados", type=int, default=3)
+    parser.add_argument("--paginas", type=int, default=20)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    sin_red(core)
+    _cadena(generar_sentencia(args.imputados, args.paginas, semilla=-1))   # calentamiento
+
+    por_funcion: dict[str, list[float]] = defaultdict(list)
+    totales: list[float] = []
+    for i in range(args.repeticiones):
+        texto = generar_sentencia(args.imputados, args.paginas, semilla=i)
+        tiempos = _cadena(texto)
+        for nombre, ms in tiempos.items():
+            por_funcion[nombre].append(ms)
+        totales.append(sum(tiempos.values()))
+
+    print(json.dumps({
+        "benchmark": "regex",
+        "imputados": args.imputados,
+        "paginas": args.paginas,
+        "total_ms": percentiles(totales),
+        "por_funcion_ms": {k: percentiles(v) for k, v in sorted(por_funcion.items())},
+    }, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,169 @@
+# benchmarks/bench_sentencias.py
+"""
+Latencia y memoria por etapa de ``core.procesar_sentencia``.
+
+Mide extracción de texto, limpieza de pies, mojibake, bloque de imputados,
+segmentación, datos personales y resuelvo sobre los PDF de referencia del
+repositorio y sobre sentencias sintéticas (de 1 a ``MAX_IMPUTADOS``
+imputados y de 10 a 300 páginas).  El cliente de OpenAI se reemplaza por
+uno falso, así que no hace falta red ni API key.  Emite JSON con p50/p95
+por etapa y el pico de memoria (``tracemalloc``) de cada documento::
+
+    python benchmarks/bench_sentencias.py > resultado.json
+    python benchmarks/bench_sentencias.py --imputados 1,20 --paginas 10,300 --repeticiones 3
+
+Con ``--comparar base.json`` termina con código 1 si el p50 total de algún
+documento empeora más que ``--tolerancia`` respecto de esa corrida.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable
+
+from comun import RAIZ, como_docx, generar_sentencia, percentiles, sin_red
+
+import core
+
+ETAPAS = (
+    "extraer_texto",
+    "limpiar_pies_de_pagina",
+    "_fix_mojibake",
+    "extraer_bloque_imputados",
+    "segmentar_imputados",
+    "extraer_datos_personales",
+    "extraer_resuelvo",
+)
+
+
+def _etapas(file_bytes: bytes, filename: str) -> dict[str, float]:
+    """Corre las etapas locales en orden y devuelve ms por etapa."""
+    tiempos: dict[str, float] = dict.fromkeys(ETAPAS, 0.0)
+
+    def medir(nombre: str, fn: Callable, *args):
+        t0 = time.perf_counter()
+        res = fn(*args)
+        tiempos[nombre] += (time.perf_counter() - t0) * 1000
+        return res
+
+    texto = medir("extraer_texto", core.extraer_texto, file_bytes, filename)
+    texto = medir("limpiar_pies_de_pagina", core.limpiar_pies_de_pagina, texto)
+    texto = medir("_fix_mojibake", core._fix_mojibake, texto)
+    bloque = medir("extraer_bloque_imputados", core.extraer_bloque_imputados, texto)
+    for b in medir("segmentar_imputados", core.segmentar_imputados, bloque or texto):
+        medir("extraer_datos_personales", core.extraer_datos_personales, b)
+    medir("extraer_resuelvo", core.extraer_resuelvo, texto)
+    return tiempos
+
+
+def _pico_kib(file_bytes: bytes, filename: str) -> float:
+    """Pico de memoria de Python (KiB) durante una pasada por las etapas."""
+    tracemalloc.start()
+    try:
+        _etapas(file_bytes, filename)
+        return round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+    finally:
+        tracemalloc.stop()
+
+
+def _medir_documento(file_bytes: bytes, filename: str, repeticiones: int) -> dict:
+    por_etapa: dict[str, list[float]] = defaultdict(list)
+    totales: list[float] = []
+    for _ in range(repeticiones):
+        tiempos = _etapas(file_bytes, filename)
+        for nombre, ms in tiempos.items():
+            por_etapa[nombre].append(ms)
+        totales.append(sum(tiempos.values()))
+    return {
+        "bytes": len(file_bytes),
+        "total_ms": percentiles(totales),
+        "etapas_ms": {k: percentiles(por_etapa[k]) for k in ETAPAS},
+        "pico_memoria_kib": _pico_kib(file_bytes, filename),
+    }
+
+
+def _documentos(args) -> list[tuple[str, bytes, str, dict]]:
+    """(etiqueta, bytes, nombre de archivo, metadatos) de cada caso."""
+    casos: list[tuple[str, bytes, str, dict]] = []
+    if not args.sin_pdfs:
+        for ruta in sorted(RAIZ.glob("*.pdf")):
+            casos.append((ruta.name, ruta.read_bytes(), ruta.name, {"origen": "pdf"}))
+    for n in args.imputados:
+        for paginas in args.paginas:
+            texto = generar_sentencia(min(n, core.MAX_IMPUTADOS), paginas, semilla=n * 1000 + paginas)
+            meta = {"origen": "sintetica", "imputados": n, "paginas": paginas}
+            casos.append((f"sintetica-{n}imp-{paginas}pag", como_docx(texto), "sintetica.docx", meta))
+    return casos
+
+
+def _regresiones(actual: list[dict], base: dict, tolerancia: float) -> list[str]:
+    """Documentos cuyo p50 total supera ``tolerancia`` veces el de ``base``."""
+    previos = {r["documento"]: r for r in base.get("resultados", []) if "total_ms" in r}
+    avisos = []
+    for r in actual:
+        antes = previos.get(r["documento"])
+        if not antes or "total_ms" not in r:
+            continue
+        p50, p50_antes = r["total_ms"]["p50"], antes["total_ms"]["p50"]
+        # por debajo de 1 ms el ruido domina; no se marca como regresión
+        if p50 > 1.0 and p50 > p50_antes * tolerancia:
+            avisos.append(f"{r['documento']}: p50 {p50_antes} ms -> {p50} ms")
+    return avisos
+
+
+def _enteros(valor: str) -> list[int]:
+    return [int(x) for x in valor.split(",") if x.strip()]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--imputados", type=_enteros, default=[1, 5, 10, core.MAX_IMPUTADOS],
+                        help="lista separada por comas (máx. MAX_IMPUTADOS)")
+    parser.add_argument("--paginas", type=_enteros, default=[10, 50, 150, 300],
+                        help="lista separada por comas")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--sin-pdfs", action="store_true", help="solo sentencias sintéticas")
+    parser.add_argument("-o", "--salida", type=Path, help="escribe el JSON en este archivo")
+    parser.add_argument("--comparar", type=Path, help="JSON de una corrida anterior")
+    parser.add_argument("--tolerancia", type=float, default=1.25)
+    args = parser.parse_args(argv)
+
+    sin_red(core)
+    casos = _documentos(args)
+    if casos:   # calentamiento: compila regex y llena cachés de módulo
+        _etapas(casos[0][1], casos[0][2])
+
+    resultados = []
+    for etiqueta, data, filename, meta in casos:
+        try:
+            medida = _medir_documento(data, filename, args.repeticiones)
+        except Exception as e:   # un PDF ilegible no invalida el resto
+            medida = {"error": f"{type(e).__name__}: {e}"}
+        resultados.append({"documento": etiqueta, **meta, **medida})
+
+    salida = json.dumps({
+        "benchmark": "sentencias",
+        "repeticiones": args.repeticiones,
+        "resultados": resultados,
+    }, ensure_ascii=False, indent=2)
+    if args.salida:
+        args.salida.write_text(salida + "\n", encoding="utf-8")
+    else:
+        print(salida)
+
+    if args.comparar:
+        base = json.loads(args.comparar.read_text(encoding="utf-8"))
+        avisos = _regresiones(resultados, base, args.tolerancia)
+        for aviso in avisos:
+            print(f"REGRESIÓN {aviso}", file=sys.stderr)
+        return 1 if avisos else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
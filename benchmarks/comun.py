@@ -0,0 +1,123 @@
+# benchmarks/comun.py
+"""
+Utilidades compartidas por los benchmarks: sentencias sintéticas, un
+cliente de OpenAI falso (nada sale a la red) y estadísticas de latencia.
+"""
+from __future__ import annotations
+
+import io
+import json
+import random
+import statistics
+import sys
+import types
+import zipfile
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+RAIZ = Path(__file__).resolve().parents[1]
+if str(RAIZ) not in sys.path:
+    sys.path.insert(0, str(RAIZ))
+
+# ~ caracteres por página de una sentencia en A4 (Times 12, interlineado 1,5)
+CHARS_POR_PAGINA = 2800
+
+_NOMBRES = ["Juan", "María", "Carlos", "Ana", "Luis", "Sofía", "Diego", "Laura", "Pablo", "Lucía"]
+_APELLIDOS = ["Pérez", "Gómez", "Díaz", "López", "Fernández", "Sosa", "Romero", "Torres", "Álvarez", "Ruiz"]
+_RELLENO = (
+    "Que analizada la prueba incorporada al debate, corresponde tener por acreditada la "
+    "existencia material del hecho y la participación responsable del imputado, conforme "
+    "a las reglas de la sana crítica racional (art. 193 del C.P.P.). "
+)
+
+
+def _ficha(rnd: random.Random, i: int) -> str:
+    nombre = f"{rnd.choice(_NOMBRES)} {rnd.choice(_NOMBRES)} {rnd.choice(_APELLIDOS)}"
+    dni = f"{rnd.randint(20, 45)}.{rnd.randint(100, 999)}.{rnd.randint(100, 999)}"
+    return (
+        f"{i}) {nombre}, de {rnd.randint(18, 70)} años de edad, D.N.I. N° {dni}, de nacionalidad "
+        f"argentina, de estado civil soltero, de ocupación albañil, con instrucción secundaria "
+        f"incompleta, nacido el {rnd.randint(1, 28)}/{rnd.randint(1, 12)}/{rnd.randint(1955, 2005)}, "
+        f"en Córdoba, hijo de {rnd.choice(_NOMBRES)} {rnd.choice(_APELLIDOS)} y de "
+        f"{rnd.choice(_NOMBRES)} {rnd.choice(_APELLIDOS)}, con domicilio en calle San Martín "
+        f"{rnd.randint(100, 9999)}, de esta ciudad, Prontuario N° {rnd.randint(100000, 999999)} Sección AG."
+    )
+
+
+def generar_sentencia(n_imputados: int = 1, paginas: int = 10, semilla: int = 0) -> str:
+    """Sentencia sintética con ``n_imputados`` fichas y ~``paginas`` páginas."""
+    rnd = random.Random(semilla)
+    cabecera = (
+        f"SENTENCIA NÚMERO: {rnd.randint(1, 400)}. En la ciudad de Córdoba, {rnd.randint(1, 28)} de "
+        f"marzo de 2024, se dan a conocer los fundamentos de la sentencia dictada en la causa "
+        f'caratulada "{rnd.choice(_APELLIDOS).upper()}, {rnd.choice(_NOMBRES)} p.s.a. robo calificado" '
+        f"(SAC N° {rnd.randint(1000000, 9999999)}), por ante la Cámara en lo Criminal y Correccional "
+        f"de Sexta Nominación, de esta ciudad, en la que han sido traídos a proceso los imputados:\n"
+    )
+    fichas = "\n".join(_ficha(rnd, i + 1) for i in range(n_imputados))
+    final = (
+        "\nRESUELVO: I) Declarar a los imputados autores penalmente responsables del delito de robo "
+        "calificado, e imponerles la pena de cuatro años de prisión, con costas. "
+        "II) Protocolícese, hágase saber y ofíciese.\n"
+        "Texto Firmado digitalmente por: GARCIA Ana Laura\nVOCAL DE CAMARA\n"
+        "Fecha: 2024.03.05\n"
+    )
+    cuerpo_len = max(0, paginas * CHARS_POR_PAGINA - len(cabecera) - len(fichas) - len(final))
+    parrafos = []
+    total = 0
+    while total < cuerpo_len:
+        p = _RELLENO * rnd.randint(3, 8) + "\n\n"
+        parrafos.append(p)
+        total += len(p)
+    return cabecera + fichas + "\nCONSIDERANDO:\n" + "".join(parrafos)[:cuerpo_len] + final
+
+
+_W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+def como_docx(texto: str) -> bytes:
+    """Empaqueta ``texto`` en un DOCX mínimo (un párrafo por línea)."""
+    cuerpo = "".join(
+        f"<w:p><w:r><w:t xml:space=\"preserve\">{escape(linea)}</w:t></w:r></w:p>"
+        for linea in texto.split("\n")
+    )
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("word/document.xml", f"<w:document {_W}><w:body>{cuerpo}</w:body></w:document>")
+    return buf.getvalue()
+
+
+class ClienteFalso:
+    """Imita ``openai.OpenAI``: responde al instante con generales vacíos."""
+
+    def __init__(self):
+        self.llamadas = 0
+        self.chat = types.SimpleNamespace(completions=types.SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        self.llamadas += 1
+        contenido = json.dumps({"generales": {}, "imputados": []}) if "response_format" in kwargs else ""
+        msg = types.SimpleNamespace(content=contenido)
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=msg)])
+
+
+def sin_red(core) -> ClienteFalso:
+    """Reemplaza los clientes de OpenAI de ``core`` por uno falso."""
+    cliente = ClienteFalso()
+    core._get_openai_client = lambda: cliente
+    return cliente
+
+
+def percentiles(muestras_ms: list[float]) -> dict:
+    orden = sorted(muestras_ms)
+
+    def _p(q: float) -> float:
+        return round(orden[min(len(orden) - 1, int(round(q * (len(orden) - 1))))], 3)
+
+    return {
+        "n": len(orden),
+        "p50": _p(0.50),
+        "p95": _p(0.95),
+        "media": round(statistics.fmean(orden), 3),
+        "max": round(orden[-1], 3),
+    }
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+cache_sentencias.py – caché persistente de resultados de extracción
+--------------------------------------------------------------------
+
+Guarda en disco el ``dict`` final que devuelve el motor de extracción,
+indexado por el SHA-256 de los bytes subidos más una etiqueta de versión
+(extractor + prompt).  Si el mismo archivo se vuelve a cargar (otro
+imputado, otro oficio), el resultado sale del disco en milisegundos y sin
+consumir tokens.
+
+El tamaño total está acotado: al superar el límite se eliminan las
+entradas usadas hace más tiempo (LRU por fecha de modificación, que se
+"toca" en cada acierto).
+
+La comparten ``api.py`` (/autocompletar), ``app.py`` (vía
+``core.autocompletar``) y el ``Worker`` de la app de escritorio.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict
+
+# Valores por defecto (se pueden pisar con config.json o variables de entorno)
+DIR_CACHE_DEFAULT = Path.home() / ".cache" / "ospro" / "sentencias"
+MAX_MB_DEFAULT = 200
+
+
+def hash_documento(file_bytes: bytes) -> str:
+    """SHA-256 hexadecimal de los bytes del documento."""
+    return hashlib.sha256(file_bytes).hexdigest()
+
+
+class CacheSentencias:
+    """Caché LRU en disco: un archivo JSON por (documento, versión)."""
+
+    def __init__(self, directorio: str | os.PathLike, max_bytes: int, *, activa: bool = True):
+        self.directorio = Path(directorio)
+        self.max_bytes = int(max_bytes)
+        self.activa = activa
+        self._lock = threading.Lock()
+
+    # ── claves ────────────────────────────────────────────────────
+    @staticmethod
+    def clave(file_bytes: bytes, version: str) -> str:
+        """Clave estable: hash del contenido + versión del extractor/prompt."""
+        version = re.sub(r"[^\w.\-]+", "_", version or "v0")
+        return f"{hash_documento(file_bytes)}_{version}"
+
+    def _ruta(self, clave: str) -> Path:
+        # subdirectorio por prefijo para no tener miles de archivos juntos
+        return self.directorio / clave[:2] / f"{clave}.json"
+
+    # ── lectura / escritura ───────────────────────────────────────
+    def obtener(self, clave: str) -> Dict[str, Any] | None:
+        """Devuelve el ``dict`` guardado o ``None`` si no hay (o no se puede leer)."""
+        if not self.activa:
+            return None
+        ruta = self._ruta(clave)
+        try:
+            with ruta.open(encoding="utf-8") as fh:
+                datos = json.load(fh)
+            os.utime(ruta)          # marca de uso para el LRU
+        except (OSError, ValueError):
+            return None
+        return datos if isinstance(datos, dict) else None
+
+    def guardar(self, clave: str, datos: Dict[str, Any]) -> None:
+        """Escribe ``datos`` de forma atómica y poda si se superó el límite."""
+        if not self.activa:
+            return
+        ruta = self._ruta(clave)
+        try:
+            ruta.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=ruta.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                    json.dump(datos, fh, ensure_ascii=False)
+                os.replace(tmp, ruta)
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+        except (OSError, TypeError, ValueError):
+            # la caché nunca debe romper una extracción
+            return
+        self._podar()
+
+    def limpiar(self) -> None:
+        """Borra todas las entradas."""
+        for ruta in self._entradas():
+            ruta.unlink(missing_ok=True)
+
+    # ── LRU ───────────────────────────────────────────────────────
+    def _entradas(self) -> list[Path]:
+        if not self.directorio.is_dir():
+            return []
+        return list(self.directorio.glob("*/*.json"))
+
+    def tamano(self) -> int:
+        """Bytes ocupados actualmente por la caché."""
+        total = 0
+        for ruta in self._entradas():
+            try:
+                total += ruta.stat().st_size
+            except OSError:
+                pass
+        return total
+
+    def _podar(self) -> None:
+        with self._lock:
+            entradas = []
+            total = 0
+            for ruta in self._entradas():
+                try:
+                    st = ruta.stat()
+                except OSError:
+                    continue
+                entradas.append((st.st_mtime, st.st_size, ruta))
+                total += st.st_size
+            if total <= self.max_bytes:
+                return
+            entradas.sort()          # más viejas primero
+            for _mtime, size, ruta in entradas:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    ruta.unlink()
+                except OSError:
+                    continue
+                total -= size
+
+
+# ── instancia compartida por proceso ─────────────────────────────
+_CACHE: CacheSentencias | None = None
+_CACHE_LOCK = threading.Lock()
+
+
+def obtener_cache(cfg: Dict[str, Any] | None = None) -> CacheSentencias:
+    """Devuelve la caché del proceso (se crea una sola vez).
+
+    Orden de prioridad de la configuración: variables de entorno
+    (``OSPRO_CACHE_DIR``, ``OSPRO_CACHE_MAX_MB``, ``OSPRO_CACHE=0`` para
+    desactivar) → ``config.json`` (``cache_dir``, ``cache_max_mb``,
+    ``cache``) → valores por defecto.
+    """
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            cfg = cfg or {}
+            directorio = os.environ.get("OSPRO_CACHE_DIR") or cfg.get("cache_dir") or DIR_CACHE_DEFAULT
+            try:
+                max_mb = float(os.environ.get("OSPRO_CACHE_MAX_MB") or cfg.get("cache_max_mb") or MAX_MB_DEFAULT)
+            except ValueError:
+                max_mb = MAX_MB_DEFAULT
+            activa = os.environ.get("OSPRO_CACHE", "1") != "0" and cfg.get("cache", True) is not False
+            _CACHE = CacheSentencias(directorio, int(max_mb * 1024 * 1024), activa=activa)
+        return _CACHE
+
+
+__all__ = ["CacheSentencias", "obtener_cache", "hash_documento"]
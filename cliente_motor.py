@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+cliente_motor.py – el motor de extracción visto desde la app de escritorio
+---------------------------------------------------------------------------
+
+La app de escritorio (``ospro.py``) usa el mismo motor que la web y la API
+(``core.procesar_sentencia``: caché, lectura por extremos, segmentación de
+imputados, "local primero"…), de una de dos formas:
+
+* en el mismo proceso (por defecto);
+* contra un servidor ``api.py`` ya levantado, si se define
+  ``OSPRO_MOTOR_URL`` o ``motor_url`` en ``config.json``
+  (p. ej. ``http://127.0.0.1:8000``).  Así varias PC comparten un único
+  motor, su caché y su pool de procesos.
+
+En los dos casos el resultado es el mismo ``dict`` y el progreso llega
+como los eventos de ``core`` (``texto_extraido``, ``llm_inicio``…);
+:func:`describir_evento` los pasa a un texto para el diálogo de espera.
+"""
+from __future__ import annotations
+
+import json
+import os
+import urllib.request
+import uuid
+from typing import Any, Callable, Dict
+
+import core
+
+Progreso = Callable[[Dict[str, Any]], None]
+
+TIMEOUT_DEFAULT = 300
+
+
+def url_motor(cfg: Dict[str, Any] | None = None) -> str:
+    """URL del servidor: ``OSPRO_MOTOR_URL`` → ``motor_url`` de config → ``""`` (local)."""
+    cfg = cfg or {}
+    return (os.environ.get("OSPRO_MOTOR_URL") or cfg.get("motor_url") or "").strip().rstrip("/")
+
+
+def describir_evento(ev: Dict[str, Any]) -> str | None:
+    """Texto para mostrar al usuario, o ``None`` si el evento no lo amerita."""
+    nombre = ev.get("evento")
+    if nombre == "cache":
+        return "Sentencia ya procesada: recuperando datos…"
+    if nombre == "texto_extraido":
+        return f"Texto extraído ({ev.get('caracteres', 0):,} caracteres). Buscando imputados…"
+    if nombre == "segmentados":
+        return f"{ev.get('imputados', 0)} imputado(s) detectado(s)."
+    if nombre == "llm_inicio":
+        return "Consultando al modelo…"
+    if nombre == "llm_omitido":
+        return "Datos completos sin consultar al modelo."
+    if nombre == "postproceso":
+        return "Ajustando carátula, tribunal y resuelvo…"
+    return None
+
+
+def _multipart(nombre: str, data: bytes) -> tuple[bytes, str]:
+    limite = uuid.uuid4().hex
+    archivo = nombre.replace('"', "%22")
+    cabecera = (
+        f"--{limite}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{archivo}"\r\n'
+        "Content-Type: application/octet-stream\r\n\r\n"
+    ).encode("utf-8")
+    return cabecera + data + f"\r\n--{limite}--\r\n".encode("ascii"), f"multipart/form-data; boundary={limite}"
+
+
+def procesar_remoto(
+    url: str,
+    data: bytes,
+    nombre: str,
+    *,
+    progreso: Progreso | None = None,
+    timeout: float = TIMEOUT_DEFAULT,
+) -> Dict[str, Any]:
+    """Envía la sentencia a ``{url}/autocompletar/stream`` y sigue sus eventos NDJSON."""
+    cuerpo, tipo = _multipart(nombre, data)
+    pedido = urllib.request.Request(
+        f"{url}/autocompletar/stream", data=cuerpo, method="POST", headers={"Content-Type": tipo}
+    )
+    with urllib.request.urlopen(pedido, timeout=timeout) as rsp:
+        for linea in rsp:
+            if not linea.strip():
+                continue
+            ev = json.loads(linea)
+            if ev["evento"] == "error":
+                raise RuntimeError(ev.get("detalle") or "Error en el servidor del motor")
+            if progreso is not None:
+                progreso(ev)
+            if ev["evento"] == "listo":
+                return ev["datos"]
+    raise RuntimeError("El servidor del motor cortó la respuesta antes de terminar")
+
+
+def procesar(
+    data: bytes,
+    nombre: str,
+    *,
+    cfg: Dict[str, Any] | None = None,
+    progreso: Progreso | None = None,
+) -> Dict[str, Any]:
+    """Datos de la sentencia con el motor configurado (servidor o este proceso)."""
+    cfg = cfg or {}
+    url = url_motor(cfg)
+    if url:
+        return procesar_remoto(
+            url, data, nombre, progreso=progreso, timeout=float(cfg.get("motor_timeout") or TIMEOUT_DEFAULT)
+        )
+    return core.procesar_sentencia(data, nombre, progreso=progreso)
+
+
+__all__ = ["procesar", "procesar_remoto", "url_motor", "describir_evento"]
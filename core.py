@@ -12,34 +12,44 @@ La app web expone un Ãºnico nombre pÃºblico:
 """
 from __future__ import annotations
 
+import bisect
+import copy
+import functools
+import hashlib
+import io
 import json
+import logging
 import re
-import tempfile
+import threading
+import time
+import weakref
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
-from typing import Any, List, Dict
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, Iterable, List
 
 import os
-import ast
-import xmlrpc.client as xmlrpc_client
 
-import docx2txt
+import metricas
+from cache_sentencias import obtener_cache
+from textos_sentencias import obtener_textos
+from extraccion_pdf import extraer_en_paralelo, extraer_extremos, extraer_paginas, procesos_pdf
+from validadores import MESES, Validador, caratula_valida, tribunal_valido
 
-import streamlit as st            # â† para volcar datos en la UI
-from pdfminer.high_level import extract_text
+_log = logging.getLogger("ospro.core")
 
-try:
-    from PyQt6.QtCore import QRegularExpression
-except Exception:  # pragma: no cover - fallback for PyQt5 or no Qt
-    try:
-        from PyQt5.QtCore import QRegularExpression  # type: ignore
-    except Exception:  # pragma: no cover - simple stub
-        class QRegularExpression:  # minimal interface
-            def __init__(self, pattern: str):
-                self.pattern = pattern
+# asyncio y concurrent.futures sólo hacen falta en el camino asíncrono
+# (API, lote); se importan ahí para que ``import core`` sea rápido.
+if TYPE_CHECKING:
+    import asyncio
+    from concurrent.futures import Executor, Future, ThreadPoolExecutor
+
+
+def extract_text(*args: Any, **kwargs: Any) -> str:
+    """``pdfminer.high_level.extract_text``, importado recién con el primer PDF."""
+    from pdfminer.high_level import extract_text as _extract_text
+    return _extract_text(*args, **kwargs)
 
-            def match(self, text: str):
-                return re.match(self.pattern, text)
 
 # â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€ Config â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
 CONFIG_FILE = "config.json"
@@ -144,20 +154,19 @@ CONFIG_FILE = "config.json"
 HARDCODED_OPENAI_KEY = ""  # â† si insistÃ­s, pegÃ¡ aquÃ­ tu clave (temporalmente)
 
 
-def _get_openai_client():
-    """
-    Crea un cliente OpenAI robusto:
-    - Lee OPENAI_API_KEY de st.secrets â†’ ENV â†’ config.json â†’ HARDCODED.
-    - Si la key es 'sk-proj-*', no envÃ­a org/proj y purga variables.
-    - Fuerza base_url oficial y limpia proxies y bases heredadas.
-    """
-    import os, httpx, streamlit as st
-    from openai import OpenAI
+# Un cliente por huella de key y un único pool HTTP keep-alive por proceso:
+# así cada sentencia reutiliza la conexión TLS ya abierta con api.openai.com.
+_OPENAI_CLIENTES: Dict[str, Any] = {}
+_OPENAI_CLIENTES_ASYNC: "weakref.WeakKeyDictionary[Any, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+_HTTP_CLIENTE = None
+_OPENAI_LOCK = threading.Lock()
+
 
-    # 1) key
-    # --- API KEY (orden de prioridad) ---
+def _leer_openai_key() -> tuple[str, str]:
+    """Devuelve ``(origen, key)`` saneada: st.secrets → ENV → config.json → HARDCODED."""
     key_src, key = "secrets", ""
     try:
+        import streamlit as st
         key = (st.secrets.get("OPENAI_API_KEY", "") or "")
     except Exception:
         pass
@@ -168,40 +177,42 @@ def _get_openai_client():
     if not key:
         key_src, key = "HARDCODED", (HARDCODED_OPENAI_KEY or "")
 
-    # SanitizaciÃ³n fuerte (comillas, espacios, invisibles, saltos)
+    # Sanitización fuerte (comillas, espacios, invisibles, saltos)
     key = str(key)
     key = key.replace("\ufeff", "").replace("\u200b", "")  # BOM, zero-width
     key = key.strip().strip('"').strip("'")
     key = "".join(key.split())  # quita espacios/saltos en medio
 
-    # Validaciones bÃ¡sicas
+    # Validaciones básicas (locales: la autenticación real se valida en la
+    # primera llamada, sin gastar un round trip extra en models.list())
     if not key:
-        raise RuntimeError("Falta la clave de OpenAI. DefinÃ­ OPENAI_API_KEY.")
+        raise RuntimeError("Falta la clave de OpenAI. Definí OPENAI_API_KEY.")
     if not (key.startswith("sk-") or key.startswith("sk-proj-")):
-        raise RuntimeError("OPENAI_API_KEY no parece vÃ¡lida (deberÃ­a empezar con 'sk-' o 'sk-proj-').")
+        raise RuntimeError("OPENAI_API_KEY no parece válida (debería empezar con 'sk-' o 'sk-proj-').")
+    return key_src, key
 
-    # Huella para saber si cambiÃ³ realmente la key (sin exponerla)
+
+def _leer_openai_org() -> str:
+    """Organization para keys antiguas (las sk-proj-* no la llevan)."""
+    org = ""
     try:
-        import hashlib
-        fp = hashlib.sha256(key.encode("utf-8")).hexdigest()[:8]
-        print(f"DEBUG(OAI): src={key_src} len={len(key)} fp={fp}")
+        import streamlit as st
+        org = (st.secrets.get("OPENAI_ORG", "") or "").strip()
     except Exception:
         pass
+    if not org:
+        org = (os.environ.get("OPENAI_ORG", _cfg.get("org", "")) or "").strip()
+    return org
 
-    is_proj_key = key.startswith("sk-proj-")
-    if key.startswith("sk-proj-"):
-        for var in ("OPENAI_ORG","OPENAI_ORGANIZATION","OPENAI_PROJECT","OPENAI_API_BASE","OPENAI_BASE_URL"):
-            os.environ.pop(var, None)
-    try:
-        _ = OpenAI(api_key=key).models.list()
-        print("DEBUG(OAI): auth OK, se listaron modelos.")
-    except Exception as e:
-        print("DEBUG(OAI):", type(e).__name__, str(e))
-        raise
-    # 2) SIEMPRE limpiar bases heredadas y proxies
+
+def _sanitizar_entorno_openai(is_proj_key: bool) -> None:
+    """Limpia bases y proxies heredados.  Se ejecuta una vez por cliente creado."""
+    _log.debug("proxies heredados: %s", [k for k in (
+        "HTTP_PROXY", "HTTPS_PROXY", "ALL_PROXY", "http_proxy", "https_proxy", "all_proxy", "NO_PROXY", "PROXY_URL"
+    ) if os.environ.get(k)])
     for v in ("OPENAI_BASE_URL", "OPENAI_API_BASE"):
         os.environ.pop(v, None)
-    for v in ("HTTP_PROXY","HTTPS_PROXY","ALL_PROXY","http_proxy","https_proxy","all_proxy"):
+    for v in ("HTTP_PROXY", "HTTPS_PROXY", "ALL_PROXY", "http_proxy", "https_proxy", "all_proxy"):
         os.environ.pop(v, None)
     no_proxy = os.environ.get("NO_PROXY", "")
     for host in ("api.openai.com", "api.openai.com:443"):
@@ -209,49 +220,106 @@ def _get_openai_client():
             no_proxy = f"{no_proxy};{host}" if no_proxy else host
     os.environ["NO_PROXY"] = no_proxy
 
-    # 3) httpx sin proxy
-    try:
-        http_client = httpx.Client(
-            timeout=httpx.Timeout(60.0, connect=15.0, read=60.0, write=60.0),  # â† mÃ¡s generoso
-            limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
-            follow_redirects=True,
-        )
-    except Exception:
-        http_client = None
+    # Si PROXY_URL viene con placeholder/valor inválido, lo ignoramos
+    bad_tokens = ("usuario:contraseña@host:puerto", "<", ">", " ")
+    if any(t in (os.environ.get("PROXY_URL", "") or "") for t in bad_tokens):
+        os.environ.pop("PROXY_URL", None)
 
-    # 4) org/proj headers
-    org = ""
-    proj = ""
     if is_proj_key:
         # Con keys sk-proj-* NO deben existir estos headers/vars
-        for v in ("OPENAI_ORG","OPENAI_ORGANIZATION","OPENAI_PROJECT"):
+        for v in ("OPENAI_ORG", "OPENAI_ORGANIZATION", "OPENAI_PROJECT"):
             os.environ.pop(v, None)
     else:
-        # SÃ³lo organization con keys antiguas; NO mandar project
-        try:
-            org = (st.secrets.get("OPENAI_ORG","") or "").strip()
-        except Exception:
-            pass
-        if not org:
-            org = (os.environ.get("OPENAI_ORG", _cfg.get("org","")) or "").strip()
         # Evitar que un OPENAI_PROJECT heredado rompa auth
         os.environ.pop("OPENAI_PROJECT", None)
 
-    # 5) construir cliente (forzando base_url oficial)
-    kwargs = {"api_key": key, "base_url": "https://api.openai.com/v1", "timeout": 60.0}
-    if http_client is not None:
-        kwargs["http_client"] = http_client
-    if (not is_proj_key) and org:
-        kwargs["organization"] = org
 
+def _http_client():
+    """Pool httpx compartido (keep-alive, sin proxies del entorno)."""
+    global _HTTP_CLIENTE
+    if _HTTP_CLIENTE is None:
+        import httpx
+        _HTTP_CLIENTE = httpx.Client(
+            timeout=httpx.Timeout(60.0, connect=15.0, read=60.0, write=60.0),
+            limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+            follow_redirects=True,
+            trust_env=False,
+        )
+    return _HTTP_CLIENTE
 
-    # Log mÃ­nimo seguro
+
+def _http_client_async():
+    """Pool httpx asíncrono (uno por event loop, ver ``_get_async_openai_client``)."""
+    import httpx
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(60.0, connect=15.0, read=60.0, write=60.0),
+        limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+        follow_redirects=True,
+        trust_env=False,
+    )
+
+
+def _crear_openai_client(key: str, *, asincronico: bool = False):
+    import openai
+
+    is_proj_key = key.startswith("sk-proj-")
+    _sanitizar_entorno_openai(is_proj_key)
+
+    # construir cliente (forzando base_url oficial)
+    kwargs = {"api_key": key, "base_url": "https://api.openai.com/v1", "timeout": 60.0}
     try:
-        print(f"DEBUG(OAI): proj_key={is_proj_key} org_set={bool(org)} base_url={kwargs['base_url']}")
+        kwargs["http_client"] = _http_client_async() if asincronico else _http_client()
     except Exception:
         pass
+    org = "" if is_proj_key else _leer_openai_org()
+    if org:
+        kwargs["organization"] = org
+    _log.debug("cliente OpenAI: proj_key=%s org=%s async=%s", is_proj_key, bool(org), asincronico)
+    metricas.contar("openai_clientes_total", modo="async" if asincronico else "sync")
+    return openai.AsyncOpenAI(**kwargs) if asincronico else openai.OpenAI(**kwargs)
 
-    return OpenAI(**kwargs)
+
+def _get_openai_client():
+    """
+    Devuelve el cliente OpenAI del proceso, creándolo una sola vez por key:
+    - Lee OPENAI_API_KEY de st.secrets → ENV → config.json → HARDCODED.
+    - Si la key es 'sk-proj-*', no envía org/proj y purga variables.
+    - Fuerza base_url oficial y no usa proxies heredados.
+    - No valida contra la API: un 401 aparece en la primera llamada real.
+    """
+    key_src, key = _leer_openai_key()
+    fp = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+    cliente = _OPENAI_CLIENTES.get(fp)
+    if cliente is not None:
+        return cliente
+    with _OPENAI_LOCK:
+        cliente = _OPENAI_CLIENTES.get(fp)
+        if cliente is None:
+            _log.debug("key OpenAI: origen=%s huella=%s", key_src, fp[:8])
+            cliente = _crear_openai_client(key)
+            _OPENAI_CLIENTES[fp] = cliente
+    return cliente
+
+
+def _get_async_openai_client():
+    """Como :func:`_get_openai_client` pero ``AsyncOpenAI``.
+
+    El pool ``httpx.AsyncClient`` queda atado al event loop que lo creó, por
+    eso se guarda un cliente por (loop, huella de key).
+    """
+    key_src, key = _leer_openai_key()
+    fp = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    with _OPENAI_LOCK:
+        por_key = _OPENAI_CLIENTES_ASYNC.setdefault(loop, {})
+        cliente = por_key.get(fp)
+        if cliente is None:
+            _log.debug("key OpenAI: origen=%s huella=%s (async)", key_src, fp[:8])
+            cliente = _crear_openai_client(key, asincronico=True)
+            por_key[fp] = cliente
+    return cliente
 
 
 
@@ -295,6 +363,162 @@ DEPOSITOS      = [_fix_mojibake(s) for s in DEPOSITOS]
 JUZ_NAVFYG     = [_fix_mojibake(s) for s in JUZ_NAVFYG]
 TRIBUNALES     = [_fix_mojibake(s) for s in TRIBUNALES]
 
+# ───────────── Texto normalizado (espacios colapsados, una sola vez) ─────────────
+_ESPACIOS_RE = re.compile(r"\s+")
+
+
+class TextoNormalizado:
+    """Vista de ``texto`` con los espacios colapsados, calculada una vez.
+
+    ``plano`` equivale a ``re.sub(r"\\s+", " ", texto)``; ``a_original(i)``
+    traduce una posición de ``plano`` a la del texto original (el mapa se
+    arma recién la primera vez que se pide).
+    """
+
+    __slots__ = ("original", "plano", "_cortes", "_deltas")
+
+    def __init__(self, texto: str):
+        self.original = texto
+        self.plano = _ESPACIOS_RE.sub(" ", texto)
+        self._cortes: list[int] | None = None
+        self._deltas: list[int] = []
+
+    def _armar_mapa(self) -> None:
+        cortes: list[int] = []
+        deltas: list[int] = []
+        quitados = 0
+        for m in _ESPACIOS_RE.finditer(self.original):
+            extra = m.end() - m.start() - 1
+            if extra:
+                quitados += extra
+                cortes.append(m.end() - quitados)
+                deltas.append(quitados)
+        self._cortes, self._deltas = cortes, deltas
+
+    def a_original(self, i: int) -> int:
+        if self._cortes is None:
+            self._armar_mapa()
+        k = bisect.bisect_right(self._cortes, i) - 1
+        return i + (self._deltas[k] if k >= 0 else 0)
+
+
+@functools.lru_cache(maxsize=16)
+def normalizar(texto: str) -> TextoNormalizado:
+    """:class:`TextoNormalizado` compartido por todos los extractores."""
+    return TextoNormalizado(texto)
+
+
+def _plano(texto: str) -> str:
+    """Texto con espacios colapsados; los documentos largos se calculan una vez."""
+    if len(texto) < 512:
+        return _ESPACIOS_RE.sub(" ", texto)
+    return normalizar(texto).plano
+
+
+# ───────────── Patrones con tiempo acotado ─────────────
+# Los patrones de nombres (``.*?`` bajo re.S, ``[^,\n]+?`` sin tope, el
+# grupo de nombre repetido hasta siete veces) retroceden en forma cuadrática
+# sobre texto de OCR sin comas ni saltos de línea: un PDF raro puede tener
+# un núcleo ocupado por minutos.  Con el módulo ``regex`` (opcional) corren
+# con un tiempo máximo por búsqueda; sin él, sobre una ventana acotada del
+# texto.  Si se agota el tiempo el campo queda "no encontrado" y se cuenta
+# en ``regex_timeout_total{patron}``; si la ventana deja texto afuera, en
+# ``regex_ventana_total{patron}``.
+_REGEX_TIMEOUT_MS = 250
+_REGEX_VENTANA = 4000
+_REGEX_VENTANA_LINEAL = 60_000   # patrones con todos los cuantificadores acotados
+_MOTOR_REGEX: Any = None       # módulo ``regex``; False si no está instalado
+
+
+def _regex_timeout() -> float | None:
+    """Segundos por búsqueda: env ``OSPRO_REGEX_TIMEOUT_MS`` o config ``regex_timeout_ms`` (0 = sin límite)."""
+    try:
+        ms = float(os.environ.get("OSPRO_REGEX_TIMEOUT_MS") or _cfg.get("regex_timeout_ms", _REGEX_TIMEOUT_MS))
+    except (TypeError, ValueError):
+        ms = _REGEX_TIMEOUT_MS
+    return ms / 1000 if ms > 0 else None
+
+
+def _motor_regex() -> Any:
+    """El módulo ``regex`` (importado la primera vez) o ``None``."""
+    global _MOTOR_REGEX
+    if _MOTOR_REGEX is None:
+        try:
+            import regex
+            _MOTOR_REGEX = regex
+        except ImportError:
+            _MOTOR_REGEX = False
+    return _MOTOR_REGEX or None
+
+
+class PatronAcotado:
+    """Un ``re.Pattern`` cuyas búsquedas no pueden colgar el proceso.
+
+    ``search`` y ``finditer`` se usan igual que en el patrón original.  Con
+    ``regex`` instalado cada llamada tiene el tiempo de
+    :func:`_regex_timeout`; sin él, se mira a lo sumo ``ventana``
+    caracteres desde ``pos``.
+    """
+
+    __slots__ = ("nombre", "re", "ventana", "_rx")
+
+    def __init__(self, nombre: str, patron: re.Pattern, *, ventana: int = _REGEX_VENTANA):
+        self.nombre = nombre
+        self.re = patron
+        self.ventana = ventana
+        self._rx: Any = None      # compilado con ``regex`` en la primera búsqueda
+
+    @property
+    def pattern(self) -> str:
+        return self.re.pattern
+
+    def _compilado(self) -> Any:
+        if self._rx is None:
+            motor = _motor_regex()
+            try:
+                self._rx = motor.compile(self.re.pattern, self.re.flags) if motor else False
+            except Exception:       # sintaxis que ``regex`` no acepta: queda ``re`` con ventana
+                self._rx = False
+        return self._rx or None
+
+    def _agotado(self, texto: str) -> None:
+        metricas.contar("regex_timeout_total", patron=self.nombre)
+        _log.warning("%s agotó el tiempo sobre %d caracteres", self.nombre, len(texto))
+
+    def _fin(self, texto: str, pos: int) -> int:
+        fin = pos + self.ventana
+        if fin >= len(texto):
+            return len(texto)
+        metricas.contar("regex_ventana_total", patron=self.nombre)
+        return fin
+
+    def search(self, texto: str, pos: int = 0) -> Any:
+        timeout = _regex_timeout()
+        if timeout is None:
+            return self.re.search(texto, pos)
+        rx = self._compilado()
+        if rx is None:
+            return self.re.search(texto, pos, self._fin(texto, pos))
+        try:
+            return rx.search(texto, pos, timeout=timeout)
+        except TimeoutError:
+            self._agotado(texto)
+            return None
+
+    def finditer(self, texto: str, pos: int = 0) -> list:
+        """Todas las coincidencias (lista vacía si se agota el tiempo)."""
+        timeout = _regex_timeout()
+        if timeout is None:
+            return list(self.re.finditer(texto, pos))
+        rx = self._compilado()
+        if rx is None:
+            return list(self.re.finditer(texto, pos, self._fin(texto, pos)))
+        try:
+            return list(rx.finditer(texto, pos, timeout=timeout))
+        except TimeoutError:
+            self._agotado(texto)
+            return []
+
 # Â­Â­Â­ ---- bloque RESUELVE / RESUELVO â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
 _RESUELVO_REGEX = re.compile(
     r"""
@@ -320,13 +544,6 @@ _RESUELVO_REGEX = re.compile(
     """,
     re.IGNORECASE | re.DOTALL | re.VERBOSE,
 )
-# poner cerca de las regex, antes de usar CARATULA_REGEX / TRIBUNAL_REGEX
-def _qre_has_match(qre, text: str) -> bool:
-    try:
-        return bool(qre.match(text).hasMatch())   # Qt real
-    except Exception:
-        return bool(qre.match(text))              # stub o PyQt5 fallback
-
 # â”€â”€ CARÃTULA â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
 _PAT_CARAT_1 = re.compile(          # 1) entre comillas
     r'â€œ([^â€]+?)â€\s*\(\s*(?:SAC|Expte\.?)\s*NÂ°?\s*([\d.]+)\s*\)', re.I)
@@ -359,7 +576,7 @@ _PAT_CARAT_EE = re.compile(
 )
 
 def extraer_caratula(txt: str) -> str:
-    plano = re.sub(r'\s+', ' ', txt)
+    plano = _plano(txt)
     m = _PAT_CARAT_EE.search(plano)
     if m:
         titulo, nro = m.groups()
@@ -464,7 +681,7 @@ _PAT_TRIB_1 = re.compile(
     re.I
 )
 def extraer_tribunal(txt: str) -> str:
-    plano = re.sub(r'\s+', ' ', txt)
+    plano = _plano(txt)
 
     # 0) â€œresuelta/dictada por este/esta/el/la â€¦â€
     m = _PAT_TRIB_RESUELTA_POR.search(plano)
@@ -572,6 +789,11 @@ _FIRMAS_REGEX = re.compile(r'''
     (?= (?:[^\n]*\n){0,2}\s*Fecha\s*:\s*\d{4}[./-]\d{2}[./-]\d{2} )
 ''', re.IGNORECASE | re.MULTILINE | re.UNICODE | re.VERBOSE)
 
+# Las firmas siempre están cerca de una línea "Fecha: aaaa.mm.dd"; se busca
+# esa línea primero para no recorrer el cuerpo entero con _FIRMAS_REGEX.
+_FIRMA_FECHA_RE = re.compile(r"Fecha\s*:\s*\d{4}[./-]\d{2}[./-]\d{2}", re.I)
+_FIRMA_MARGEN = 2000
+
 
 # â”€â”€ validaciones de campos â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
 # CarÃ¡tula: debe incluir un nÃºmero de expediente o SAC.
@@ -580,21 +802,16 @@ _FIRMAS_REGEX = re.compile(r'''
 NAME_TOKEN = r'[A-ZÃÃ‰ÃÃ“ÃšÃ‘][A-Za-zÃÃ‰ÃÃ“ÃšÃ‘Ã¡Ã©Ã­Ã³ÃºÃ±Ã¼Ãœ.\-]+'
 CONNECTOR  = r'(?:de|del|de\s+los|de\s+las|la|las|los|y|e|da|do|dos|das|san|santa)'
 NAME_GROUP = rf'({NAME_TOKEN}(?:\s+(?:{CONNECTOR}|{NAME_TOKEN})){{1,7}})'
-CARATULA_REGEX = QRegularExpression(
-    r'^[â€œ"][^"â€]+[â€"]\s*\(\s*(?:SAC|Expte\.?|EE\.?)\s*(?:N[Â°Âº]?\s*)?\d[\d.]*\s*\)$'
-)
-NOMBRE_DNI_ANY = re.compile(
+NOMBRE_DNI_ANY = PatronAcotado("NOMBRE_DNI_ANY", re.compile(
     r'([A-ZÃÃ‰ÃÃ“ÃšÃ‘][^,\n]+?)\s*,?\s*(?:D\.?\s*N\.?\s*I\.?|DNI)',
     re.I
-)
+))
 
 # Enumerados "1) Nombre ..., alias/DNI/de N aÃ±os..."
-NOMBRE_ENUM_RE = re.compile(
+NOMBRE_ENUM_RE = PatronAcotado("NOMBRE_ENUM_RE", re.compile(
     rf'(?:\d+\)\s*)?{NAME_GROUP}\s*,\s*(?:alias|DNI|D\.?\s*N\.?\s*I\.?|de\s+\d{{1,3}}\s*aÃ±os)',
     re.I
-)
-# Tribunal: al menos una letra minÃºscula y empezar en mayÃºscula
-TRIBUNAL_REGEX = QRegularExpression(r'^(?=.*[a-zÃ¡Ã©Ã­Ã³ÃºÃ±])[A-ZÃÃ‰ÃÃ“ÃšÃ‘].*$')
+))
 
 # â”€â”€ NUEVO BLOQUE â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
 DNI_REGEX = re.compile(
@@ -645,11 +862,11 @@ NOMBRE_ROL_RE = re.compile(
     re.I
 )
 
-NOMBRE_RE  = re.compile(
+NOMBRE_RE  = PatronAcotado("NOMBRE_RE", re.compile(
     r'([A-ZÃÃ‰ÃÃ“ÃšÃ‘][A-Za-zÃÃ‰ÃÃ“ÃšÃ‘\s.\-]+?),\s*de\s*\d{1,3}\s*aÃ±os.*?'
     r'D\.?\s*N\.?\s*I\.?(?:\s*n\.?\s*Â°\s*)?:?\s*[\d.]+' ,
     re.I | re.S,
-)
+))
 NOMBRE_INICIO_RE = re.compile(
     rf'(?<!\w)(?:\d+\)\s*)?(?:[YyEe]\s+)?{NAME_GROUP}\s*,',
     re.M
@@ -693,89 +910,100 @@ _IMPUTADOS_BLOQUE_RE = re.compile(
     re.I | re.S
 )
 # Reemplazar funciÃ³n completa
+# Inicio: varias formulaciones habituales
+_BLOQUE_INICIO_RE = re.compile(
+    r'(?:'
+    r'han\s+sido\s+tra[iÃ­]d[oa]s?\s+a\s+proceso\s+los\s+imputad[oa]s?\s*:'
+    r'|imputad[oa][^:]{0,120}(?:sus|cuyas?)\s+condiciones\s+personales\s+son\s*:'
+    r'|se\s+encuentran\s+imputad[oa]s?\s*:'
+    r'|los\s+imputad[oa]s?\s*:?'                       
+    r'|en\s+esta\s+causa\s+fueron\s+acusad[oa]s?\s*:?' 
+    r'|en\s+los\s+autos\s+fueron\s+acusad[oa]s?\s*:?'
+    r'|en\s+esta\s+causa\s+fue\s+acusad[oa]\s*:?'      
+    # NUEVO: fÃ³rmula muy usada en oficios a Migraciones
+    r'|respecto\s+de\s+las?\s+personas?\s+cuy[oa]s?\s+datos\s+personales\s+se\s+mencionan\s+a\s+continuaci[oÃ³]n\s*:?' 
+    r')',
+    re.I
+)
+
+# Fin del bloque (encabezados tÃ­picos)
+_BLOQUE_FIN_RE = re.compile(
+    r'(?:La\s+audiencia\s+de\s+debate'
+    r'|Conforme\s+la\s+requisitoria'
+    r'|A\s+LA\s+PRIMERA'
+    r'|El\s+Tribunal\s+unipersonal'
+    r'|CONSIDERANDO\b'
+    r'|SENTENCI[AO]\b|SENTENCIA\s*N[Â°Âº]'
+    r'|RESUELV[EO]\b|Se\s+Resuelve\b'
+    r'|Protocol[Ã­i]cese|Notif[iÃ­]quese|Of[Ã­i]ciese'
+    r')',
+    re.I
+)
+_IMPUTADO_PALABRA_RE = re.compile(r'\bimputad[oa]s?\b', re.I)
+
+
 def extraer_bloque_imputados(texto: str) -> str:
     """
     Devuelve SOLO el tramo que enumera a los imputados.
     Empieza en la primera menciÃ³n '... los imputados:' (o variantes)
     y termina antes de la audiencia / requisitoria / A LA PRIMERA / etc.
     """
-    plano = re.sub(r'\s+', ' ', texto)
-
-    # Inicio: varias formulaciones habituales
-    pat_inicio = re.compile(
-        r'(?:'
-        r'han\s+sido\s+tra[iÃ­]d[oa]s?\s+a\s+proceso\s+los\s+imputad[oa]s?\s*:'
-        r'|imputad[oa][^:]{0,120}(?:sus|cuyas?)\s+condiciones\s+personales\s+son\s*:'
-        r'|se\s+encuentran\s+imputad[oa]s?\s*:'
-        r'|los\s+imputad[oa]s?\s*:?'                       
-        r'|en\s+esta\s+causa\s+fueron\s+acusad[oa]s?\s*:?' 
-        r'|en\s+los\s+autos\s+fueron\s+acusad[oa]s?\s*:?'
-        r'|en\s+esta\s+causa\s+fue\s+acusad[oa]\s*:?'      
-        # NUEVO: fÃ³rmula muy usada en oficios a Migraciones
-        r'|respecto\s+de\s+las?\s+personas?\s+cuy[oa]s?\s+datos\s+personales\s+se\s+mencionan\s+a\s+continuaci[oÃ³]n\s*:?' 
-        r')',
-        re.I
-    )
-
-    # Fin del bloque (encabezados tÃ­picos)
-    pat_fin = re.compile(
-        r'(?:La\s+audiencia\s+de\s+debate'
-        r'|Conforme\s+la\s+requisitoria'
-        r'|A\s+LA\s+PRIMERA'
-        r'|El\s+Tribunal\s+unipersonal'
-        r'|CONSIDERANDO\b'
-        r'|SENTENCI[AO]\b|SENTENCIA\s*N[Â°Âº]'
-        r'|RESUELV[EO]\b|Se\s+Resuelve\b'
-        r'|Protocol[Ã­i]cese|Notif[iÃ­]quese|Of[Ã­i]ciese'
-        r')',
-        re.I
-    )
+    plano = _plano(texto)
 
-    m_ini = pat_inicio.search(plano)
+    m_ini = _BLOQUE_INICIO_RE.search(plano)
     if not m_ini:
-        m_ini = re.search(r'\bimputad[oa]s?\b', plano, re.I)
+        m_ini = _IMPUTADO_PALABRA_RE.search(plano)
         if not m_ini:
             return ""
     start = m_ini.end()  # â† en vez de .start()
 
-    m_fin = pat_fin.search(plano, m_ini.end())
+    m_fin = _BLOQUE_FIN_RE.search(plano, m_ini.end())
     fin = m_fin.start() if m_fin else len(plano)
     return plano[m_ini.end():fin].strip()
 
 
+_DNI_MENCION_RE = re.compile(r'(?:D\s*\.?\s*N\s*\.?\s*I\s*\.?|DNI)\b', re.I)
+_PRIO_MENCION_RE = re.compile(r'(?:Prontuario|Prio\.?)\b', re.I)
+
+
 def es_multipersona(s: str) -> bool:
-    dnis  = re.findall(r'(?:D\s*\.?\s*N\s*\.?\s*I\s*\.?|DNI)\b', s or "", re.I)
-    prios = re.findall(r'(?:Prontuario|Prio\.?)\b', s or "", re.I)
+    dnis  = _DNI_MENCION_RE.findall(s or "")
+    prios = _PRIO_MENCION_RE.findall(s or "")
     # exigir 2 del mismo tipo; un DNI + un Prio. no alcanza
     return len(dnis) >= 2 or len(prios) >= 2
 
 
+# Listas enumeradas simples: "Imputado 1 â€“ Juan PÃ©rez"
+_ENUM_IMPUTADO_RE = re.compile(r"\bImputad[oa]\s+\d+\s*[â€“-]\s*([^\n\r]+)", re.I)
+_NAME_START_RE = PatronAcotado("_NAME_START_RE", re.compile(
+    rf'(?<!\w)(?:\d+\)\s*)?(?:[YyEe]\s+)?{NAME_GROUP}\s*,\s*'
+    rf'(?:[^,]{{0,120}},\s*)?'               # antes 80 â†’ 120 para soportar "alias â€¦,"
+    rf'(?:nacionalidad|de\s+\d{{1,3}}\s*aÃ±os|(?i:D\.?\s*N\.?\s*I\.?)|DNI)'
+), ventana=_REGEX_VENTANA_LINEAL)   # lineal: alcanza con no cortar el bloque de imputados
+_AMBOS_IMPUTADOS_RE = re.compile(r'ambos\s+imputad', re.I)
+_PRIO_FRASE_RE = re.compile(r"(?:Prontuario|Prio\.?)[^\n.]*\.", re.I)
+_PRIO_INICIO_RE = re.compile(r"(?:Prontuario|Prio\.?)", re.I)
+
+
 def segmentar_imputados(texto: str) -> list[str]:
     """Devuelve bloques 'Nombre, ...' robustos, sin falsos positivos tipo 'aÃ±os de edad'."""
-    # Listas enumeradas simples: "Imputado 1 â€“ Juan PÃ©rez"
-    enum_pat = re.compile(r"\bImputad[oa]\s+\d+\s*[â€“-]\s*([^\n\r]+)", re.I)
-    enumerados = [m.strip() for m in enum_pat.findall(texto)]
-
-    texto = enum_pat.sub(" ", texto)
-    plano = re.sub(r'\s+', ' ', texto)
+    enumerados = [m.strip() for m in _ENUM_IMPUTADO_RE.findall(texto)]
 
-    NAME_START = re.compile(
-        rf'(?<!\w)(?:\d+\)\s*)?(?:[YyEe]\s+)?{NAME_GROUP}\s*,\s*'
-        rf'(?:[^,]{{0,120}},\s*)?'               # antes 80 â†’ 120 para soportar "alias â€¦,"
-        rf'(?:nacionalidad|de\s+\d{{1,3}}\s*aÃ±os|(?i:D\.?\s*N\.?\s*I\.?)|DNI)'
-    )
+    if enumerados:
+        texto = _ENUM_IMPUTADO_RE.sub(" ", texto)
+    plano = _plano(texto)
 
 
-    hits = list(NAME_START.finditer(plano))
+    hits = _NAME_START_RE.finditer(plano)
 
     if hits:
         # Si antes del primer nombre aparece "imputados", recorto desde allÃ­.
-        if (m_ini := re.search(r'\bimputad[oa]s?\b', plano, re.I)) and m_ini.start() < hits[0].start():
+        if (m_ini := _IMPUTADO_PALABRA_RE.search(plano)) and m_ini.start() < hits[0].start():
             plano = plano[m_ini.start():]
-            hits = list(NAME_START.finditer(plano))
+            hits = _NAME_START_RE.finditer(plano)
 
         # Si aparece una frase tipo "ambos imputados ..." corto para no traer vÃ­ctimas/testigos.
-        if (m_fin := re.search(r'ambos\s+imputad', plano, re.I)):
+        if (m_fin := _AMBOS_IMPUTADOS_RE.search(plano)):
             corte = m_fin.start()
             hits = [h for h in hits if h.start() < corte]
 
@@ -786,7 +1014,7 @@ def segmentar_imputados(texto: str) -> list[str]:
         for m in hits:
             s = m.start(1)
             segmento = plano[prev:s]
-            prev_prios = list(re.finditer(r"(?:Prontuario|Prio\.?)[^\n.]*\.", segmento, re.I))
+            prev_prios = list(_PRIO_FRASE_RE.finditer(segmento))
             if prev_prios:
                 pp = prev_prios[-1]
                 cand = prev + pp.start()
@@ -803,7 +1031,7 @@ def segmentar_imputados(texto: str) -> list[str]:
 
     if not bloques:
         # Fallback: por "Prontuario/Prio."
-        prios = list(re.finditer(r"(?:Prontuario|Prio\.?)", plano, re.I))
+        prios = list(_PRIO_INICIO_RE.finditer(plano))
         for i, m in enumerate(prios):
             start = m.start()
             end = prios[i + 1].start() if i + 1 < len(prios) else len(plano)
@@ -822,23 +1050,25 @@ def segmentar_imputados(texto: str) -> list[str]:
     return bloques
 
 
+_LISTA_INTERVINIENTES_RE = re.compile(
+    r"los\s+imputad[oa]s?\s+(.{1,2000}?)\s*,?\s*y\s+sus\s+respectivos\s+defensores", re.I
+)
+_Y_ENTRE_NOMBRES_RE = re.compile(r"\s+y\s+")
+
+
 def _extraer_nombres_lista_intervinientes(texto: str) -> list[str]:
     """Extrae los nombres listados en la frase "los imputados ... y sus respectivos defensores".
 
     Devuelve una lista de nombres capitalizados; se usa como salvavidas para
     completar imputados que no fueron segmentados por ficha detallada.
     """
-    t = re.sub(r"\s+", " ", texto or "")
-    m = re.search(
-        r"los\s+imputad[oa]s?\s+(.+?)\s*,?\s*y\s+sus\s+respectivos\s+defensores",
-        t,
-        flags=re.I,
-    )
+    t = _plano(texto or "")
+    m = _LISTA_INTERVINIENTES_RE.search(t)
     if not m:
         return []
     lista = m.group(1).strip()
     # Reemplazar el Ãºltimo " y " por coma para dividir homogÃ©neo
-    lista = re.sub(r"\s+y\s+", ", ", lista)
+    lista = _Y_ENTRE_NOMBRES_RE.sub(", ", lista)
     partes = [p.strip(" ,;") for p in lista.split(",")]
     nombres: list[str] = []
     for p in partes:
@@ -860,8 +1090,9 @@ def _extraer_nombres_lista_intervinientes(texto: str) -> list[str]:
     return out
 
 
+@functools.lru_cache(maxsize=1024)
 def _es_bloque_valido(b: str) -> bool:
-    b = re.sub(r'\s+', ' ', b)
+    b = _plano(b)
     tiene_nombre = bool(NOMBRE_INICIO_RE.search(b) or NOMBRE_RE.search(b))
     tiene_id_fuerte = bool(DNI_TXT_RE.search(b) or DNI_REGEX.search(b) or PRIO_RE.search(b))
     tiene_pistas = bool(EDAD_RE.search(b) and NAC_RE.search(b))
@@ -872,11 +1103,14 @@ def _es_bloque_valido(b: str) -> bool:
 
 
 
+_PRIO_CORTE_RE = re.compile(r"(?:Prontuario|Prio\.?)[^\n;]*?\d[^\n;]*[.;]?", re.I)
+
+
 def _recortar_bloque_un_persona(b: str) -> str:
-    s = re.sub(r'\s+', ' ', b).strip()
+    s = _plano(b).strip()
     # 1) Corto en el primer "Prontuario/Prio. ... .", si existe.
     #    Pero si el nombre aparece despuÃ©s del prontuario, no recorto
-    m_prio = re.search(r"(?:Prontuario|Prio\.?)[^\n;]*?\d[^\n;]*[.;]?", s, re.I)
+    m_prio = _PRIO_CORTE_RE.search(s)
     if m_prio:
         resto = s[m_prio.end():]
         if not (NOMBRE_INICIO_RE.search(resto) or NOMBRE_RE.search(resto)):
@@ -888,9 +1122,12 @@ def _recortar_bloque_un_persona(b: str) -> str:
     return s.strip()
 
 def _es_ficha_real(b: str) -> bool:
-    s = re.sub(r'\s+', ' ', b)
+    s = _plano(b)
     return bool(DNI_TXT_RE.search(s) or PRIO_RE.search(s))  # exige DNI o Prontuario
 
+_NO_LETRAS_RE = re.compile(r'[^A-Za-z\s]')
+
+
 def _norm_name_key(nombre: str) -> str:
     """Normaliza un nombre para comparaciones robustas.
 
@@ -905,9 +1142,9 @@ def _norm_name_key(nombre: str) -> str:
         n = ''.join(ch for ch in n if _ud.category(ch) != 'Mn')
     except Exception:
         n = nombre or ''
-    n = re.sub(r'[^A-Za-z\s]', ' ', n)
+    n = _NO_LETRAS_RE.sub(' ', n)
     n = n.lower().replace('z', 's')
-    n = re.sub(r'\s+', ' ', n).strip()
+    n = _ESPACIOS_RE.sub(' ', n).strip()
     return n
 
 def _dedup_por_dni(imps: list[dict]) -> list[dict]:
@@ -951,26 +1188,76 @@ def _nombre_aparente_valido(nombre: str) -> bool:
     texto = nombre.lower()
     return not any(pal in texto for pal in ("imputado", "acusado", "alias", "dni"))
 
-def _extraer_nombre_gpt(texto: str) -> str:
+# ── Rescate de nombres con el modelo ─────────────────────────────
+# Las fichas cuyo nombre no resuelven las regex se juntan por documento y
+# se resuelven en un solo pedido (ver AnalisisDocumento._calcular_fichas).
+# Las respuestas se memorizan por el texto normalizado de la ficha: los
+# reruns, el texto base y las fichas repetidas no vuelven a consultar.
+_CHARS_NOMBRE = 1000
+_NOMBRES_MEMO_MAX = 4096
+_NOMBRES_MEMO: Dict[str, str] = {}
+_NOMBRES_LOCK = threading.Lock()
+_PROMPT_NOMBRES = (
+    "Para cada texto numerado, devolvé el nombre completo de la primera persona mencionada. "
+    'Respondé sólo con JSON de la forma {"nombres": {"0": "Nombre Apellido", "1": "..."}}, '
+    'con la misma numeración y "" si el texto no menciona a ninguna persona.'
+)
+
+
+def _clave_nombre(texto: str) -> str:
+    return _plano(texto).strip()[:_CHARS_NOMBRE]
+
+
+def _solicitar_nombres(textos: List[str]) -> Dict[str, str]:
+    """Un pedido al modelo para todos los ``textos``; ``{texto: nombre}`` (vacío si falla)."""
     try:
         client = _get_openai_client()
     except Exception:
-        return ""
+        return {}
     kwargs = dict(
         model="gpt-4o-mini",
         temperature=0,
+        response_format={"type": "json_object"},
         messages=[
-            {"role": "system", "content": "Devuelve Ãºnicamente el nombre completo de la primera persona mencionada."},
-            {"role": "user",   "content": texto[:1000]},
+            {"role": "system", "content": _PROMPT_NOMBRES},
+            {"role": "user", "content": json.dumps({str(i): t for i, t in enumerate(textos)}, ensure_ascii=False)},
         ],
-        max_tokens=20,
+        max_tokens=20 + 25 * len(textos),
     )
+    t0 = time.perf_counter()
     try:
         rsp = client.chat.completions.create(**kwargs)
-        nombre = (rsp.choices[0].message.content or "").strip()
+        nombres = json.loads(rsp.choices[0].message.content or "{}").get("nombres") or {}
     except Exception:
-        return ""
-    return capitalizar_frase(nombre.split("\n")[0].strip())
+        metricas.contar("llm_llamadas_total", tipo="nombre", resultado="error")
+        return {}
+    metricas.observar("etapa_ms", _ms_desde(t0), etapa="llm_nombre")
+    _registrar_llamada(rsp, "nombre")
+    if not isinstance(nombres, dict):
+        return {}
+    return {
+        t: capitalizar_frase(str(nombres.get(str(i)) or "").split("\n")[0].strip())
+        for i, t in enumerate(textos)
+    }
+
+
+def _extraer_nombres_gpt(textos: List[str]) -> List[str]:
+    """Nombre de la primera persona de cada texto, con a lo sumo un pedido al modelo."""
+    claves = [_clave_nombre(t) for t in textos]
+    faltan = [c for c in dict.fromkeys(claves) if c not in _NOMBRES_MEMO]
+    metricas.contar("nombres_modelo_total", len(claves) - len(faltan), origen="memo")
+    if faltan:
+        nuevos = _solicitar_nombres(faltan)
+        metricas.contar("nombres_modelo_total", len(nuevos), origen="pedido")
+        with _NOMBRES_LOCK:
+            _NOMBRES_MEMO.update(nuevos)
+            while len(_NOMBRES_MEMO) > _NOMBRES_MEMO_MAX:
+                del _NOMBRES_MEMO[next(iter(_NOMBRES_MEMO))]
+    return [_NOMBRES_MEMO.get(c, "") for c in claves]
+
+
+def _extraer_nombre_gpt(texto: str) -> str:
+    return _extraer_nombres_gpt([texto])[0]
 
 # Heurística: extraer edad evitando hijos entre paréntesis
 def _extraer_edad_segura(texto: str) -> str:
@@ -996,21 +1283,34 @@ def _extraer_edad_segura(texto: str) -> str:
     return ""
 
 # Limpia frases de tribunal/turno/circunscripción que se cuelen en campos DP
+_TRIB_TURNO_RE = re.compile(
+    r'(?:\b(?:primer|primera|segundo|segunda|tercer|tercera|cuarto|cuarta)\s+turno\b[^,.;\n]*)'
+    r'|(?:circunscripci[oA3]n\s+judicial[^,.;\n]*)'
+    r'|(?:con\s+asiento\s+en\s+esta\s+ciudad[^,.;\n]*)',
+    re.I,
+)
+_ESPACIOS_DOBLES_RE = re.compile(r'\s{2,}')
+
+
 def _sanitize_dp_text(s: str) -> str:
     if not s:
         return s
-    trib_re = re.compile(
-        r'(?:\b(?:primer|primera|segundo|segunda|tercer|tercera|cuarto|cuarta)\s+turno\b[^,.;\n]*)'
-        r'|(?:circunscripci[oA3]n\s+judicial[^,.;\n]*)'
-        r'|(?:con\s+asiento\s+en\s+esta\s+ciudad[^,.;\n]*)',
-        re.I,
-    )
-    s2 = trib_re.sub(' ', s)
-    return re.sub(r'\s{2,}', ' ', s2).strip()
+    s2 = _TRIB_TURNO_RE.sub(' ', s)
+    return _ESPACIOS_DOBLES_RE.sub(' ', s2).strip()
 
-def extraer_datos_personales(texto: str) -> dict:
+_NOMBRE_SIMPLE_RE = re.compile(r"[A-ZÃÃ‰ÃÃ“ÃšÃ‘][A-Za-zÃÃ‰ÃÃ“ÃšÃ‘Ã¡Ã©Ã­Ã³ÃºÃ±Ã¼Ãœ.\s-]+")
+_PARENTESIS_RE = re.compile(r'\s*\(.*?\)\s*')
+_CORTE_ALIAS_RE = re.compile(r'[,;.:]\s*')
+
+
+def _norm_nom(s: str) -> str:
+    s = _PARENTESIS_RE.sub('', s or '')  # quita (v), (f), etc.
+    return s.strip().lower()
+
+
+def _datos_personales_locales(texto: str) -> tuple[dict, bool]:
+    """Datos personales por heurísticas y si el nombre quedó dudoso."""
     t = texto                               # con saltos de lÃ­nea (para ^ y re.M)
-    plano = re.sub(r'\s+', ' ', texto)      # versiÃ³n â€œaplanadaâ€ si hace falta
     dp: dict[str, str | list] = {}
 
     # Caso mÃ­nimo: solo un nombre sin datos extra
@@ -1018,10 +1318,10 @@ def extraer_datos_personales(texto: str) -> dict:
     if (
         "," not in s_simple
         and " " in s_simple
-        and re.fullmatch(r"[A-ZÃÃ‰ÃÃ“ÃšÃ‘][A-Za-zÃÃ‰ÃÃ“ÃšÃ‘Ã¡Ã©Ã­Ã³ÃºÃ±Ã¼Ãœ.\s-]+", s_simple)
+        and _NOMBRE_SIMPLE_RE.fullmatch(s_simple)
     ):
         dp["nombre"] = capitalizar_frase(_limpiar_nombre(s_simple))
-        return dp
+        return dp, False
 
     # 0) Padres primero (para poder excluirlos si un regex de nombre los captura)
     padres_names: list[str] = []
@@ -1031,9 +1331,6 @@ def extraer_datos_personales(texto: str) -> dict:
             padres_names.append(m.group(2).strip())
         dp["padres"] = padres_names
 
-    def _norm_nom(s: str) -> str:
-        s = re.sub(r'\s*\(.*?\)\s*', '', s or '')  # quita (v), (f), etc.
-        return s.strip().lower()
     # 0.bis) Nombre por enumerado o por â€œ..., DNI ...â€
     if "nombre" not in dp:
         m = NOMBRE_ENUM_RE.search(t) or NOMBRE_DNI_ANY.search(t)
@@ -1063,11 +1360,8 @@ def extraer_datos_personales(texto: str) -> dict:
             if all(_norm_nom(cand) != _norm_nom(p) for p in padres_names):
                 dp["nombre"] = cand
 
-    # 3) SÃ³lo como Ãºltimo recurso, pedirle al modelo (si no hay nombre o parece raro)
-    if not _nombre_aparente_valido(dp.get("nombre", "")):
-        nombre_ai = _extraer_nombre_gpt(t)
-        if nombre_ai and all(_norm_nom(nombre_ai) != _norm_nom(p) for p in padres_names):
-            dp["nombre"] = nombre_ai
+    # 3) SÃ³lo como Ãºltimo recurso, queda para el modelo (si no hay nombre o parece raro)
+    dudoso = not _nombre_aparente_valido(dp.get("nombre", ""))
 
     # 4) DNI (robusto)
     m_dni = DNI_TXT_RE.search(t) or DNI_PLAIN_RE.search(t)
@@ -1078,7 +1372,7 @@ def extraer_datos_personales(texto: str) -> dict:
     # 5) Alias (busca en todo el texto excepto el nÃºmero de DNI)
     alias_scope = t if not m_dni else t[:m_dni.start()] + t[m_dni.end():]
     if (m2 := ALIAS_RE.search(alias_scope)):
-        alias_txt = re.split(r'[,;.:]\s*', m2.group(1), 1)[0].strip()
+        alias_txt = _CORTE_ALIAS_RE.split(m2.group(1), 1)[0].strip()
         if alias_txt.lower() not in {"sin apodo", "sin alias", "sin sobrenombre"}:
             dp["alias"] = alias_txt
 
@@ -1098,6 +1392,20 @@ def extraer_datos_personales(texto: str) -> dict:
         dp["prio"] = prio
         dp.setdefault("prontuario", prio)
 
+    return dp, dudoso
+
+
+def _poner_nombre_modelo(dp: dict, nombre: str) -> None:
+    """Usa el nombre que dio el modelo, salvo que sea el de uno de los padres."""
+    if nombre and all(_norm_nom(nombre) != _norm_nom(p) for p in dp.get("padres", [])):
+        dp["nombre"] = nombre
+
+
+def extraer_datos_personales(texto: str) -> dict:
+    """Datos personales de una ficha; un nombre dudoso se le pide al modelo."""
+    dp, dudoso = _datos_personales_locales(texto)
+    if dudoso:
+        _poner_nombre_modelo(dp, _extraer_nombre_gpt(texto))
     return dp
 
 
@@ -1168,8 +1476,12 @@ def extraer_firmantes(texto: str) -> list[dict]:
     Devuelve [{'nombre':â€¦, 'cargo':â€¦, 'doc':â€¦}, â€¦] con cada
     firma hallada en el texto de la sentencia.
     """
+    primera = _FIRMA_FECHA_RE.search(texto)
+    if not primera:
+        return []
+    desde = texto.rfind("\n", 0, max(primera.start() - _FIRMA_MARGEN, 0)) + 1
     firmas = []
-    for m in _FIRMAS_REGEX.finditer(texto):
+    for m in _FIRMAS_REGEX.finditer(texto, desde):
         firmas.append({
             "nombre": capitalizar_frase(m.group("nombre")).strip(),
             "cargo" : capitalizar_frase(m.group("cargo")).strip(),
@@ -1177,6 +1489,87 @@ def extraer_firmantes(texto: str) -> list[dict]:
         })
     return firmas
 
+# ───────────── Mapa de secciones (una vez por sentencia) ─────────────
+# Todas las sentencias tienen el mismo esqueleto: encabezado (carátula,
+# tribunal y lista de imputados), hechos / considerandos, el dispositivo
+# (RESUELVO) con sus fórmulas de cierre y las firmas.  Las marcas se ubican
+# una sola vez y cada extractor corre sólo sobre su tramo, así el costo de
+# las regex no crece con el largo de los considerandos.
+_HECHOS_RE = re.compile(
+    r"La\s+audiencia\s+de\s+debate|Conforme\s+la\s+requisitoria|A\s+LA\s+PRIMERA"
+    r"|El\s+Tribunal\s+unipersonal|CONSIDERANDO\b|RESUELV[EO]\b|Se\s+Resuelve\b",
+    re.I,
+)
+_CIERRE_RE = re.compile(r"Protocol[íi]?cese|Notif[íi]quese|H[áa]gase\s+saber|Of[íi]ciese", re.I)
+_FIRMA_INICIO_RE = re.compile(
+    r"^[ \t]*(?:(?:Texto\s+)?Firmad[oa]\s+digitalmente|Fecha\s*:\s*\d{4}[./-]\d{2}[./-]\d{2})",
+    re.I | re.M,
+)
+
+
+class MapaSecciones:
+    """Dónde está cada parte de una sentencia, como ``(inicio, fin)`` de ``texto``.
+
+    * ``encabezado``: desde el principio hasta los hechos o el dispositivo
+      (incluye la lista de imputados); sin esas marcas, todo el texto.
+    * ``imputados``: la lista de imputados dentro del encabezado.
+    * ``hechos``: considerandos / cuestiones, hasta el dispositivo.
+    * ``resuelvo``: desde el último "RESUELVE"/"RESUELVO" hasta las firmas.
+    * ``cierre``: las fórmulas "Protocolícese, hágase saber…" del dispositivo.
+    * ``firmas``: desde la primera línea de firma posterior al dispositivo.
+
+    Las secciones que no se ubican quedan en ``None``.
+    """
+
+    __slots__ = ("texto", "encabezado", "imputados", "hechos", "resuelvo", "cierre", "firmas")
+
+    def __init__(self, texto: str):
+        self.texto = texto
+        n = len(texto)
+        m = _HECHOS_RE.search(texto)
+        fin_enc = m.start() if m else n
+        self.encabezado: tuple[int, int] = (0, fin_enc)
+
+        self.imputados: tuple[int, int] | None = None
+        m_ini = _BLOQUE_INICIO_RE.search(texto, 0, fin_enc)
+        if m_ini:
+            m_fin = _BLOQUE_FIN_RE.search(texto, m_ini.end(), fin_enc)
+            self.imputados = (m_ini.end(), m_fin.start() if m_fin else fin_enc)
+
+        # el dispositivo es el ÚLTIMO "resuelve/resuelvo", como en extraer_resuelvo
+        bajo = texto.lower()
+        res = max(bajo.rfind("resuelve"), bajo.rfind("resuelvo"))
+        fin_hechos = res if res > fin_enc else n
+        self.hechos: tuple[int, int] | None = (fin_enc, fin_hechos) if m and fin_enc < fin_hechos else None
+
+        self.resuelvo: tuple[int, int] | None = None
+        self.cierre: tuple[int, int] | None = None
+        m_firma = _FIRMA_INICIO_RE.search(texto, max(res, 0))
+        self.firmas: tuple[int, int] | None = (m_firma.start(), n) if m_firma else None
+        if res != -1:
+            fin_res = m_firma.start() if m_firma else n
+            self.resuelvo = (res, fin_res)
+            m_cierre = _CIERRE_RE.search(texto, res, fin_res)
+            if m_cierre:
+                self.cierre = (m_cierre.start(), fin_res)
+
+    def tramo(self, seccion: str) -> str:
+        """Texto de ``seccion`` (``""`` si no se la ubicó)."""
+        t = getattr(self, seccion)
+        return self.texto[t[0]:t[1]] if t else ""
+
+    def desde(self, seccion: str) -> str:
+        """Texto desde el inicio de ``seccion`` hasta el final del documento."""
+        t = getattr(self, seccion)
+        return self.texto[t[0]:] if t else ""
+
+
+@functools.lru_cache(maxsize=16)
+def mapear_secciones(texto: str) -> MapaSecciones:
+    """:class:`MapaSecciones` compartido por todos los extractores."""
+    return MapaSecciones(texto)
+
+
 # â”€â”€ helpers varios ------------------------------------------------------
 def _as_str(value):
     """Convierte listas, nÃºmeros o ``None`` en ``str`` plano."""
@@ -1226,6 +1619,16 @@ def _format_firmantes(value) -> str:
         return (nombre or cargo).strip()
     return str(value)
 
+_ARTICULO_RE = re.compile(r"^(la|el)\s+")
+_ARTICULO_I_RE = re.compile(r"^(la|el)\s+", re.I)
+_ORGANO_FEM_RE = re.compile(r"^(cÃ¡mara|sala)\b", re.I)
+_ORGANO_MASC_RE = re.compile(r"^(juzgado|tribunal)\b", re.I)
+_NOMINACION_RE = re.compile(
+    r'(primera|segunda|tercera|cuarta|quinta|sexta|sÃ©ptima|septima|octava|novena|dÃ©cima|decima|onceava|doceava)\s+nominaciÃ³n',
+    re.I,
+)
+
+
 def _alinear_a_opcion(value: str, opciones: list[str]) -> str:
     """Devuelve el string EXACTO de opciones que mejor coincide con value.
     Normaliza espacios, ignora artÃ­culo inicial y prueba agregarlo si falta.
@@ -1235,9 +1638,9 @@ def _alinear_a_opcion(value: str, opciones: list[str]) -> str:
     if not value:
         return ""
     def norm(s: str) -> str:
-        return re.sub(r"\s+", " ", s).strip().lower()
+        return _ESPACIOS_RE.sub(" ", s).strip().lower()
     def sin_art(s: str) -> str:
-        return re.sub(r"^(la|el)\s+", "", norm(s))
+        return _ARTICULO_RE.sub("", norm(s))
 
     v = value.strip()
     # 1) Coincidencia exacta
@@ -1245,10 +1648,10 @@ def _alinear_a_opcion(value: str, opciones: list[str]) -> str:
         return v
 
     # 2) Probar agregando artÃ­culo correcto si falta
-    if not re.match(r"^(la|el)\s+", v, flags=re.I):
-        if re.match(r"^(cÃ¡mara|sala)\b", v, flags=re.I):
+    if not _ARTICULO_I_RE.match(v):
+        if _ORGANO_FEM_RE.match(v):
             v2 = "la " + v
-        elif re.match(r"^(juzgado|tribunal)\b", v, flags=re.I):
+        elif _ORGANO_MASC_RE.match(v):
             v2 = "el " + v
         else:
             v2 = v
@@ -1261,10 +1664,7 @@ def _alinear_a_opcion(value: str, opciones: list[str]) -> str:
             return opt
 
     # 4) HeurÃ­stica por ordinal de nominaciÃ³n (p.ej. â€œSexta NominaciÃ³nâ€)
-    m = re.search(
-        r'(primera|segunda|tercera|cuarta|quinta|sexta|sÃ©ptima|septima|octava|novena|dÃ©cima|decima|onceava|doceava)\s+nominaciÃ³n',
-        norm(v), re.I
-    )
+    m = _NOMINACION_RE.search(norm(v))
     if m:
         ord_norm = m.group(1)
         for opt in opciones:
@@ -1281,15 +1681,16 @@ def _format_datos_personales(raw):
     else:
         # 1) Si parece multipersona, me quedo con el primer bloque y lo parseo
         s = str(raw or "")
+        analisis = analizar_documento(s, acotar=False)
         if es_multipersona(s):
-            bloques = segmentar_imputados(s)
+            bloques = analisis.bloques
             if bloques:
-                dp = extraer_datos_personales(bloques[0])
+                dp = analisis.datos_personales(bloques[0])
             else:
-                dp = extraer_datos_personales(s)
+                dp = analisis.datos_personales(s)
         else:
             # 2) Intento parsear el string como ficha de UNA persona
-            dp = extraer_datos_personales(s)
+            dp = analisis.datos_personales(s)
 
         # Si no pude armar un dict creÃ­ble, devuelvo el string original
         if not isinstance(dp, dict):
@@ -1341,133 +1742,824 @@ def _format_datos_personales(raw):
 
 
 # â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€ Motor principal â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
-def _bytes_a_tmp(data: bytes, suf: str) -> Path:
-    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=suf)
-    tmp.write(data)
-    tmp.flush()
-    return Path(tmp.name)
-
+# Subir este número cuando cambien las heurísticas de extracción: invalida
+# los resultados guardados en la caché de sentencias.
+VERSION_EXTRACTOR = "3"
+
+# Al modelo sólo se le piden generales: los imputados salen siempre de la
+# segmentación local.  La respuesta se fuerza con un JSON schema estricto
+# (structured outputs) armado con los campos que faltan en cada sentencia.
+_PROMPT_SISTEMA = (
+    "Extraé de la sentencia judicial sólo los datos generales del esquema. "
+    "Copiá los valores tal como aparecen en el texto; si un dato no está, "
+    "devolvé una cadena vacía (o una lista vacía)."
+)
 
-def procesar_sentencia(file_bytes: bytes, filename: str) -> Dict[str, Any]:
-    """Extrae texto del archivo, llama a GPT y devuelve el dict final."""
-    # 1) Texto
+_ESQUEMA_CAMPOS: Dict[str, Dict[str, Any]] = {
+    "caratula": {
+        "type": "string",
+        "description": (
+            "Denominación de la causa, entre comillas y con su número entre paréntesis: "
+            '"(SAC N° …)", "(Expte. N° …)", "(EE N° …)". '
+            "Nunca contiene las palabras Cámara, Juzgado ni Tribunal."
+        ),
+    },
+    "tribunal": {
+        "type": "string",
+        "description": "Órgano que dictó la sentencia; empieza con 'la Cámara', 'el Juzgado', etc.",
+    },
+    "sent_num": {"type": "string", "description": "Número de la sentencia, sólo dígitos."},
+    "sent_fecha": {"type": "string", "description": 'Fecha de la sentencia, p. ej. "3 de marzo de 2024".'},
+    "firmantes": {
+        "type": "array",
+        "description": "Magistrados y funcionarios que firman la sentencia.",
+        "items": {
+            "type": "object",
+            "properties": {"nombre": {"type": "string"}, "cargo": {"type": "string"}},
+            "required": ["nombre", "cargo"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_DOCX_HEADER_RE = re.compile(r"word/header[0-9]*\.xml")
+_DOCX_FOOTER_RE = re.compile(r"word/footer[0-9]*\.xml")
+
+
+def _docx_xml_a_texto(xml: bytes) -> str:
+    """Texto plano de una parte XML de Word (mismo criterio que docx2txt)."""
+    from xml.etree import ElementTree
+    partes: list[str] = []
+    for el in ElementTree.fromstring(xml).iter():
+        if el.tag == _W_NS + "t":
+            partes.append(el.text or "")
+        elif el.tag == _W_NS + "tab":
+            partes.append("\t")
+        elif el.tag in (_W_NS + "br", _W_NS + "cr"):
+            partes.append("\n")
+        elif el.tag == _W_NS + "p":
+            partes.append("\n\n")
+    return "".join(partes)
+
+
+def _docx_a_texto(data: bytes) -> str:
+    """Lee un DOCX desde memoria: encabezados, cuerpo y pies, en ese orden."""
+    import zipfile
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        nombres = zf.namelist()
+        partes = [_docx_xml_a_texto(zf.read(n)) for n in nombres if _DOCX_HEADER_RE.match(n)]
+        partes.append(_docx_xml_a_texto(zf.read("word/document.xml")))
+        partes += [_docx_xml_a_texto(zf.read(n)) for n in nombres if _DOCX_FOOTER_RE.match(n)]
+    return "".join(partes).strip()
+
+
+def extraer_texto(file_bytes: bytes, filename: str) -> str:
+    """Texto crudo de un PDF o DOCX, sin escribir nada a disco.
+
+    Los PDF largos se extraen por rangos de páginas en varios procesos
+    (``procesos_pdf`` en config.json); cada página termina en ``\f``.
+    """
     name = filename.lower()
     if name.endswith(".pdf"):
-        tmp = _bytes_a_tmp(file_bytes, ".pdf")
-        texto = extract_text(tmp)
-        tmp.unlink(missing_ok=True)
-    elif name.endswith(".docx"):
-        tmp = _bytes_a_tmp(file_bytes, ".docx")
-        texto = docx2txt.process(tmp)
-        tmp.unlink(missing_ok=True)
-    else:
-        raise ValueError("Formato no soportado (PDF o DOCX)")
+        texto = extraer_en_paralelo(file_bytes, procesos=procesos_pdf(_cfg))
+        return texto if texto is not None else extract_text(io.BytesIO(file_bytes))
+    if name.endswith(".docx"):
+        return _docx_a_texto(file_bytes)
+    raise ValueError("Formato no soportado (PDF o DOCX)")
+
+
+def _version_cache() -> str:
+    """Etiqueta de versión para la caché: motor + huella del prompt, el esquema
+    y la configuración que cambia el resultado (campos pedidos al modelo,
+    modo "local primero", umbral de confianza y presupuesto de contexto).
+    """
+    ajustes = {
+        "campos": _campos_habilitados(),
+        "local_primero": _local_primero(),
+        "umbral": _umbral_confianza(),
+        "tokens": _presupuesto_contexto(),
+    }
+    firma = _PROMPT_SISTEMA + json.dumps([_ESQUEMA_CAMPOS, ajustes], sort_keys=True, ensure_ascii=False)
+    huella = hashlib.sha256(firma.encode("utf-8")).hexdigest()[:8]
+    return f"{VERSION_EXTRACTOR}-{huella}"
+
+
+def procesar_sentencia(
+    file_bytes: bytes,
+    filename: str,
+    *,
+    usar_cache: bool = True,
+    progreso: Progreso | None = None,
+) -> Dict[str, Any]:
+    """Igual que :func:`_procesar_sentencia_sin_cache` pero con caché en disco.
+
+    La clave es el SHA-256 de ``file_bytes`` más :func:`_version_cache`, de
+    modo que cambiar el extractor (``VERSION_EXTRACTOR``), el prompt o los
+    ajustes del pedido al modelo invalida automáticamente las entradas viejas.
+
+    Si se pasa ``progreso``, se lo llama con cada evento de etapa (ver
+    :func:`procesar_sentencia_eventos`).
+    """
+    emitir = _emisor(progreso)
+    t0 = time.perf_counter()
+    cache = obtener_cache(_cfg)
+    clave = cache.clave(file_bytes, _version_cache())
+    if usar_cache:
+        datos = cache.obtener(clave)
+        _registrar_cache(datos is not None)
+        if datos is not None:
+            emitir(_evento("cache"))
+            for ev in _eventos_resultado(datos, t0):
+                emitir(ev)
+            return datos
+    datos = _procesar_sentencia_sin_cache(file_bytes, filename, progreso=emitir)
+    cache.guardar(clave, datos)
+    for ev in _eventos_resultado(datos, t0):
+        emitir(ev)
+    return datos
 
-    texto = limpiar_pies(texto)
-    texto = _fix_mojibake(texto)
-    # justo despuÃ©s de: texto = limpiar_pies(texto)
-    texto_base = extraer_bloque_imputados(texto) or texto
-    datos: Dict[str, Any] = {"generales": {}, "imputados": []}
-    # HeurÃ­stica local:
-    dp_auto = extraer_datos_personales(texto_base)
 
-    # SegmentaciÃ³n:
-    bloques = segmentar_imputados(texto_base)
+# ─────────────── Eventos de progreso ───────────────
+# Cada etapa del pipeline emite un ``dict`` con la clave ``"evento"``:
+#
+#   cache            resultado servido desde la caché
+#   texto_extraido   {caracteres, ms}
+#   pies_limpios     {caracteres}
+#   bloque_imputados {encontrado, caracteres}
+#   segmentados      {bloques, imputados, ms}
+#   imputado         {indice, datos, preliminar}
+#   llm_inicio       {tokens, campos}   (tokens estimados del contexto)
+#   llm_fin          {ms, espera_ms}    (espera_ms: lo que faltaba al terminar
+#                                        las heurísticas locales)
+#   llm_omitido      todo salió de las heurísticas locales
+#   postproceso      {ms}
+#   generales        {datos}
+#   listo            {ms, datos}
+Progreso = Callable[[Dict[str, Any]], None]
+
+
+def _sin_progreso(_evento: Dict[str, Any]) -> None:
+    pass
+
+
+def _evento(nombre: str, **datos: Any) -> Dict[str, Any]:
+    return {"evento": nombre, **datos}
+
+
+def _ms_desde(t0: float) -> float:
+    return round((time.perf_counter() - t0) * 1000, 1)
+
+
+def _eventos_segmentacion(analisis: AnalisisDocumento, ms: float) -> List[Dict[str, Any]]:
+    """Eventos del análisis local; los imputados van como preliminares."""
+    evs = [
+        _evento(
+            "bloque_imputados",
+            encontrado=bool(analisis.bloque_imputados),
+            caracteres=len(analisis.texto_base),
+        ),
+        _evento(
+            "segmentados", bloques=len(analisis.bloques), imputados=len(analisis.imputados), ms=ms
+        ),
+    ]
+    evs += [
+        _evento("imputado", indice=i, datos=imp, preliminar=True)
+        for i, imp in enumerate(analisis.imputados)
+    ]
+    return evs
+
+
+def _eventos_resultado(datos: Dict[str, Any], t0: float) -> List[Dict[str, Any]]:
+    """Eventos finales: generales, cada imputado definitivo y ``listo``."""
+    evs = [_evento("generales", datos=datos.get("generales", {}))]
+    evs += [
+        _evento("imputado", indice=i, datos=imp, preliminar=False)
+        for i, imp in enumerate(datos.get("imputados") or [])
+    ]
+    evs.append(_evento("listo", ms=_ms_desde(t0), datos=datos))
+    return evs
+
+
+# ─────────────── Métricas (ver metricas.py) ───────────────
+# Los tiempos por etapa salen de los mismos eventos de progreso, así el
+# camino síncrono y el asíncrono miden exactamente lo mismo.
+_ETAPA_POR_EVENTO = {
+    "texto_extraido": "extraccion",
+    "segmentados": "regex",
+    "llm_fin": "llm",
+    "postproceso": "postproceso",
+}
+
+
+def _registrar_metricas(ev: Dict[str, Any]) -> None:
+    nombre = ev["evento"]
+    etapa = _ETAPA_POR_EVENTO.get(nombre)
+    if etapa and "ms" in ev:
+        metricas.observar("etapa_ms", ev["ms"], etapa=etapa)
+    if nombre == "llm_fin" and "espera_ms" in ev:
+        metricas.observar("etapa_ms", ev["espera_ms"], etapa="llm_espera")
+    if nombre == "segmentados":
+        metricas.contar("bloques_total", ev["bloques"])
+        metricas.contar("imputados_total", ev["imputados"])
+    elif nombre == "llm_omitido":
+        metricas.contar("llm_omitido_total")
+    elif nombre == "listo":
+        origen = "cache" if ev.get("cache") else "motor"
+        metricas.contar("sentencias_total", origen=origen)
+        metricas.observar("etapa_ms", ev["ms"], etapa="total", origen=origen)
+
+
+def _registrar_cache(acierto: bool) -> None:
+    metricas.contar("cache_total", resultado="acierto" if acierto else "fallo")
+
+
+def _emisor(progreso: Progreso | None) -> Progreso:
+    """Callback que registra métricas y reenvía el evento a ``progreso``."""
+    en_cache = False
+
+    def emitir(ev: Dict[str, Any]) -> None:
+        nonlocal en_cache
+        en_cache = en_cache or ev["evento"] == "cache"
+        _registrar_metricas(dict(ev, cache=en_cache) if ev["evento"] == "listo" else ev)
+        if progreso is not None:
+            progreso(ev)
+
+    return emitir
+
+
+def _con_metricas(fn: Callable[..., Any], *args: Any) -> tuple[Any, list]:
+    """Corre ``fn`` juntando sus métricas, para ejecutarla en otro proceso."""
+    with metricas.recolectar() as registros:
+        res = fn(*args)
+    return res, registros
+
+
+class AnalisisDocumento:
+    """Análisis local de una sentencia, calculado una sola vez.
+
+    Segmentación, validez de cada bloque y datos personales por bloque se
+    evalúan a lo sumo una vez por documento y todos los consumidores (eventos,
+    combinación con el modelo, formateo para la UI) leen de acá.  El objeto
+    se puede serializar con ``pickle``: vuelve del pool de procesos con lo
+    ya calculado.
+    """
 
+    def __init__(self, texto: str, *, acotar: bool = True):
+        self.texto = texto
+        self.acotar = acotar          # buscar el bloque de imputados o usar todo el texto
+        self._fichas: Dict[str, Dict[str, Any]] = {}
 
+    @cached_property
+    def secciones(self) -> MapaSecciones:
+        return mapear_secciones(self.texto)
 
-    # Definir helper ANTES de usarlo
-    def _dp_from_block(b: str) -> dict:
-        d = extraer_datos_personales(b)
+    @cached_property
+    def bloque_imputados(self) -> str:
+        if not self.acotar:
+            return ""
+        # la lista está en el encabezado; si ahí no se la ubica, todo el texto
+        s = self.secciones
+        return extraer_bloque_imputados(s.tramo("encabezado") if s.imputados else self.texto) or ""
+
+    @property
+    def texto_base(self) -> str:
+        return self.bloque_imputados or self.texto
+
+    @cached_property
+    def bloques(self) -> List[str]:
+        return segmentar_imputados(self.texto_base)
+
+    @cached_property
+    def bloques_validos(self) -> List[str]:
+        return [b for b in self.bloques if _es_bloque_valido(b)]
+
+    def _calcular_fichas(self, bloques: List[str]) -> None:
+        """Datos personales de ``bloques``; los nombres dudosos van juntos al modelo."""
+        dudosos = []
+        for bloque in dict.fromkeys(bloques):
+            if bloque not in self._fichas:
+                self._fichas[bloque], dudoso = _datos_personales_locales(bloque)
+                if dudoso:
+                    dudosos.append(bloque)
+        if dudosos:
+            for bloque, nombre in zip(dudosos, _extraer_nombres_gpt(dudosos)):
+                _poner_nombre_modelo(self._fichas[bloque], nombre)
+
+    def datos_personales(self, bloque: str) -> Dict[str, Any]:
+        """``extraer_datos_personales`` memorizado por bloque (devuelve una copia)."""
+        self._calcular_fichas([bloque])
+        return copy.deepcopy(self._fichas[bloque])
+
+    def ficha(self, bloque: str) -> Dict[str, Any]:
+        d = self.datos_personales(bloque)
         return {"datos_personales": d, "dni": d.get("dni", ""), "nombre": d.get("nombre", "")}
 
-    # Trabajamos en variables locales, sin tocar `datos` todavÃ­a
-    imps_pre: list[dict] = []
-    if bloques:
-        bloques_ok = [b for b in bloques if _es_bloque_valido(b)]
-        # filtro anti-falsos positivos (ej.: â€œno ingresaron a la audiencia...â€)
-        bloques_ok = [b for b in bloques_ok if "no ingresaron a la audiencia" not in b.lower()]
-        imps_pre = [_dp_from_block(b) for b in bloques_ok]
-
-
-    imps_pre = _dedup_por_dni(imps_pre)[:MAX_IMPUTADOS]
-
-    if not imps_pre:
-        if dp_auto:
-            imps_pre = [{"datos_personales": dp_auto,
-                        "dni": dp_auto.get("dni", ""),
-                        "nombre": dp_auto.get("nombre", "")}]
-    # Log opcional (podÃ©s borrarlo cuando ande)
-    import os as _os
-    print("DEBUG(PROXY_ENV)_init:", {k: _os.environ.get(k) for k in (
-        "HTTP_PROXY","HTTPS_PROXY","ALL_PROXY","http_proxy","https_proxy","all_proxy","NO_PROXY","PROXY_URL"
-    )})
-
-    # 1) Limpiar proxies heredados del entorno del proceso
-    for _k in ("HTTP_PROXY","HTTPS_PROXY","ALL_PROXY","http_proxy","https_proxy","all_proxy"):
-        _os.environ.pop(_k, None)
-
-    # 2) Evitar proxy para OpenAI
-    _no_proxy = _os.environ.get("NO_PROXY", "")
-    for _h in ("api.openai.com", "api.openai.com:443"):
-        if _h not in _no_proxy:
-            _no_proxy = f"{_no_proxy};{_h}" if _no_proxy else _h
-    _os.environ["NO_PROXY"] = _no_proxy
-
-    # 3) Si PROXY_URL viene con placeholder/valor invÃ¡lido, lo ignoramos
-    _bad_tokens = ("usuario:contraseÃ±a@host:puerto", "<", ">", " ")
-    if any(t in (_os.environ.get("PROXY_URL","") or "") for t in _bad_tokens):
-        _os.environ.pop("PROXY_URL", None)
-    # --- FIN BLOQUE ANTI-PROXY GLOBAL ---
-
-    # 2) GPT-4o mini en modo JSON
-    client = _get_openai_client()
-    kwargs = dict(
+    @cached_property
+    def dp_auto(self) -> Dict[str, Any]:
+        """Heurística sobre todo el tramo base, por si la segmentación falla."""
+        return self.datos_personales(self.texto_base)
+
+    @cached_property
+    def imputados(self) -> List[Dict[str, Any]]:
+        """Imputados preliminares (antes de combinar con el modelo)."""
+        # filtro anti-falsos positivos (ej.: "no ingresaron a la audiencia...")
+        ok = [b for b in self.bloques_validos if "no ingresaron a la audiencia" not in b.lower()]
+        # las fichas y el tramo base de una vez: un solo pedido por los nombres dudosos
+        self._calcular_fichas(ok + [self.texto_base])
+        imps = _dedup_por_dni([self.ficha(b) for b in ok])[:MAX_IMPUTADOS]
+        if not imps and self.dp_auto:
+            dp = copy.deepcopy(self.dp_auto)
+            imps = [{"datos_personales": dp, "dni": dp.get("dni", ""), "nombre": dp.get("nombre", "")}]
+        return imps
+
+    @cached_property
+    def mencionados(self) -> List[str]:
+        """Nombres de "los imputados ..., y sus respectivos defensores"."""
+        try:
+            return _extraer_nombres_lista_intervinientes(self.texto)
+        except Exception:
+            return []
+
+    @cached_property
+    def resuelvo(self) -> str:
+        return extraer_resuelvo(self.secciones.desde("resuelvo"))
+
+    @cached_property
+    def firmantes(self) -> List[Dict[str, Any]]:
+        # las firmas van después del dispositivo
+        return extraer_firmantes(self.secciones.desde("resuelvo") or self.texto)
+
+    @cached_property
+    def generales_locales(self) -> Dict[str, Dict[str, Any]]:
+        return extraer_generales_locales(self.texto)
+
+    @cached_property
+    def contexto_llm(self) -> str:
+        return seleccionar_contexto(self.texto, self.bloque_imputados)
+
+    def preparar_llm(self) -> "AnalisisDocumento":
+        """Evalúa sólo lo que hace falta para decidir y armar el pedido al modelo."""
+        for attr in ("generales_locales", "firmantes", "contexto_llm"):
+            getattr(self, attr)
+        return self
+
+    def calcular(self) -> "AnalisisDocumento":
+        """Evalúa todo lo que se usa antes y después del modelo."""
+        for attr in ("imputados", "mencionados", "resuelvo", "firmantes", "generales_locales", "contexto_llm"):
+            getattr(self, attr)
+        return self
+
+
+def resumen_heuristico(texto: str) -> Dict[str, Any]:
+    """Lo que sale sólo de las heurísticas, en forma comparable entre versiones.
+
+    Lo usa ``reanalizar.py`` para informar qué campos cambian en el corpus.
+    """
+    a = AnalisisDocumento(texto)
+    resumen: Dict[str, Any] = {c: v["valor"] for c, v in a.generales_locales.items()}
+    resumen["resuelvo"] = _flatten_resuelvo(a.resuelvo or "")
+    resumen["firmantes"] = _format_firmantes(a.firmantes)
+    resumen["bloque_imputados"] = bool(a.bloque_imputados)
+    resumen["imputados"] = [
+        f"{imp.get('nombre', '')} ({imp.get('dni', '')})".strip() for imp in a.imputados
+    ]
+    return resumen
+
+
+@functools.lru_cache(maxsize=32)
+def analizar_documento(texto: str, *, acotar: bool = True) -> AnalisisDocumento:
+    """:class:`AnalisisDocumento` compartido para el mismo texto (p. ej. en reruns de la UI)."""
+    return AnalisisDocumento(texto, acotar=acotar)
+
+
+# ─────────────── Lectura dirigida de PDFs largos ───────────────
+# Carátula, tribunal y la lista de imputados están en las primeras páginas;
+# RESUELVO y firmas, en las últimas.  Los considerandos del medio sólo se
+# leen si en los extremos falta alguno de esos datos.
+_PAGINAS_CABEZA = 5
+_PAGINAS_COLA = 3
+_RESUELVO_RE = re.compile(r"\bresuelv[eo]\b", re.I)
+
+
+def _paginas_extremos() -> tuple[int, int] | None:
+    """``(cabeza, cola)`` en páginas; ``None`` si la lectura dirigida está apagada.
+
+    Env ``OSPRO_LECTURA_EXTREMOS`` o config ``lectura_extremos`` (sí por
+    defecto); tamaños en ``paginas_cabeza`` / ``paginas_cola``.
+    """
+    valor = os.environ.get("OSPRO_LECTURA_EXTREMOS", _cfg.get("lectura_extremos", True))
+    if str(valor).strip().lower() in ("0", "false", "no", ""):
+        return None
+    try:
+        return (
+            max(1, int(_cfg.get("paginas_cabeza", _PAGINAS_CABEZA))),
+            max(1, int(_cfg.get("paginas_cola", _PAGINAS_COLA))),
+        )
+    except (TypeError, ValueError):
+        return _PAGINAS_CABEZA, _PAGINAS_COLA
+
+
+def _extremos_alcanzan(inicio: str, final: str) -> bool:
+    """¿Las primeras/últimas páginas traen todo lo que se busca localmente?
+
+    Hace falta la carátula, la lista de imputados *cerrada* (su fin no puede
+    caer en las páginas que no se leyeron) y el RESUELVO.
+    """
+    inicio = _fix_mojibake(limpiar_pies(inicio))
+    plano = _plano(inicio)
+    m_ini = _BLOQUE_INICIO_RE.search(plano) or _IMPUTADO_PALABRA_RE.search(plano)
+    if not (m_ini and _BLOQUE_FIN_RE.search(plano, m_ini.end())):
+        return False
+    if not extraer_caratula(inicio):
+        return False
+    return bool(_RESUELVO_RE.search(_fix_mojibake(final)))
+
+
+def _extraer_texto_dirigido(file_bytes: bytes, filename: str) -> tuple[str, bool]:
+    """Como :func:`extraer_texto`, pero en PDFs largos lee primero los extremos.
+
+    Si con las primeras y últimas páginas alcanza, el medio no se decodifica
+    y el texto queda ``inicio + final``; si no, se lee el resto y el
+    resultado es idéntico a extraer el PDF completo.  Devuelve también si
+    el texto está completo.
+    """
+    extremos = _paginas_extremos() if filename.lower().endswith(".pdf") else None
+    tramos = extraer_extremos(file_bytes, *extremos) if extremos else None
+    if tramos is None:
+        return extraer_texto(file_bytes, filename), True
+    inicio, final, total = tramos
+    cabeza, cola = extremos
+    if _extremos_alcanzan(inicio, final):
+        metricas.contar("paginas_pdf_total", cabeza + cola, lectura="extremos")
+        metricas.contar("paginas_pdf_total", total - cabeza - cola, lectura="omitidas")
+        return inicio + final, False
+    rango = (cabeza, total - cola)
+    medio = extraer_en_paralelo(file_bytes, procesos=procesos_pdf(_cfg), rango=rango)
+    if medio is None:
+        medio = extraer_paginas(file_bytes, *rango)
+    metricas.contar("paginas_pdf_total", total, lectura="completa")
+    return inicio + medio + final, True
+
+
+def limpiar_texto(crudo: str) -> str:
+    """Quita pies de página y mojibake del texto crudo extraído."""
+    return _fix_mojibake(limpiar_pies(crudo))
+
+
+def _texto_limpio(file_bytes: bytes, filename: str) -> tuple[int, str]:
+    """Extrae el texto y le quita pies de página y mojibake.
+
+    Si el documento ya se decodificó alguna vez, el texto crudo sale de la
+    base de textos (``textos_sentencias``) sin tocar el PDF: siempre si
+    estaba completo, y si se había leído por sus extremos, mientras
+    ``(cabeza, cola)`` sigan siendo los mismos.  La limpieza se rehace
+    siempre, por si cambió.  Devuelve también el largo del texto crudo,
+    para el evento de progreso.
+    """
+    textos = obtener_textos(_cfg)
+    guardado = textos.obtener(file_bytes)
+    extremos = _paginas_extremos()
+    if guardado is not None and (guardado.completo or guardado.extremos == extremos):
+        metricas.contar("textos_total", resultado="acierto")
+        crudo = guardado.crudo
+        return len(crudo), limpiar_texto(crudo)
+    crudo, completo = _extraer_texto_dirigido(file_bytes, filename)
+    texto = limpiar_texto(crudo)
+    textos.guardar(file_bytes, filename, crudo, extremos=None if completo else extremos)
+    metricas.contar("textos_total", resultado="fallo")
+    return len(crudo), texto
+
+
+def _preparar_llm(texto: str) -> AnalisisDocumento:
+    """Generales locales y contexto: lo necesario para lanzar el pedido al modelo."""
+    return AnalisisDocumento(texto).preparar_llm()
+
+
+def _segmentar_previo(analisis: AnalisisDocumento) -> AnalisisDocumento:
+    """Bloque de imputados, segmentación, fichas y el resto de las heurísticas.
+
+    Corre mientras el pedido al modelo está en vuelo: nada de esto depende
+    de la respuesta, sólo :func:`_combinar`.
+    """
+    return analisis.calcular()
+
+
+# ─────────────── Generales locales con confianza ───────────────
+# Campos que, en principio, puede aportar el modelo.  Con "local primero"
+# sólo se le piden los que las heurísticas no resuelven con confianza.
+CAMPOS_LLM = ("caratula", "tribunal", "sent_num", "sent_fecha")
+_UMBRAL_CONFIANZA = 0.8
+
+_SENT_NUM_RE = re.compile(r"\bSENTENCIA\s+(?:N(?:[°º]|[uú]mero|ro\.?|\.)\s*:?\s*)(\d{1,5})\b", re.I)
+_FECHA_LARGA_RE = re.compile(rf"\b(\d{{1,2}})\s+de\s+({MESES})\s+(?:de|del)\s+(\d{{4}})\b", re.I)
+_FECHA_CORTA_RE = re.compile(r"\b(\d{1,2})/(\d{1,2})/(\d{4})\b")
+_VALIDADOR = Validador(TRIBUNALES)
+
+
+def _local_primero() -> bool:
+    """Modo "local primero": env ``OSPRO_LOCAL_PRIMERO`` o config ``local_primero`` (sí por defecto)."""
+    valor = os.environ.get("OSPRO_LOCAL_PRIMERO", _cfg.get("local_primero", True))
+    return str(valor).strip().lower() not in ("0", "false", "no", "")
+
+
+def _umbral_confianza() -> float:
+    try:
+        return float(_cfg.get("umbral_confianza", _UMBRAL_CONFIANZA))
+    except (TypeError, ValueError):
+        return _UMBRAL_CONFIANZA
+
+
+def extraer_sent_num(texto: str) -> str:
+    """Número de sentencia del encabezado ("SENTENCIA N° 12", "SENTENCIA NÚMERO: 12")."""
+    m = _SENT_NUM_RE.search(texto[:3000])
+    return m.group(1) if m else ""
+
+
+def extraer_sent_fecha(texto: str) -> tuple[str, float]:
+    """Primera fecha del encabezado y su confianza (más alta cuanto antes aparece)."""
+    cabecera = texto[:3000]
+    hallazgos = [m for rx in (_FECHA_LARGA_RE, _FECHA_CORTA_RE) for m in rx.finditer(cabecera)]
+    if not hallazgos:
+        return "", 0.0
+    m = min(hallazgos, key=lambda m: m.start())
+    if m.re is _FECHA_LARGA_RE:
+        fecha = f"{int(m.group(1))} de {m.group(2).lower()} de {m.group(3)}"
+    else:
+        fecha = m.group(0)
+    return fecha, (0.85 if m.start() < 1500 else 0.5)
+
+
+def _en_encabezado(extractor: Callable[[str], str], texto: str, encabezado: str) -> str:
+    """``extractor`` sobre el encabezado; sólo si ahí no encuentra nada, sobre todo el texto."""
+    valor = extractor(encabezado) or ""
+    if not valor and len(encabezado) < len(texto):
+        valor = extractor(texto) or ""
+    return valor
+
+
+def extraer_generales_locales(texto: str) -> Dict[str, Dict[str, Any]]:
+    """Generales recuperables sin el modelo, cada uno con su confianza (0–1).
+
+    ``{"caratula": {"valor": "...", "confianza": 0.9}, ...}``
+    """
+    encabezado = mapear_secciones(texto).tramo("encabezado")
+    carat = _fix_mojibake(_en_encabezado(extraer_caratula, texto, encabezado))
+    trib = _fix_mojibake(_en_encabezado(extraer_tribunal, texto, encabezado))
+    num = extraer_sent_num(texto)
+    fecha, conf_fecha = extraer_sent_fecha(texto)
+    return {
+        "caratula": {"valor": carat, "confianza": _VALIDADOR.caratula(carat)},
+        "tribunal": {"valor": trib, "confianza": _VALIDADOR.tribunal(trib)},
+        "sent_num": {"valor": num, "confianza": 0.9 if num else 0.0},
+        "sent_fecha": {"valor": fecha, "confianza": conf_fecha},
+    }
+
+
+def _campos_habilitados() -> List[str]:
+    """Campos que se le pueden pedir al modelo; config ``llm_campos`` apaga los que sean ``false``."""
+    flags = _cfg.get("llm_campos") or {}
+    return [c for c in _ESQUEMA_CAMPOS if flags.get(c, True) is not False]
+
+
+def _campos_para_llm(analisis: AnalisisDocumento) -> List[str]:
+    """Campos que hay que pedirle al modelo (todos si no es "local primero").
+
+    Los firmantes sólo se agregan a un pedido que igual sale, y si las
+    heurísticas no encontraron ninguno.
+    """
+    habilitados = _campos_habilitados()
+    if _local_primero():
+        umbral = _umbral_confianza()
+        locales = analisis.generales_locales
+        faltan = [c for c in CAMPOS_LLM if locales[c]["confianza"] < umbral]
+    else:
+        faltan = list(CAMPOS_LLM)
+    faltan = [c for c in faltan if c in habilitados]
+    if faltan and "firmantes" in habilitados and not analisis.firmantes:
+        faltan.append("firmantes")
+    return faltan
+
+
+# Presupuesto del texto enviado al modelo.  Sólo se conservan los
+# "generales" de su respuesta, que salen del encabezado y del final.
+_TOKENS_CONTEXTO = 3000
+_CHARS_POR_TOKEN = 4          # estimación gruesa para castellano
+_SEPARADOR_CONTEXTO = "\n[…]\n"
+
+
+def _presupuesto_contexto() -> int:
+    """Tokens de contexto: env ``OSPRO_LLM_TOKENS`` o config ``llm_tokens_contexto``."""
+    try:
+        return int(os.environ.get("OSPRO_LLM_TOKENS") or _cfg.get("llm_tokens_contexto") or _TOKENS_CONTEXTO)
+    except ValueError:
+        return _TOKENS_CONTEXTO
+
+
+def estimar_tokens(texto: str) -> int:
+    return -(-len(texto) // _CHARS_POR_TOKEN)
+
+
+def seleccionar_contexto(texto: str, bloque_imputados: str = "", *, max_tokens: int | None = None) -> str:
+    """Recorta la sentencia a lo que el modelo necesita para los generales.
+
+    Arma, dentro de ``max_tokens``: el final (dispositivo y firmas, ~45 %),
+    el bloque de imputados (~20 %) y el encabezado con el resto, que es
+    donde están carátula, tribunal, número y fecha.  Los tramos se unen con
+    ``[…]``.  Si el texto ya entra en el presupuesto se devuelve tal cual.
+    """
+    limite = (max_tokens or _presupuesto_contexto()) * _CHARS_POR_TOKEN
+    if len(texto) <= limite:
+        return texto
+
+    # Tramos como intervalos del texto original: [RESUELVO … +30 %], la cola
+    # y, si se lo ubica, el bloque de imputados (que viene del texto aplanado).
+    fijos: list[list[int]] = []
+    resuelvo = mapear_secciones(texto).resuelvo
+    if resuelvo:
+        idx = resuelvo[0]
+        fijos.append([idx, min(len(texto), idx + limite * 30 // 100)])
+    fijos.append([len(texto) - limite * 15 // 100, len(texto)])
+
+    bloque = bloque_imputados.strip()
+    tramo_bloque: list[int] | None = None
+    if bloque:
+        norm = normalizar(texto)
+        pos = norm.plano.find(bloque[:200])
+        if pos != -1:
+            ini = norm.a_original(pos)
+            tramo_bloque = [ini, min(len(texto), ini + limite * 20 // 100)]
+            bloque = ""
+        else:
+            bloque = bloque[: limite * 20 // 100]
+
+    tramos = _unir_tramos(fijos + ([tramo_bloque] if tramo_bloque else []))
+    cabecera = limite - len(bloque) - sum(fin - ini for ini, fin in tramos)
+    if tramo_bloque and tramo_bloque[1] <= cabecera:
+        # el bloque ya está en el encabezado: se usa su lugar para más encabezado
+        tramos = _unir_tramos(fijos)
+        cabecera = limite - sum(fin - ini for ini, fin in tramos)
+    cabecera = max(cabecera, 0)
+
+    # los tramos no deben pisar el encabezado; si lo tocan, lo continúan
+    tramos = [[max(ini, cabecera), fin] for ini, fin in tramos if fin > cabecera]
+    partes = [texto[:cabecera], bloque]
+    if tramos and tramos[0][0] == cabecera:
+        partes[0] = texto[: tramos.pop(0)[1]]
+    partes += [texto[ini:fin] for ini, fin in tramos]
+    return _SEPARADOR_CONTEXTO.join(p.strip() for p in partes if p.strip())
+
+
+def _unir_tramos(tramos: list[list[int]]) -> list[list[int]]:
+    """Ordena y fusiona intervalos ``[ini, fin)`` que se tocan o se pisan."""
+    fusion: list[list[int]] = []
+    for ini, fin in sorted(tramos):
+        if fusion and ini <= fusion[-1][1]:
+            fusion[-1][1] = max(fusion[-1][1], fin)
+        else:
+            fusion.append([ini, fin])
+    return fusion
+
+
+def _esquema_generales(campos: List[str]) -> Dict[str, Any]:
+    """JSON schema estricto ``{"generales": {campo: ...}}`` con sólo ``campos``."""
+    return {
+        "type": "object",
+        "properties": {
+            "generales": {
+                "type": "object",
+                "properties": {c: _ESQUEMA_CAMPOS[c] for c in campos},
+                "required": list(campos),
+                "additionalProperties": False,
+            }
+        },
+        "required": ["generales"],
+        "additionalProperties": False,
+    }
+
+
+def _kwargs_generales(texto: str, campos: List[str]) -> Dict[str, Any]:
+    """Parámetros del pedido a GPT-4o mini con salida estructurada."""
+    return dict(
         model="gpt-4o-mini",
         temperature=0,
-        response_format={"type": "json_object"},
+        response_format={
+            "type": "json_schema",
+            "json_schema": {"name": "generales", "strict": True, "schema": _esquema_generales(campos)},
+        },
         messages=[
             {
                 "role": "system",
-                "content": (
-                    "DevolvÃ© un JSON con: "
-                    "generales (caratula, tribunal, sent_num, sent_fecha, resuelvo, firmantes) "
-                    "e imputados (lista).  Cada imputado debe traer un objeto "
-                    "datos_personales **con TODAS ESTAS CLAVES**:\n"
-                    "nombre, dni, nacionalidad, fecha_nacimiento, lugar_nacimiento, edad, "
-                    "estado_civil, domicilio, instruccion, ocupacion, padres, "
-                    "prontuario, seccion_prontuario.\n"
-                    "La **caratula** es la denominaciÃ³n de la causa, generalmente entre comillas "
-                    "y con â€œ(SAC NÂ° â€¦)â€, â€œ(Expte. NÂ° â€¦)â€, â€œ(EE NÂ° â€¦)â€, â€œ(SAC â€¦)â€, "
-                    "â€œ(Expte. â€¦)â€, â€œ(EE â€¦)â€, etc..  Nunca debe contener la palabra "
-                    "CÃ¡mara, Juzgado ni Tribunal. "
-                    "â€œtribunalâ€ es el Ã³rgano que dictÃ³ la sentencia, empieza con "
-                    "â€˜la CÃ¡maraâ€™, â€˜el Juzgadoâ€™, etc. "
-                    "Si un dato falta, dejÃ¡ la clave vacÃ­a."
-                ),
+                "content": _PROMPT_SISTEMA,
             },
             {"role": "user", "content": texto[:120_000]},
         ],
     )
-    from openai import AuthenticationError, APIStatusError
-    try:
-        rsp = client.chat.completions.create(**kwargs)
-    except AuthenticationError:
-        raise RuntimeError(
+
+
+def _error_openai(e: Exception) -> Exception | None:
+    """Traduce los errores HTTP de OpenAI a mensajes para el usuario (o ``None``)."""
+    from openai import AuthenticationError
+    if isinstance(e, AuthenticationError):
+        return RuntimeError(
             "Error de autenticaciÃ³n con OpenAI (401). VerificÃ¡ la OPENAI_API_KEY (y que no tenga espacios/quotes)."
         )
-    except APIStatusError as e:
-        if getattr(e, "status_code", None) == 403:
-            raise RuntimeError(
-                "403: La key es vÃ¡lida pero **no tiene acceso** al modelo especificado. ProbÃ¡ con otro modelo o pedÃ­ acceso."
-            ) from e
-        if getattr(e, "status_code", None) == 404:
-            raise RuntimeError(
-                "404: Modelo inexistente en tu cuenta/regiÃ³n. UsÃ¡ un modelo disponible para tu cuenta."
-            ) from e
-        raise
+    if getattr(e, "status_code", None) == 403:
+        return RuntimeError(
+            "403: La key es vÃ¡lida pero **no tiene acceso** al modelo especificado. ProbÃ¡ con otro modelo o pedÃ­ acceso."
+        )
+    if getattr(e, "status_code", None) == 404:
+        return RuntimeError(
+            "404: Modelo inexistente en tu cuenta/regiÃ³n. UsÃ¡ un modelo disponible para tu cuenta."
+        )
+    return None
+
+
+def _registrar_llamada(rsp: Any, tipo: str) -> None:
+    """Cuenta la llamada y los tokens que informa ``rsp.usage`` (si viene)."""
+    metricas.contar("llm_llamadas_total", tipo=tipo, resultado="ok")
+    uso = getattr(rsp, "usage", None)
+    for clase, campo in (("prompt", "prompt_tokens"), ("respuesta", "completion_tokens")):
+        n = getattr(uso, campo, None)
+        if isinstance(n, int):
+            metricas.contar("llm_tokens_total", n, tipo=tipo, clase=clase)
 
-    datos_api = json.loads(rsp.choices[0].message.content)
+
+_HILOS_LLM: ThreadPoolExecutor | None = None
+_HILOS_LLM_LOCK = threading.Lock()
+
+
+def _hilos_llm() -> ThreadPoolExecutor:
+    """Hilos para el pedido síncrono al modelo (mientras corren las heurísticas)."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    global _HILOS_LLM
+    with _HILOS_LLM_LOCK:
+        if _HILOS_LLM is None:
+            _HILOS_LLM = ThreadPoolExecutor(
+                int(_cfg.get("llm_concurrencia", 4)), thread_name_prefix="ospro-llm"
+            )
+        return _HILOS_LLM
+
+
+def _generales_cronometrados(texto: str, campos: List[str]) -> tuple[Dict[str, Any], float]:
+    t0 = time.perf_counter()
+    datos = _solicitar_generales(texto, campos)
+    return datos, _ms_desde(t0)
+
+
+async def _generales_cronometrados_async(
+    texto: str, campos: List[str], sem_llm: asyncio.Semaphore | None
+) -> tuple[Dict[str, Any], float]:
+    t0 = time.perf_counter()
+    if sem_llm is None:
+        datos = await _solicitar_generales_async(texto, campos)
+    else:
+        async with sem_llm:
+            datos = await _solicitar_generales_async(texto, campos)
+    return datos, _ms_desde(t0)
+
+
+def _solicitar_generales(texto: str, campos: List[str]) -> Dict[str, Any]:
+    """Llamada bloqueante al modelo; devuelve el JSON crudo de la respuesta."""
+    client = _get_openai_client()
+    kwargs = _kwargs_generales(texto, campos)
+    from openai import AuthenticationError, APIStatusError
+    try:
+        rsp = client.chat.completions.create(**kwargs)
+    except (AuthenticationError, APIStatusError) as e:
+        metricas.contar("llm_llamadas_total", tipo="generales", resultado="error")
+        err = _error_openai(e)
+        if err is None:
+            raise
+        raise err from e
+    _registrar_llamada(rsp, "generales")
+    return json.loads(rsp.choices[0].message.content)
+
+
+async def _solicitar_generales_async(texto: str, campos: List[str]) -> Dict[str, Any]:
+    """Igual que :func:`_solicitar_generales` pero con ``AsyncOpenAI``."""
+    client = _get_async_openai_client()
+    kwargs = _kwargs_generales(texto, campos)
+    from openai import AuthenticationError, APIStatusError
+    try:
+        rsp = await client.chat.completions.create(**kwargs)
+    except (AuthenticationError, APIStatusError) as e:
+        metricas.contar("llm_llamadas_total", tipo="generales", resultado="error")
+        err = _error_openai(e)
+        if err is None:
+            raise
+        raise err from e
+    _registrar_llamada(rsp, "generales")
+    return json.loads(rsp.choices[0].message.content)
+
+
+def _combinar(analisis: AnalisisDocumento, datos_api: Dict[str, Any]) -> Dict[str, Any]:
+    """Etapa final (CPU): concilia la respuesta del modelo con las heurísticas."""
+    dp_auto = copy.deepcopy(analisis.dp_auto)
+    imps_pre = copy.deepcopy(analisis.imputados)
+    datos: Dict[str, Any] = {"generales": {}, "imputados": []}
 
     # Nos quedamos con "generales" del JSON y con nuestros imputados ya saneados
     datos["generales"] = datos_api.get("generales", {})
@@ -1477,17 +2569,13 @@ def procesar_sentencia(file_bytes: bytes, filename: str) -> Dict[str, Any]:
     imps = datos.get("imputados") or []
 
     # Opcional: enriquecer SOLO dentro del bloque acotado
-    bloques_base = segmentar_imputados(texto_base)
-    if bloques_base:
-        extra = [_dp_from_block(b) for b in bloques_base if _es_bloque_valido(b)]
+    if analisis.bloques:
+        extra = [analisis.ficha(b) for b in analisis.bloques_validos]
         datos["imputados"] = _dedup_por_dni((datos["imputados"] or []) + extra)[:MAX_IMPUTADOS]
 
     # Fallback adicional: asegurar que todos los mencionados en
     # "los imputados ..., y sus respectivos defensores" estÃ©n presentes
-    try:
-        mencionados = _extraer_nombres_lista_intervinientes(texto)
-    except Exception:
-        mencionados = []
+    mencionados = analisis.mencionados
     if mencionados:
         actuales = datos.get("imputados") or []
         actuales_nombres_norm: set[str] = set()
@@ -1508,7 +2596,7 @@ def procesar_sentencia(file_bytes: bytes, filename: str) -> Dict[str, Any]:
 
     # 3) Ajustes post-API
     g = datos.get("generales", {})
-    g["resuelvo"] = extraer_resuelvo(texto)
+    g["resuelvo"] = analisis.resuelvo
     g["resuelvo"] = limpiar_pies_de_pagina(
         re.sub(r"\s*\n\s*", " ", g["resuelvo"])
     ).strip()
@@ -1518,16 +2606,31 @@ def procesar_sentencia(file_bytes: bytes, filename: str) -> Dict[str, Any]:
         g["resuelvo"],
     ).strip()
 
-    firmas = extraer_firmantes(texto)
+    firmas = copy.deepcopy(analisis.firmantes)
     if firmas:
         datos.setdefault("generales", {})["firmantes"] = firmas
 
+    # Local primero: lo que las heurísticas resuelven con confianza manda
+    locales = analisis.generales_locales
+    origen: Dict[str, str] = {"resuelvo": "local"}
+    if firmas:
+        origen["firmantes"] = "local"
+    if _local_primero():
+        umbral = _umbral_confianza()
+        for campo in CAMPOS_LLM:
+            loc = locales[campo]
+            if loc["valor"] and loc["confianza"] >= umbral:
+                g[campo] = loc["valor"]
+                origen[campo] = "local"
+    for campo in CAMPOS_LLM:
+        if campo not in origen and _as_str(g.get(campo)).strip():
+            origen[campo] = "llm"
+
     carat_raw = g.get("caratula", "").strip()
     trib_raw = g.get("tribunal", "").strip()
 
-    carat_ok = _qre_has_match(CARATULA_REGEX, carat_raw)
-    trib_ok  = _qre_has_match(TRIBUNAL_REGEX,  trib_raw)
-
+    carat_ok = caratula_valida(carat_raw)
+    trib_ok = tribunal_valido(trib_raw)
 
     if not carat_ok and (
         "cÃ¡mara" in carat_raw.lower() or "juzgado" in carat_raw.lower()
@@ -1538,14 +2641,22 @@ def procesar_sentencia(file_bytes: bytes, filename: str) -> Dict[str, Any]:
         trib_raw = ""
 
     if not carat_ok:
-        nueva_carat = extraer_caratula(texto)
+        nueva_carat = locales["caratula"]["valor"]
         if nueva_carat:
             g["caratula"] = nueva_carat
+            origen["caratula"] = "local"
 
     if not trib_ok:
-        nuevo_trib = extraer_tribunal(texto)
+        nuevo_trib = locales["tribunal"]["valor"]
         if nuevo_trib:
             g["tribunal"] = nuevo_trib
+            origen["tribunal"] = "local"
+
+    # Número y fecha: si el modelo no los trajo, vale el dato local aunque dude
+    for campo in ("sent_num", "sent_fecha"):
+        if not _as_str(g.get(campo)).strip() and locales[campo]["valor"]:
+            g[campo] = locales[campo]["valor"]
+            origen[campo] = "local"
 
     # Normalizar posibles mojibake en carátula/tribunal
     if g.get("caratula"):
@@ -1554,6 +2665,8 @@ def procesar_sentencia(file_bytes: bytes, filename: str) -> Dict[str, Any]:
         g["tribunal"] = _fix_mojibake(g.get("tribunal", ""))
 
     datos["generales"] = g
+    datos["origen"] = origen
+    datos["confianza"] = {c: locales[c]["confianza"] for c in CAMPOS_LLM}
 
 
     for imp in datos.get("imputados", []):
@@ -1580,13 +2693,225 @@ def procesar_sentencia(file_bytes: bytes, filename: str) -> Dict[str, Any]:
     return datos
 
 
+def _procesar_sentencia_sin_cache(
+    file_bytes: bytes, filename: str, *, progreso: Progreso | None = None
+) -> Dict[str, Any]:
+    """Extrae texto del archivo, llama a GPT y devuelve el dict final.
+
+    El pedido al modelo sale apenas están el contexto y los generales
+    locales, y corre en otro hilo mientras se segmenta y se aplican las
+    demás heurísticas: el total se acerca a ``max(modelo, heurísticas)``.
+    """
+    emitir = progreso or _sin_progreso
+    t0 = time.perf_counter()
+    crudo, texto = _texto_limpio(file_bytes, filename)
+    emitir(_evento("texto_extraido", caracteres=crudo, ms=_ms_desde(t0)))
+    emitir(_evento("pies_limpios", caracteres=len(texto)))
+    t0 = time.perf_counter()
+    analisis = _preparar_llm(texto)
+    ms_previo = _ms_desde(t0)
+
+    pedido: Future | None = None
+    faltan = _campos_para_llm(analisis)
+    if faltan:
+        emitir(_evento("llm_inicio", tokens=estimar_tokens(analisis.contexto_llm), campos=faltan))
+        pedido = _hilos_llm().submit(_generales_cronometrados, analisis.contexto_llm, faltan)
+    else:
+        emitir(_evento("llm_omitido"))
+    try:
+        t0 = time.perf_counter()
+        _segmentar_previo(analisis)
+        for ev in _eventos_segmentacion(analisis, ms_previo + _ms_desde(t0)):
+            emitir(ev)
+    except BaseException:
+        if pedido is not None:
+            pedido.cancel()
+        raise
+
+    datos_api: Dict[str, Any] = {}
+    if pedido is not None:
+        t0 = time.perf_counter()
+        datos_api, ms = pedido.result()
+        emitir(_evento("llm_fin", ms=ms, espera_ms=_ms_desde(t0)))
+    t0 = time.perf_counter()
+    datos = _combinar(analisis, datos_api)
+    emitir(_evento("postproceso", ms=_ms_desde(t0)))
+    return datos
+
+
+async def procesar_sentencia_eventos(
+    file_bytes: bytes,
+    filename: str,
+    *,
+    executor: Executor | None = None,
+    usar_cache: bool = True,
+    sem_llm: asyncio.Semaphore | None = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Procesa la sentencia cediendo un evento por etapa (ver ``Progreso``).
+
+    Los imputados detectados localmente salen como ``preliminar`` antes de
+    consultar al modelo; el último evento (``listo``) trae el resultado
+    completo, idéntico al de :func:`procesar_sentencia`.
+    """
+    emitir = _emisor(None)
+    async for ev in _eventos_sentencia(
+        file_bytes, filename, executor=executor, usar_cache=usar_cache, sem_llm=sem_llm
+    ):
+        emitir(ev)
+        yield ev
+
+
+async def _eventos_sentencia(
+    file_bytes: bytes,
+    filename: str,
+    *,
+    executor: Executor | None,
+    usar_cache: bool,
+    sem_llm: asyncio.Semaphore | None,
+) -> AsyncIterator[Dict[str, Any]]:
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    t_total = time.perf_counter()
+    cache = obtener_cache(_cfg)
+    clave = cache.clave(file_bytes, _version_cache())
+    if usar_cache:
+        datos = await loop.run_in_executor(None, cache.obtener, clave)
+        _registrar_cache(datos is not None)
+        if datos is not None:
+            yield _evento("cache")
+            for ev in _eventos_resultado(datos, t_total):
+                yield ev
+            return
+
+    t0 = time.perf_counter()
+    (crudo, texto), registros = await loop.run_in_executor(
+        executor, _con_metricas, _texto_limpio, file_bytes, filename
+    )
+    metricas.fusionar(registros)
+    yield _evento("texto_extraido", caracteres=crudo, ms=_ms_desde(t0))
+    yield _evento("pies_limpios", caracteres=len(texto))
+    t0 = time.perf_counter()
+    analisis, registros = await loop.run_in_executor(executor, _con_metricas, _preparar_llm, texto)
+    metricas.fusionar(registros)
+    ms_previo = _ms_desde(t0)
+
+    # el pedido al modelo queda en vuelo mientras el executor hace las heurísticas
+    pedido: asyncio.Future | None = None
+    faltan = _campos_para_llm(analisis)
+    if faltan:
+        yield _evento("llm_inicio", tokens=estimar_tokens(analisis.contexto_llm), campos=faltan)
+        pedido = asyncio.ensure_future(_generales_cronometrados_async(analisis.contexto_llm, faltan, sem_llm))
+    else:
+        yield _evento("llm_omitido")
+    try:
+        t0 = time.perf_counter()
+        analisis, registros = await loop.run_in_executor(executor, _con_metricas, _segmentar_previo, analisis)
+        metricas.fusionar(registros)
+        for ev in _eventos_segmentacion(analisis, ms_previo + _ms_desde(t0)):
+            yield ev
+
+        datos_api: Dict[str, Any] = {}
+        if pedido is not None:
+            t0 = time.perf_counter()
+            datos_api, ms = await pedido
+            yield _evento("llm_fin", ms=ms, espera_ms=_ms_desde(t0))
+    finally:
+        if pedido is not None:
+            pedido.cancel()
+
+    t0 = time.perf_counter()
+    datos, registros = await loop.run_in_executor(executor, _con_metricas, _combinar, analisis, datos_api)
+    metricas.fusionar(registros)
+    yield _evento("postproceso", ms=_ms_desde(t0))
+    await loop.run_in_executor(None, cache.guardar, clave, datos)
+    for ev in _eventos_resultado(datos, t_total):
+        yield ev
+
+
+async def procesar_sentencia_async(
+    file_bytes: bytes,
+    filename: str,
+    *,
+    executor: Executor | None = None,
+    usar_cache: bool = True,
+    sem_llm: asyncio.Semaphore | None = None,
+) -> Dict[str, Any]:
+    """Versión no bloqueante de :func:`procesar_sentencia` para el servidor.
+
+    Las etapas de CPU (pdfminer + regex) corren en ``executor`` (idealmente
+    un ``ProcessPoolExecutor``) y la llamada al modelo usa ``AsyncOpenAI``,
+    de modo que el event loop queda libre para atender otras subidas.
+    ``sem_llm`` acota cuántas llamadas al modelo hay en vuelo a la vez.
+    """
+    datos: Dict[str, Any] = {}
+    async for ev in procesar_sentencia_eventos(
+        file_bytes, filename, executor=executor, usar_cache=usar_cache, sem_llm=sem_llm
+    ):
+        if ev["evento"] == "listo":
+            datos = ev["datos"]
+    return datos
+
+
+async def procesar_lote_async(
+    archivos: Iterable[tuple[str, bytes | Path]],
+    *,
+    executor: Executor | None = None,
+    max_llm: int | None = None,
+    max_docs: int | None = None,
+    usar_cache: bool = True,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Procesa muchas sentencias y va entregando cada resultado al terminar.
+
+    ``archivos`` son pares ``(nombre, bytes)`` o ``(nombre, Path)``; las rutas
+    se leen recién cuando le toca el turno al documento.  Se cede un ``dict``
+    por archivo, en orden de finalización::
+
+        {"archivo": ..., "ok": True, "ms": 812.4, "datos": {...}}
+        {"archivo": ..., "ok": False, "ms": 15.0, "error": "..."}
+
+    ``max_llm`` acota las llamadas simultáneas al modelo (config
+    ``llm_concurrencia``) y ``max_docs`` los documentos en curso.
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    max_llm = max_llm or int(_cfg.get("llm_concurrencia", 4))
+    sem_llm = asyncio.Semaphore(max_llm)
+    sem_docs = asyncio.Semaphore(max_docs or max_llm * 2)
+
+    async def _uno(nombre: str, origen: bytes | Path) -> Dict[str, Any]:
+        async with sem_docs:
+            t0 = time.perf_counter()
+            try:
+                if isinstance(origen, Path):
+                    origen = await loop.run_in_executor(None, origen.read_bytes)
+                datos = await procesar_sentencia_async(
+                    origen, nombre, executor=executor, usar_cache=usar_cache, sem_llm=sem_llm
+                )
+            except Exception as e:
+                ms = (time.perf_counter() - t0) * 1000
+                return {"archivo": nombre, "ok": False, "ms": round(ms, 1), "error": f"{type(e).__name__}: {e}"}
+            ms = (time.perf_counter() - t0) * 1000
+            return {"archivo": nombre, "ok": True, "ms": round(ms, 1), "datos": datos}
+
+    tareas = [asyncio.ensure_future(_uno(n, o)) for n, o in archivos]
+    try:
+        for fut in asyncio.as_completed(tareas):
+            yield await fut
+    finally:
+        for t in tareas:
+            t.cancel()
+
+
 # â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€ Alias pÃºblico para la web â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
-def autocompletar(file_bytes: bytes, filename: str) -> None:
+def autocompletar(file_bytes: bytes, filename: str, progreso: Progreso | None = None) -> None:
     """
     Procesa la sentencia y vuelca todos los campos
     en `st.session_state`.  La UI se actualizarÃ¡ sola.
     """
-    datos = procesar_sentencia(file_bytes, filename)
+    import streamlit as st
+    datos = procesar_sentencia(file_bytes, filename, progreso=progreso)
     st.session_state.datos_autocompletados = datos
 
     # ----- GENERALES -----
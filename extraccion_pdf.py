@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+extraccion_pdf.py – texto de PDFs largos repartido en procesos
+---------------------------------------------------------------
+
+``pdfminer`` es Python puro y de un solo hilo: en sentencias de más de cien
+páginas la extracción se lleva casi todo el tiempo.  Acá el PDF se parte en
+rangos de páginas, cada rango se extrae en un proceso distinto y los textos
+se unen en orden.  El resultado es idéntico al de ``extract_text``: cada
+página termina con un salto de página (``\\f``), así que los límites entre
+páginas se conservan (ver :func:`paginas`).
+
+Lo usan ``core.extraer_texto`` y el ``Worker`` de la app de escritorio.
+Para PDFs cortos, con un solo proceso o dentro de un proceso que ya es
+parte de un pool, :func:`extraer_en_paralelo` devuelve ``None`` y el
+llamador sigue con su extracción secuencial de siempre.
+
+:func:`extraer_extremos` lee sólo las primeras y las últimas páginas
+(carátula, imputados, RESUELVO y firmas); el medio se pide aparte si hace
+falta, y ``inicio + medio + final`` da el mismo texto que leer todo.
+"""
+from __future__ import annotations
+
+import atexit
+import io
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Dict
+
+# multiprocessing/concurrent.futures se importan al paralelizar: los PDF
+# cortos (la mayoría) no los necesitan y el arranque de core queda liviano.
+if TYPE_CHECKING:
+    from concurrent.futures import Executor, ProcessPoolExecutor
+
+# Por debajo de este número de páginas levantar procesos cuesta más de lo que ahorra
+PAGINAS_MIN_PARALELO = 40
+# Páginas mínimas por tarea; se hacen ~2 tareas por proceso para repartir mejor
+PAGINAS_MIN_TAREA = 8
+# Con menos páginas intermedias que esto no vale la pena leer por extremos
+PAGINAS_MIN_MEDIO = 3
+SALTO_PAGINA = "\f"
+
+_POOL: ProcessPoolExecutor | None = None
+_POOL_PROCESOS = 0
+_POOL_LOCK = threading.Lock()
+
+
+def procesos_pdf(cfg: Dict[str, Any] | None = None) -> int:
+    """Procesos para extraer: ``OSPRO_PROCESOS_PDF`` → ``procesos_pdf`` de config → núcleos."""
+    cfg = cfg or {}
+    try:
+        n = int(os.environ.get("OSPRO_PROCESOS_PDF") or cfg.get("procesos_pdf") or os.cpu_count() or 1)
+    except ValueError:
+        n = os.cpu_count() or 1
+    return max(n, 1)
+
+
+def contar_paginas(data: bytes) -> int:
+    """Número de páginas del PDF (0 si no se puede leer)."""
+    try:
+        from pdfminer.pdfpage import PDFPage
+        return sum(1 for _ in PDFPage.get_pages(io.BytesIO(data)))
+    except Exception:
+        return 0
+
+
+def paginas(texto: str) -> list[str]:
+    """Separa el texto de un PDF en páginas (sin el ``\\f`` final)."""
+    partes = texto.split(SALTO_PAGINA)
+    if partes and not partes[-1].strip():
+        partes.pop()
+    return partes
+
+
+def _rangos(n_paginas: int, tareas: int) -> list[tuple[int, int]]:
+    """Divide ``[0, n_paginas)`` en hasta ``tareas`` rangos contiguos parejos."""
+    tareas = max(1, min(tareas, n_paginas // PAGINAS_MIN_TAREA or 1))
+    base, resto = divmod(n_paginas, tareas)
+    rangos, desde = [], 0
+    for i in range(tareas):
+        hasta = desde + base + (1 if i < resto else 0)
+        rangos.append((desde, hasta))
+        desde = hasta
+    return rangos
+
+
+def extraer_paginas(data: bytes, desde: int, hasta: int) -> str:
+    """Texto de las páginas ``[desde, hasta)`` (también corre en los hijos del pool)."""
+    from pdfminer.high_level import extract_text
+    return extract_text(io.BytesIO(data), page_numbers=range(desde, hasta), maxpages=hasta)
+
+
+def _pool(procesos: int) -> ProcessPoolExecutor:
+    """Pool compartido (``spawn``: la app de escritorio tiene hilos de Qt)."""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    global _POOL, _POOL_PROCESOS
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_PROCESOS != procesos:
+            if _POOL is not None:
+                _POOL.shutdown(wait=False)
+            _POOL = ProcessPoolExecutor(procesos, mp_context=multiprocessing.get_context("spawn"))
+            _POOL_PROCESOS = procesos
+        return _POOL
+
+
+def _descartar_pool(pool: ProcessPoolExecutor) -> None:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is pool:
+            _POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+@atexit.register
+def _cerrar_pool() -> None:
+    if _POOL is not None:
+        _POOL.shutdown(wait=False, cancel_futures=True)
+
+
+def extraer_en_paralelo(
+    data: bytes,
+    *,
+    procesos: int,
+    executor: Executor | None = None,
+    min_paginas: int = PAGINAS_MIN_PARALELO,
+    rango: tuple[int, int] | None = None,
+) -> str | None:
+    """Texto del PDF (o de las páginas ``rango``) extrayendo tramos en paralelo.
+
+    Devuelve ``None`` cuando no conviene paralelizar (pocas páginas, un
+    solo proceso, PDF ilegible o ya dentro de un proceso hijo de un pool);
+    en ese caso el llamador debe usar ``extract_text`` directamente.
+    """
+    if procesos <= 1:
+        return None
+    import multiprocessing
+    from concurrent.futures.process import BrokenProcessPool
+
+    if executor is None and multiprocessing.parent_process() is not None:
+        return None
+    inicio, fin = rango if rango is not None else (0, contar_paginas(data))
+    n = fin - inicio
+    if n < max(min_paginas, 2):
+        return None
+    pool = executor or _pool(procesos)
+    try:
+        futuros = [
+            pool.submit(extraer_paginas, data, inicio + desde, inicio + hasta)
+            for desde, hasta in _rangos(n, procesos * 2)
+        ]
+        return "".join(f.result() for f in futuros)
+    except BrokenProcessPool:
+        # un hijo murió (memoria, señal…): se descarta el pool y se sigue en serie
+        if executor is None:
+            _descartar_pool(pool)
+        return None
+
+
+def extraer_extremos(data: bytes, cabeza: int, cola: int) -> tuple[str, str, int] | None:
+    """``(primeras páginas, últimas páginas, total)`` o ``None`` si el PDF es corto.
+
+    Las páginas ``[cabeza, total - cola)`` quedan sin leer; se obtienen con
+    ``extraer_paginas(data, cabeza, total - cola)``.
+    """
+    n = contar_paginas(data)
+    if n < cabeza + cola + PAGINAS_MIN_MEDIO:
+        return None
+    return extraer_paginas(data, 0, cabeza), extraer_paginas(data, n - cola, n), n
+
+
+__all__ = [
+    "extraer_en_paralelo",
+    "extraer_extremos",
+    "extraer_paginas",
+    "procesos_pdf",
+    "contar_paginas",
+    "paginas",
+    "SALTO_PAGINA",
+]
@@ -0,0 +1,80 @@
+# lote.py
+"""
+Procesa en lote sentencias PDF/DOCX desde la línea de comandos.
+
+    python lote.py CARPETA_O_ARCHIVO [...] [--procesos N] [--llm N] [-o salida.ndjson]
+
+Escribe NDJSON (una línea por archivo, a medida que terminan) con el nombre,
+el tiempo en ms y los datos extraídos o el error.  Usa el mismo motor y la
+misma caché que la web y la API.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import core
+
+EXTENSIONES = (".pdf", ".docx")
+
+
+def _expandir(rutas: list[str]) -> list[Path]:
+    """Archivos sueltos más todos los PDF/DOCX de las carpetas (recursivo)."""
+    out: list[Path] = []
+    for r in rutas:
+        p = Path(r)
+        if p.is_dir():
+            out.extend(sorted(f for f in p.rglob("*") if f.suffix.lower() in EXTENSIONES and f.is_file()))
+        elif p.suffix.lower() in EXTENSIONES:
+            out.append(p)
+        else:
+            print(f"Ignorado (no es PDF/DOCX ni carpeta): {r}", file=sys.stderr)
+    return out
+
+
+async def _correr(archivos: list[Path], args, salida) -> int:
+    errores = 0
+    with ProcessPoolExecutor(max_workers=args.procesos) as executor:
+        async for res in core.procesar_lote_async(
+            [(str(a), a) for a in archivos],
+            executor=executor,
+            max_llm=args.llm,
+            usar_cache=not args.sin_cache,
+        ):
+            errores += not res["ok"]
+            salida.write(json.dumps(res, ensure_ascii=False) + "\n")
+            salida.flush()
+    return errores
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Autocompletar en lote desde sentencias PDF/DOCX.")
+    parser.add_argument("rutas", nargs="+", help="archivos o carpetas con sentencias")
+    parser.add_argument("--procesos", type=int, default=os.cpu_count() or 1,
+                        help="procesos para extracción y heurísticas (default: núcleos)")
+    parser.add_argument("--llm", type=int, default=None,
+                        help="llamadas simultáneas al modelo (default: config 'llm_concurrencia' o 4)")
+    parser.add_argument("--sin-cache", action="store_true", help="ignorar resultados guardados")
+    parser.add_argument("-o", "--salida", help="archivo NDJSON de salida (default: stdout)")
+    args = parser.parse_args(argv)
+
+    archivos = _expandir(args.rutas)
+    if not archivos:
+        print("No se encontraron sentencias.", file=sys.stderr)
+        return 1
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as fh:
+            errores = asyncio.run(_correr(archivos, args, fh))
+    else:
+        errores = asyncio.run(_correr(archivos, args, sys.stdout))
+    print(f"{len(archivos)} archivo(s), {errores} con error.", file=sys.stderr)
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+metricas.py – contadores y tiempos por etapa del motor de extracción
+---------------------------------------------------------------------
+
+Registro en memoria, por proceso y sin dependencias, de:
+
+* contadores (``contar``): aciertos de caché, llamadas al modelo, tokens…
+* histogramas de milisegundos (``observar``): extracción, regex, LLM…
+
+Cada serie se identifica por nombre + etiquetas.  ``exportar_prometheus``
+devuelve el formato de texto de Prometheus (lo sirve ``/metrics`` en
+``api.py``) e ``instantanea`` un ``dict`` para el panel de depuración de
+``app.py``.
+
+Las etapas de CPU pueden correr en un pool de procesos, donde el registro
+global no es visible para el proceso principal.  Para esos casos
+``recolectar()`` desvía lo registrado por el hilo actual a una lista que
+viaja de vuelta con el resultado y se aplica con ``fusionar()``.
+"""
+from __future__ import annotations
+
+import bisect
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Tuple
+
+PREFIJO = "ospro_"
+
+# Límites superiores (ms) de los buckets de los histogramas
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+_Etiquetas = Tuple[Tuple[str, str], ...]
+_Clave = Tuple[str, _Etiquetas]
+
+
+class _Histograma:
+    __slots__ = ("buckets", "cuenta", "suma", "maximo")
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)   # el último es +Inf
+        self.cuenta = 0
+        self.suma = 0.0
+        self.maximo = 0.0
+
+    def observar(self, ms: float) -> None:
+        self.buckets[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.cuenta += 1
+        self.suma += ms
+        self.maximo = max(self.maximo, ms)
+
+
+class Metricas:
+    """Registro de contadores e histogramas, seguro entre hilos."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._contadores: Dict[_Clave, float] = {}
+        self._histogramas: Dict[_Clave, _Histograma] = {}
+        self._ayuda: Dict[str, str] = {}
+        self._local = threading.local()
+
+    # ── registro ──────────────────────────────────────────────────
+    @staticmethod
+    def _clave(nombre: str, etiquetas: Dict[str, Any]) -> _Clave:
+        return nombre, tuple(sorted((k, str(v)) for k, v in etiquetas.items()))
+
+    def describir(self, nombre: str, ayuda: str) -> None:
+        """Texto ``# HELP`` de la serie ``nombre``."""
+        self._ayuda[nombre] = ayuda
+
+    def contar(self, nombre: str, valor: float = 1, **etiquetas: Any) -> None:
+        if self._desviar(("c", nombre, valor, etiquetas)):
+            return
+        clave = self._clave(nombre, etiquetas)
+        with self._lock:
+            self._contadores[clave] = self._contadores.get(clave, 0) + valor
+
+    def observar(self, nombre: str, ms: float, **etiquetas: Any) -> None:
+        if self._desviar(("h", nombre, ms, etiquetas)):
+            return
+        clave = self._clave(nombre, etiquetas)
+        with self._lock:
+            hist = self._histogramas.get(clave)
+            if hist is None:
+                hist = self._histogramas[clave] = _Histograma()
+            hist.observar(ms)
+
+    def reiniciar(self) -> None:
+        with self._lock:
+            self._contadores.clear()
+            self._histogramas.clear()
+
+    # ── procesos auxiliares ───────────────────────────────────────
+    def _desviar(self, registro: tuple) -> bool:
+        destino = getattr(self._local, "destino", None)
+        if destino is None:
+            return False
+        destino.append(registro)
+        return True
+
+    @contextmanager
+    def recolectar(self) -> Iterator[List[tuple]]:
+        """Junta en una lista (serializable) lo que registre este hilo."""
+        previo = getattr(self._local, "destino", None)
+        self._local.destino = registros = []
+        try:
+            yield registros
+        finally:
+            self._local.destino = previo
+
+    def fusionar(self, registros: List[tuple]) -> None:
+        """Aplica registros juntados con :meth:`recolectar`."""
+        for tipo, nombre, valor, etiquetas in registros:
+            if tipo == "c":
+                self.contar(nombre, valor, **etiquetas)
+            else:
+                self.observar(nombre, valor, **etiquetas)
+
+    # ── lectura ───────────────────────────────────────────────────
+    def instantanea(self) -> Dict[str, Any]:
+        """``{"contadores": {...}, "tiempos_ms": {...}}`` con claves legibles."""
+        with self._lock:
+            contadores = {_legible(c): v for c, v in sorted(self._contadores.items())}
+            tiempos = {
+                _legible(c): {
+                    "n": h.cuenta,
+                    "media": round(h.suma / h.cuenta, 1) if h.cuenta else 0.0,
+                    "max": round(h.maximo, 1),
+                    "total": round(h.suma, 1),
+                }
+                for c, h in sorted(self._histogramas.items())
+            }
+        return {"contadores": contadores, "tiempos_ms": tiempos}
+
+    def exportar_prometheus(self) -> str:
+        """Formato de exposición de texto de Prometheus (versión 0.0.4)."""
+        lineas: List[str] = []
+        with self._lock:
+            contadores = sorted(self._contadores.items())
+            histogramas = sorted(
+                (c, (list(h.buckets), h.cuenta, h.suma)) for c, h in self._histogramas.items()
+            )
+        vistos: set[str] = set()
+
+        def _cabecera(nombre: str, tipo: str) -> None:
+            if nombre in vistos:
+                return
+            vistos.add(nombre)
+            if nombre in self._ayuda:
+                lineas.append(f"# HELP {PREFIJO}{nombre} {self._ayuda[nombre]}")
+            lineas.append(f"# TYPE {PREFIJO}{nombre} {tipo}")
+
+        for (nombre, etiquetas), valor in contadores:
+            _cabecera(nombre, "counter")
+            lineas.append(f"{PREFIJO}{nombre}{_etiquetas(etiquetas)} {_numero(valor)}")
+        for (nombre, etiquetas), (buckets, cuenta, suma) in histogramas:
+            _cabecera(nombre, "histogram")
+            acumulado = 0
+            for limite, n in zip(list(BUCKETS_MS) + ["+Inf"], buckets):
+                acumulado += n
+                le = etiquetas + (("le", str(limite)),)
+                lineas.append(f"{PREFIJO}{nombre}_bucket{_etiquetas(le)} {acumulado}")
+            lineas.append(f"{PREFIJO}{nombre}_sum{_etiquetas(etiquetas)} {_numero(suma)}")
+            lineas.append(f"{PREFIJO}{nombre}_count{_etiquetas(etiquetas)} {cuenta}")
+        return "\n".join(lineas) + "\n"
+
+
+def _escapar(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _etiquetas(etiquetas: _Etiquetas) -> str:
+    if not etiquetas:
+        return ""
+    return "{" + ",".join(f'{k}="{_escapar(v)}"' for k, v in etiquetas) + "}"
+
+
+def _numero(valor: float) -> str:
+    return str(int(valor)) if float(valor).is_integer() else repr(round(valor, 3))
+
+
+def _legible(clave: _Clave) -> str:
+    nombre, etiquetas = clave
+    if not etiquetas:
+        return nombre
+    return nombre + "[" + ",".join(f"{k}={v}" for k, v in etiquetas) + "]"
+
+
+# Registro del proceso
+METRICAS = Metricas()
+contar = METRICAS.contar
+observar = METRICAS.observar
+recolectar = METRICAS.recolectar
+fusionar = METRICAS.fusionar
+instantanea = METRICAS.instantanea
+exportar_prometheus = METRICAS.exportar_prometheus
+
+for _nombre, _ayuda in (
+    ("sentencias_total", "Sentencias procesadas, por origen del resultado (cache/motor)."),
+    ("cache_total", "Consultas a la caché de sentencias, por resultado (acierto/fallo)."),
+    ("etapa_ms", "Duración de cada etapa del pipeline en milisegundos."),
+    ("llm_llamadas_total", "Llamadas al modelo, por tipo (generales/nombre) y resultado."),
+    ("nombres_modelo_total", "Nombres dudosos resueltos con el modelo, por origen (pedido/memo)."),
+    ("llm_tokens_total", "Tokens informados por la API, por tipo y clase (prompt/respuesta)."),
+    ("llm_omitido_total", "Sentencias resueltas sin consultar al modelo."),
+    ("bloques_total", "Bloques de texto segmentados como posibles imputados."),
+    ("imputados_total", "Imputados detectados por las heurísticas locales."),
+    ("regex_timeout_total", "Búsquedas de regex cortadas por tiempo, por patrón."),
+    ("regex_ventana_total", "Búsquedas de regex recortadas a una ventana (sin el módulo regex), por patrón."),
+    ("textos_total", "Consultas a la base de textos extraídos, por resultado (acierto/fallo)."),
+    ("paginas_pdf_total", "Páginas de PDF según la lectura (extremos/omitidas/completa)."),
+    ("openai_clientes_total", "Clientes OpenAI creados, por modo (sync/async)."),
+):
+    METRICAS.describir(_nombre, _ayuda)
@@ -4,6 +4,7 @@ Generador de documentos judiciales – versión base
 Interfaz: datos generales + pestañas de imputados (sin plantillas)
 """
 import sys, json, os
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
 import re
@@ -45,19 +46,26 @@ from PySide6.QtGui import (
     QRegularExpressionValidator,
 )
 from PySide6.QtGui import QTextBlockFormat, QTextCharFormat, QTextDocument
-# ── NUEVOS IMPORTS ──────────────────────────────────────────────
-import openai                    # cliente oficial
-from pdfminer.high_level import extract_text              # PDF → texto
-import docx2txt                  # DOCX → texto
-try:
-    import requests                  # manejar conexiones a través de proxy
-except ImportError:
-    requests = None  # type: ignore
 import ast
 import subprocess
 import shutil
 import tempfile
 from helpers import anchor, anchor_html, strip_anchors, _strip_anchor_styles, strip_color
+from validadores import TRIBUNAL_PATRON, caratula_valida
+import cliente_motor
+# Utilidades de texto del motor; también las usa la interfaz (normalizar,
+# capitalizar) y se siguen exponiendo desde acá.
+from core import (
+    capitalizar_frase,
+    extraer_caratula,
+    extraer_dni,
+    extraer_firmantes,
+    extraer_resuelvo,
+    extraer_tribunal,
+    limpiar_pies_de_pagina,
+    normalizar_caratula,
+    normalizar_dni,
+)
 
 # Nombre del archivo de configuración distribuido con la aplicación
 CONFIG_FILE = "config.json"
@@ -81,7 +89,6 @@ def _cargar_config() -> dict:
 
 _CONFIG = _cargar_config()
 OPENAI_API_KEY_DEFAULT = _CONFIG.get("api_key", "")
-PROXY_URL_DEFAULT = _CONFIG.get("proxy", "")
 
 # ──────────────────── utilidades menores ────────────────────
 class NoWheelComboBox(QComboBox):
@@ -347,376 +354,81 @@ def strip_trailing_single_dot(text: str | None) -> str:
 
     return text
 
-# ── limpiar pies de página recurrentes ────────────────────────────────
-_FOOTER_REGEX = re.compile(
-    r"""
-    \s*                                # espacios iniciales
-    Expediente\s+SAC\s+\d+\s*-\s*      # Expediente SAC 13393379 -
-    P[áa]g\.\s*\d+\s*/\s*\d+\s*-\s*    # Pág. 13 / 15 -
-    N(?:[°º]|ro\.?|o\.)?\s*Res\.\s*\d+\s*
-    """,
-    re.IGNORECASE | re.VERBOSE,
-)
-
-
-def limpiar_pies_de_pagina(texto: str) -> str:
-    """Elimina de `texto los pies de página estándar de las sentencias."""
-    return re.sub(_FOOTER_REGEX, " ", texto)
-
-# ­­­ ---- bloque RESUELVE / RESUELVO ───────────────────────────────
-_RESUELVO_REGEX = re.compile(
-    r"""
-    resuelv[eo]\s*:?\s*                           # “RESUELVE:” / “RESUELVO:”
-    (?P<bloque>                                   # ← bloque que queremos extraer
-        (?:
-            (?:                                   # ─ un inciso: I) / 1. / II.- …
-                \s*(?:[IVXLCDM]+|\d+)             #   núm. romano o arábigo
-                \s*(?:\)|\.-|\.|-|-)              #   )  .  -  -  o .-   ← ¡cambio!
-                \s+
-                .*?                               #   texto del inciso (lazy)
-                (?:                               #   líneas del mismo inciso
-                    \n(?!\s*(?:[IVXLCDM]+|\d+)\s*(?:\)|\.-|\.|-|-)).*?
-                )*
-            )
-        )+                                        # uno o más incisos
-    )
-    (?=                                           # -- corte del bloque --
-        \s*(?:Protocol[íi]?cese|Notifíquese|
-            Hágase\s+saber|Of[íi]ciese)           # fórmulas de cierre
-        |\Z                                       # o fin de texto
-    )
-    """,
-    re.IGNORECASE | re.DOTALL | re.VERBOSE,
-)
-
-# ── CARÁTULA ──────────────────────────────────────────────────────────
-_PAT_CARAT_1 = re.compile(          # 1) entre comillas
-    r'“([^”]+?)”\s*\(\s*(?:SAC|Expte\.?)\s*N°?\s*([\d.]+)\s*\)', re.I)
-
-_PAT_CARAT_2 = re.compile(          # 2) autos caratulados “…”
-    r'autos?\s+(?:se\s+)?(?:denominad[oa]s?|intitulad[oa]s?|'
-    r'caratulad[oa]s?)\s+[«"”]?([^"»\n]+)[»"”]?', re.I)
-
-_PAT_CARAT_3 = re.compile(          # 3) encabezado “EXPEDIENTE SAC: … - …”
-    r'EXPEDIENTE\s+(?:SAC|Expte\.?)\s*:?\s*([\d.]+)\s*-\s*(.+?)(?:[-–]|$)', re.I)
-
-def extraer_caratula(txt: str) -> str:
-    """
-    Devuelve la carátula formal “…” (SAC N° …) o '' si no encuentra nada creíble.
-    Se prueban, en orden, tres patrones:
-      1. Entre comillas + (SAC/Expte N° …)
-      2. Frase “… autos caratulados ‘X’ …”
-      3. Encabezado “EXPEDIENTE SAC: 123 – X – …”
-    """
-    # normalizo blancos para evitar saltos de línea entre tokens
-    plano = re.sub(r'\s+', ' ', txt)
-
-    m = _PAT_CARAT_1.search(plano)
-    if m:
-        titulo, nro = m.groups()
-        return f'“{titulo.strip()}” (SAC N° {nro})'
-
-    m = _PAT_CARAT_2.search(plano)
-    if m:
-        titulo = m.group(1).strip()
-        # intento buscar el número SAC/Expte más próximo
-        mnum = re.search(r'(?:SAC|Expte\.?)\s*N°?\s*([\d.]+)', plano)
-        nro  = mnum.group(1) if mnum else '…'
-        return f'“{titulo}” (SAC N° {nro})'
-
-    # El encabezado suele estar en la primera página; me quedo con la 1ª coincidencia
-    encabezados = _PAT_CARAT_3.findall(plano[:5000])
-    if encabezados:
-        nro, resto = encabezados[0]
-        titulo = resto.split(' - ')[0].strip()
-        return f'“{titulo}” (SAC N° {nro})'
-    return ""
-
-# ── TRIBUNAL ──────────────────────────────────────────────────────────
-# Lista de palabras clave válidas al inicio de la descripción
-_CLAVES_TRIB = (
-    r'Cámara|Juzgado|Tribunal|Sala|Corte'  # extensible
-)
-
-# 1) “… en esta Cámara / en el Juzgado …”
-_PAT_TRIB_1 = re.compile(
-    rf'en\s+(?:esta|este|el|la)\s+({_CLAVES_TRIB}[^,;.]+)', re.I)
-
-# 2) encabezado en versales: “CAMARA EN LO CRIMINAL Y CORRECCIONAL 3ª NOM.”
-_PAT_TRIB_2 = re.compile(
-    r'(CAMARA\s+EN\s+LO\s+CRIMINAL[^/]+NOM\.)', re.I)
-
-def _formatea_tribunal(raw: str) -> str:
-    """Pasa a minúsculas y respeta mayúsculas iniciales."""
-    raw = raw.lower()
-    return capitalizar_frase(raw)
-
-def extraer_tribunal(txt: str) -> str:
-    """Devuelve la mención al órgano: 'la Cámara …' / 'el Juzgado …'."""
-    plano = re.sub(r'\s+', ' ', txt)
-
-    m = _PAT_TRIB_1.search(plano)
-    if m:
-        t = _formatea_tribunal(m.group(1))
-        if not re.match(r'^(el|la)\s', t, re.I):
-            t = 'la ' + t
-        return t.strip(' .')
-
-    m = _PAT_TRIB_2.search(plano[:2000])  # suele estar arriba de todo
-    if m:
-        nom = m.group(1)
-        nom = (nom
-               .replace('CAMARA', 'la Cámara')
-               .replace('NOM.-', 'Nominación')
-               .replace('NOM.',  'Nominación')
-               .title())        # Cámara En Lo…
-        return nom
-    return ""
-
-
-_FIRMA_FIN_PAT = re.compile(
-    r'''
-        ^\s*(?:[\-\u2022*·]\s*)?   # posible viñeta o puntuación inicial
-        (?:
-            (?:Texto\s+)?Firmad[oa]\s+digitalmente(?:\s+por:)?  # "Firmado digitalmente por:"
-          | Firmad[oa]                                 # Firmado / Firmada
-          | Firma\s+digital                            # Firma digital
-          | Texto\s+Firmado                            # Texto Firmado digitalmente
-          | Fdo\.?                                     # Fdo.:
-          | Fecha\s*:\s*\d{4}                         # Fecha: 2025‑08‑02
-          | Expediente\s+SAC                           # Expediente SAC …
-        )
-    ''', re.I | re.M | re.X)
-
-def extraer_resuelvo(texto: str) -> str:
-    """
-    Devuelve el ÚLTIMO bloque dispositvo completo (incluidas las fórmulas
-    'Protocolícese', 'Notifíquese', 'Ofíciese', etc.).  Algoritmo:
-
-    1.  Quita pies de página repetitivos.
-    2.  Busca la última aparición de 'RESUELVE' / 'RESUELVO'.
-    3.  Toma desde allí hasta la primera línea que parezca una firma
-        o meta‑dato (o hasta el final del documento si no hay nada).
-    """
-    texto = limpiar_pies_de_pagina(texto)
-
-    # 1) posición de la última palabra RESUELVE / RESUELVO
-    idx = max(texto.lower().rfind("resuelve"),
-              texto.lower().rfind("resuelvo"))
-    if idx == -1:
-        return ""
-
-    frag = texto[idx:]                        # desde RESUELVE hasta el final
-
-    # 2) cortar justo antes de firmas / fechas
-    m_fin = _FIRMA_FIN_PAT.search(frag)
-    if m_fin:
-        frag = frag[:m_fin.start()]
-
-    # 3) prolijo
-    frag = frag.strip()
-
-    # quitar encabezado "RESUELVE:" / "RESUELVO:" si quedó incluido
-    frag = re.sub(r"^resuelv[eo]\s*:?\s*", "", frag, flags=re.I)
-
-    return frag
-
-
-# ── helper para capturar FIRMANTES ────────────────────────────
-# ── helper para capturar FIRMANTES ────────────────────────────
-_FIRMAS_REGEX = re.compile(r'''
-    # Cabecera opcional: "Firmado digitalmente por:" (con o sin "Texto")
-    (?:^|\n)\s*
-    (?: (?:Texto\s+)?Firmad[oa]\s+digitalmente\s+por:\s* )?      
-
-    # Nombre (mayúsculas con espacios, puntos o guiones)
-    (?P<nombre>[A-ZÁÉÍÓÚÑ][A-ZÁÉÍÓÚÑ\s.\-]+?)\s*                
-
-    # Separador: coma o salto de línea
-    (?: ,\s* | \n\s* )
-
-    # Cargo (toma todo hasta salto de línea o coma)
-    (?P<cargo>[A-ZÁÉÍÓÚÑ/][^\n,]+)                              
-
-    # Documento opcional en la misma línea o inmediata
-    (?: [,\s]* \n?\s* (?:CUIL|DNI|ID)\s* (?P<doc>[\d.\-]+) )?    
-
-    # Debe haber una línea "Fecha: aaaa.mm.dd" a ≤2 renglones
-    (?= (?:[^\n]*\n){0,2}\s*Fecha\s*:\s*\d{4}[./-]\d{2}[./-]\d{2} )
-''', re.IGNORECASE | re.MULTILINE | re.UNICODE | re.VERBOSE)
-
-# ── validaciones de campos ─────────────────────────────────────────────
-# Carátula: debe incluir comillas y un número de expediente o SAC
-CARATULA_REGEX = QRegularExpression(
-    r'^["“][^"”]+(?:\(Expte\.\s*N°\s*\d+\))?["”](?:\s*\((?:SAC|Expte\.?\s*)\s*N°\s*\d+\))?$'
-)
-# Tribunal: al menos una letra minúscula y empezar en mayúscula
-TRIBUNAL_REGEX = QRegularExpression(r'^(?=.*[a-záéíóúñ])[A-ZÁÉÍÓÚÑ].*$')
-
-# ── NUEVO BLOQUE ─────────────────────────────────────────────
-DNI_REGEX = re.compile(
-    r'\b(?:\d{1,3}\.){2}\d{3}\b'   # 12.345.678 con puntos
-    r'|\b\d{7,8}\b'                # 12345678 sin puntos
-)
-
-def extraer_dni(texto: str) -> str:
-    """Devuelve sólo los dígitos del primer DNI hallado en texto."""
-    if not texto:
-        return ""
-    m = DNI_REGEX.search(texto)
-    return normalizar_dni(m.group(0)) if m else ""
-# ─────────────────────────────────────────────────────────────
-
-
-def capitalizar_frase(txt: str) -> str:
-    """Devuelve la frase en mayúsculas y minúsculas tipo título."""
-    minus = {"de", "del", "la", "las", "y", "en", "el", "los"}
-    palabras = txt.lower().split()
-    if not palabras:
-        return txt
-    for i, w in enumerate(palabras):
-        if i == 0 or w not in minus:
-            palabras[i] = w.capitalize()
-    return " ".join(palabras)
-
-
-def normalizar_caratula(txt: str) -> str:
-    """Reemplaza comillas simples por dobles y normaliza espacios."""
-    if txt is None:
-        return ""
-    txt = txt.strip()
-    txt = txt.replace("\u201c", '"').replace("\u201d", '"')
-    txt = txt.replace("'", '"')
-    return txt
-
-
-def normalizar_dni(txt: str) -> str:
-    """Devuelve solo los dígitos del DNI."""
-    if txt is None:
-        return ""
-    return re.sub(r"\D", "", str(txt))
-
-
-
-def extraer_firmantes(texto: str) -> list[dict]:
-    """
-    Devuelve [{'nombre':…, 'cargo':…, 'doc':…}, …] con cada
-    firma hallada en el texto de la sentencia.
-    """
-    firmas = []
-    for m in _FIRMAS_REGEX.finditer(texto):
-        firmas.append({
-            "nombre": capitalizar_frase(m.group("nombre")).strip(),
-            "cargo" : capitalizar_frase(m.group("cargo")).strip(),
-            "doc"   : (m.group("doc") or "").strip(),
-        })
-    return firmas
 
 # ----------------------------------------------------------------------
 class Worker(QObject):
     """
-    Convierte PDF / DOCX a texto, llama a la API de OpenAI, procesa
-    el JSON y devuelve el dict final listo para volcar en la GUI.
-    Trabaja en un hilo separado para no congelar la interfaz.
+    Procesa la sentencia con el motor de ``core`` (en este proceso o en un
+    servidor ``api.py``, ver ``cliente_motor``) y devuelve el dict final
+    listo para volcar en la GUI.  Trabaja en un hilo separado para no
+    congelar la interfaz.
     """
     finished = Signal(dict, str)          # (datos, error)
+    progreso = Signal(str)                # etapa en curso, para el diálogo de espera
 
     def __init__(self, ruta: str):
         super().__init__()
         self.ruta = ruta
 
+    def _avisar(self, evento: dict) -> None:
+        texto = cliente_motor.describir_evento(evento)
+        if texto:
+            self.progreso.emit(texto)
+
     def run(self):
         try:
-            # -------- 1) Extraer texto --------
-            ext = self.ruta.lower()
-            if ext.endswith(".pdf"):
-                texto = extract_text(self.ruta)
-            elif ext.endswith(".docx"):
-                texto = docx2txt.process(self.ruta)
-            else:
-                raise ValueError("Formato no soportado")
-
-            texto = limpiar_pies_de_pagina(texto)
-
-            # -------- 2) OpenAI JSON mode --------
-            respuesta = openai.ChatCompletion.create(
-                model="gpt-4o-mini",
-                temperature=0,
-                response_format={"type": "json_object"},
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "Devolvé un JSON con: "
-                            "generales (caratula, tribunal, sent_num, sent_fecha, resuelvo, firmantes) "
-                            "e imputados (lista).  Cada imputado debe traer un objeto "
-                            "datos_personales **con TODAS ESTAS CLAVES**:\n"
-                            "nombre, dni, nacionalidad, fecha_nacimiento, lugar_nacimiento, edad, "
-                            "estado_civil, domicilio, instruccion, ocupacion, padres, "
-                            "prontuario, seccion_prontuario.\n"
-                            "La **caratula** es la denominación de la causa, generalmente entre comillas "
-                            "y con “(SAC N° …)”, “(Expte. N° …)”, “(EE N° …)”, “(SAC …)”, “(Expte. …)”, “(EE …)”, etc..  Nunca debe contener la palabra "
-                            "Cámara, Juzgado ni Tribunal."
-                            " “tribunal” es el órgano que dictó la sentencia, empieza con "
-                            "‘la Cámara’, ‘el Juzgado’, etc. "
-                            "Si un dato falta, dejá la clave vacía."
-                        ),
-                    },
-                    {"role": "user", "content": texto[:120000]},
-                ],
+            self.progreso.emit("Extrayendo texto…")
+            ruta = Path(self.ruta)
+            datos = cliente_motor.procesar(
+                ruta.read_bytes(), ruta.name, cfg=_CONFIG, progreso=self._avisar
             )
-            datos = json.loads(respuesta.choices[0].message.content)
-
-            # -------- 3) Ajustes post-API --------
-            # a) resuelvo definitivo (siempre tomar el bloque final real)
-            g = datos.get("generales", {})
-            g["resuelvo"] = extraer_resuelvo(texto)
-            g["resuelvo"] = limpiar_pies_de_pagina(
-                re.sub(r"\s*\n\s*", " ", g["resuelvo"])
-            ).strip()
-            g["resuelvo"] = re.sub(
-                r"(?i)\s*(?:texto\s+)?firmad[oa]\s+digitalmente.*",
-                "",
-                g["resuelvo"],
-            ).strip()
-
-            # b) firmantes de respaldo
-            firmas = extraer_firmantes(texto)
-            if firmas:
-                datos.setdefault("generales", {})["firmantes"] = firmas
-            # c) verificar / completar carátula y tribunal
-            carat_raw = g.get("caratula", "").strip()
-            trib_raw  = g.get("tribunal", "").strip()
-
-            # ¿La IA trajo algo plausible?
-            carat_ok = CARATULA_REGEX.match(carat_raw)
-            trib_ok  = TRIBUNAL_REGEX.match(trib_raw)
-
-            # Heurística de “campos invertidos”
-            if not carat_ok and ('cámara' in carat_raw.lower() or 'juzgado' in carat_raw.lower()):
-                # probablemente los invirtió
-                carat_raw, trib_raw = "", carat_raw    # fuerza re‑extracción abajo
-
-            if not trib_ok and trib_raw.lower().startswith('dr'):
-                trib_raw = ""                          # forzamos re‑extracción
-
-            # Relleno / corrección
-            if not carat_ok:
-                nueva_carat = extraer_caratula(texto)
-                if nueva_carat:
-                    g['caratula'] = nueva_carat
-
-            if not trib_ok:
-                nuevo_trib = extraer_tribunal(texto)
-                if nuevo_trib:
-                    g['tribunal'] = nuevo_trib
-            # listo: emitimos
             self.finished.emit(datos, "")          # sin error
 
         except Exception as e:
             self.finished.emit({}, str(e))          # devolvemos el error
 
 
+# ── dependencias de los oficios ─────────────────────────────────────
+# Campos que usa cada oficio: atributos ``entry_*`` de MainWindow o
+# ``imp:<clave>`` para los widgets del imputado seleccionado.  Al editar un
+# campo se regeneran sólo los oficios que lo usan, y los de pestañas ocultas
+# recién cuando se muestran (ver ``MainWindow._on_campo_editado``).
+_SENTENCIA = (
+    "entry_localidad", "entry_caratula", "entry_tribunal", "entry_sent_num",
+    "entry_sent_date", "entry_resuelvo", "entry_firmantes",
+)
+_FIRMEZA = _SENTENCIA + ("entry_sent_firmeza",)
+_DATOS_IMP = ("imp:datos_personales",)
+_COMPUTO = ("imp:computo", "imp:computo_tipo")
+
+# pestaña → (método que la dibuja, campos de los que depende), en el orden de las pestañas
+PLANTILLAS = {
+    "Oficio Migraciones": ("_plantilla_migraciones", _FIRMEZA + _DATOS_IMP),
+    "Oficio Consulado": ("_plantilla_consulado", _FIRMEZA + _DATOS_IMP + ("entry_consulado",)),
+    "Oficio Juez Electoral": ("_plantilla_juez_electoral", _FIRMEZA + _DATOS_IMP),
+    "Oficio Policía Documentación": ("_plantilla_policia_documentacion", _FIRMEZA + _DATOS_IMP + _COMPUTO),
+    "Oficio Registro Civil": ("_plantilla_registro_civil", _FIRMEZA + _DATOS_IMP),
+    "Oficio Registro Condenados Sexuales": ("_plantilla_registro_condenados_sexuales", _FIRMEZA + _DATOS_IMP + _COMPUTO + (
+        "imp:antecedentes", "imp:condena", "imp:delitos", "imp:legajo", "imp:liberacion",
+        "imp:servicio_penitenciario", "imp:tratamientos",
+    )),
+    "Oficio Registro Nacional Reincidencia": ("_plantilla_registro_nacional_reincidencia", _FIRMEZA + _DATOS_IMP + _COMPUTO),
+    "Oficio Complejo Carcelario": ("_plantilla_complejo_carcelario", _SENTENCIA + ("imp:nombre", "imp:dni", "imp:servicio_penitenciario")),
+    "Oficio Juzgado Niñez‑Adolescencia": ("_plantilla_juzgado_ninez", _SENTENCIA + ("imp:nombre", "imp:dni", "imp:juz_navfyg", "imp:ee_relacionado")),
+    "Oficio RePAT": ("_plantilla_repat", _FIRMEZA + _DATOS_IMP),
+    "Oficio Fiscalía Instrucción": ("_plantilla_fiscalia_instruccion", _SENTENCIA),
+    "Oficio Automotores Secuestrados": ("_plantilla_automotores_secuestrados", (
+        "entry_localidad", "entry_caratula", "entry_tribunal", "entry_rodado", "entry_deposito",
+        "entry_dep_def", "entry_titular_veh", "entry_itim_num", "entry_itim_fecha",
+    )),
+    "Oficio Registro Automotor": ("_plantilla_registro_automotor", _SENTENCIA + ("entry_rodado", "entry_regn")),
+    "Oficio Decomiso (Reg. Automotor)": ("_plantilla_tsj_secpenal", _SENTENCIA + ("entry_rodado", "entry_regn", "entry_deposito")),
+    "Oficio Decomiso Con Traslado": ("_plantilla_tsj_secpenal_depositos", _SENTENCIA + ("entry_rodado", "entry_comisaria", "entry_deposito")),
+    "Oficio Comisaría Traslado": ("_plantilla_comisaria_traslado", _SENTENCIA + ("entry_rodado", "entry_comisaria")),
+    "Oficio Decomiso Sin Traslado": ("_plantilla_tsj_secpenal_elementos", _SENTENCIA + ("entry_rodado", "entry_deposito")),
+}
+
+
 # ───────────────────────── MainWindow ────────────────────────
 class MainWindow(QMainWindow):
     FIELD_WIDTH = 140        # ancho preferido de los campos cortos
@@ -760,6 +472,11 @@ class MainWindow(QMainWindow):
         self.resize(1100, 610)
         self._wait_dialog = None
 
+        # refresco incremental de oficios (ver PLANTILLAS)
+        self._campo_de = {}                  # widget → (campo, índice de imputado o None)
+        self._pendientes = set(PLANTILLAS)   # pestañas por regenerar
+        self._diferido = True                # hasta terminar de armar la ventana
+
         # ───────── splitter horizontal ─────────
         splitter = QSplitter(Qt.Horizontal, self)
         self.setCentralWidget(splitter)
@@ -782,14 +499,14 @@ class MainWindow(QMainWindow):
         def add_line(attr, txt):
             label(txt)
             w = QLineEdit(); w.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-            w.textChanged.connect(self.update_templates)
+            w.textChanged.connect(self._on_campo_editado)
             self.form.addWidget(w, self._row, 1); self._row += 1
             setattr(self, attr, w); return w
         def add_combo(attr, txt, items=(), editable=False):
             label(txt)
             w = NoWheelComboBox(); w.addItems(items); w.setEditable(editable)
-            w.currentIndexChanged.connect(self.update_templates)
-            w.editTextChanged.connect(self.update_templates)
+            w.currentIndexChanged.connect(self._on_campo_editado)
+            w.editTextChanged.connect(self._on_campo_editado)
             self.form.addWidget(w, self._row, 1); self._row += 1
             setattr(self, attr, w); return w
 
@@ -800,7 +517,7 @@ class MainWindow(QMainWindow):
 
 
         # validadores de tribunal y revisión de carátula al terminar de editar
-        self.entry_tribunal.setValidator(QRegularExpressionValidator(TRIBUNAL_REGEX))
+        self.entry_tribunal.setValidator(QRegularExpressionValidator(QRegularExpression(TRIBUNAL_PATRON)))
         self.entry_caratula.editingFinished.connect(self._check_caratula)
         self.entry_caratula.setPlaceholderText('"Imputado…" (SAC N° …)')
         if self.entry_tribunal.isEditable() and self.entry_tribunal.lineEdit():
@@ -817,7 +534,7 @@ class MainWindow(QMainWindow):
         self.entry_sent_date = QLineEdit(); self.entry_sent_date.setPlaceholderText("Fecha")
         for w in (self.entry_sent_num, self.entry_sent_date):
             w.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-            w.textChanged.connect(self.update_templates)
+            w.textChanged.connect(self._on_campo_editado)
         hbox.addWidget(self.entry_sent_num)
         hbox.addWidget(self.entry_sent_date)
         self.form.addLayout(hbox, self._row, 1); self._row += 1
@@ -837,7 +554,7 @@ class MainWindow(QMainWindow):
         self.entry_comisaria = QLineEdit(); self.entry_comisaria.setPlaceholderText("Comisaría N°")
         for w in (self.entry_regn, self.entry_comisaria):
             w.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-            w.textChanged.connect(self.update_templates)
+            w.textChanged.connect(self._on_campo_editado)
         h_reg_com.addWidget(self.entry_regn)
         h_reg_com.addWidget(self.entry_comisaria)
         self.form.addLayout(h_reg_com, self._row, 1); self._row += 1
@@ -851,7 +568,7 @@ class MainWindow(QMainWindow):
         self.entry_itim_fecha = QLineEdit(); self.entry_itim_fecha.setPlaceholderText("Fecha")
         for w in (self.entry_itim_num, self.entry_itim_fecha):
             w.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-            w.textChanged.connect(self.update_templates)
+            w.textChanged.connect(self._on_campo_editado)
         h_itim.addWidget(self.entry_itim_num)
         h_itim.addWidget(self.entry_itim_fecha)
         self.form.addLayout(h_itim, self._row, 1); self._row += 1
@@ -909,24 +626,7 @@ class MainWindow(QMainWindow):
         # pestañas de oficios
         self.text_edits = {}
         self.tab_indices = {}
-        for name in ("Oficio Migraciones",
-                    "Oficio Consulado",
-                    "Oficio Juez Electoral",
-                    "Oficio Policía Documentación",
-                    "Oficio Registro Civil",
-                    "Oficio Registro Condenados Sexuales",                     
-                    "Oficio Registro Nacional Reincidencia",
-                    "Oficio Complejo Carcelario",
-                    "Oficio Juzgado Niñez‑Adolescencia",
-                    "Oficio RePAT",                    
-                    "Oficio Fiscalía Instrucción",
-                    "Oficio Automotores Secuestrados",
-                    "Oficio Registro Automotor",
-                    "Oficio Decomiso (Reg. Automotor)",
-                    "Oficio Decomiso Con Traslado",  
-                    "Oficio Comisaría Traslado",
-                    "Oficio Decomiso Sin Traslado",
-                    ):
+        for name in PLANTILLAS:
 
             te = PlainCopyTextBrowser();
             te.setReadOnly(True)
@@ -948,11 +648,17 @@ class MainWindow(QMainWindow):
 
         self.tab_widgets = {n: self.tabs_txt.widget(i) for n, i in self.tab_indices.items()}
 
+        self._campo_de.update(
+            {w: (attr, None) for attr, w in vars(self).items() if attr.startswith("entry_")}
+        )
+        self.tabs_txt.currentChanged.connect(self._render_visible)
+
         # ─── AHORA que selector_imp existe, construimos imputados ───
         self.imputados_widgets = []         #  ← línea movida aquí
         self.rebuild_imputados()            #  ← llamada movida aquí
 
         # primer refresco de textos
+        self._diferido = False
         self.update_templates()
 
     def update_related_indicator(self, idx: int) -> None:
@@ -1010,7 +716,11 @@ class MainWindow(QMainWindow):
             for w in self.imputados_widgets
         ]
 
+        # los campos restaurados no refrescan uno por uno: un refresco al final
+        previo, self._diferido = self._diferido, True
+
         # 2) limpio contenedores
+        self._campo_de = {w: c for w, c in self._campo_de.items() if c[1] is None}
         self.tabs_imp.clear()
         self.imputados_widgets = []
 
@@ -1052,19 +762,19 @@ class MainWindow(QMainWindow):
             for item in JUZ_NAVFYG:
                 w['juz_navfyg'].addItem(_abreviar_juzgado(item), item)
             w['juz_navfyg'].setEditable(True)
-            w['dni'].textChanged.connect(self.update_templates)
-            w['computo'].textChanged.connect(self.update_templates)
-            w['computo_tipo'].currentIndexChanged.connect(self.update_templates)
-            w['condena'].textChanged.connect(self.update_templates)
-            w['servicio_penitenciario'].currentIndexChanged.connect(self.update_templates)
-            w['legajo'].textChanged.connect(self.update_templates)
-            w['delitos'].textChanged.connect(self.update_templates)
-            w['liberacion'].textChanged.connect(self.update_templates)
-            w['antecedentes'].textChanged.connect(self.update_templates)
-            w['tratamientos'].textChanged.connect(self.update_templates)
-            w['juz_navfyg'].currentIndexChanged.connect(self.update_templates)
-            w['juz_navfyg'].editTextChanged.connect(self.update_templates)
-            w['ee_relacionado'].textChanged.connect(self.update_templates)
+            w['dni'].textChanged.connect(self._on_campo_editado)
+            w['computo'].textChanged.connect(self._on_campo_editado)
+            w['computo_tipo'].currentIndexChanged.connect(self._on_campo_editado)
+            w['condena'].textChanged.connect(self._on_campo_editado)
+            w['servicio_penitenciario'].currentIndexChanged.connect(self._on_campo_editado)
+            w['legajo'].textChanged.connect(self._on_campo_editado)
+            w['delitos'].textChanged.connect(self._on_campo_editado)
+            w['liberacion'].textChanged.connect(self._on_campo_editado)
+            w['antecedentes'].textChanged.connect(self._on_campo_editado)
+            w['tratamientos'].textChanged.connect(self._on_campo_editado)
+            w['juz_navfyg'].currentIndexChanged.connect(self._on_campo_editado)
+            w['juz_navfyg'].editTextChanged.connect(self._on_campo_editado)
+            w['ee_relacionado'].textChanged.connect(self._on_campo_editado)
 
             pair("Nombre y apellido:", w['nombre'])
             pair("DNI:",               w['dni'])
@@ -1113,13 +823,15 @@ class MainWindow(QMainWindow):
             self.tabs_imp.addTab(tab, f"Imputado {i+1}")
             self.selector_imp.addItem(f"Imputado {i+1}")
             self.imputados_widgets.append(w)
-            w['datos_personales'].textChanged.connect(self.update_templates)
-            w['nombre'].textChanged.connect(self.update_templates)
+            self._campo_de.update({widget: (f"imp:{clave}", i) for clave, widget in w.items()})
+            w['datos_personales'].textChanged.connect(self._on_campo_editado)
+            w['nombre'].textChanged.connect(self._on_campo_editado)
             w['nombre'].textChanged.connect(self._refresh_imp_names_in_selector)
         # 6) habilito señales y dejo seleccionado el primero
         self.selector_imp.blockSignals(False)
         self.selector_imp.setCurrentIndex(0)
         self._refresh_imp_names_in_selector()
+        self._diferido = previo
         self.update_templates()
 
 
@@ -1324,6 +1036,7 @@ class MainWindow(QMainWindow):
 
         self._thread.started.connect(self._worker.run)
         self._worker.finished.connect(self._on_autocomplete_done)
+        self._worker.progreso.connect(self._wait_dialog.setLabelText)
 
         self._thread.start()
 
@@ -1342,66 +1055,81 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "Error", err)
             return
 
-        # ------- GENERALES -------
-        g = datos.get("generales", {})
-        self.entry_caratula.setText(
-            normalizar_caratula(self._as_str(g.get("caratula")))
-        )
-        self.entry_tribunal.setCurrentText(
-            capitalizar_frase(self._as_str(g.get("tribunal")))
-        )
-        self.entry_sent_num.setText(self._as_str(g.get("sent_num")))
-        self.entry_sent_date.setText(self._as_str(g.get("sent_fecha")))
-        self.entry_resuelvo.setText(self._as_str(g.get("resuelvo")))
-        self.entry_firmantes.setText(self._as_str(g.get("firmantes")))
-
-        # ------- IMPUTADOS -------
-        imps = datos.get("imputados", [])
-        self.combo_n.setCurrentText(str(max(1, len(imps))))
-        self.rebuild_imputados()
-
-        for idx, imp in enumerate(imps):
-            w     = self.imputados_widgets[idx]
-            bruto = imp.get("datos_personales", imp)
-
-            # línea formateada
-            w["datos_personales"].setPlainText(
-                self._format_datos_personales(bruto)
+        with self._refresco_diferido():
+            # ------- GENERALES -------
+            g = datos.get("generales", {})
+            self.entry_caratula.setText(
+                normalizar_caratula(self._as_str(g.get("caratula")))
+            )
+            self.entry_tribunal.setCurrentText(
+                capitalizar_frase(self._as_str(g.get("tribunal")))
             )
+            self.entry_sent_num.setText(self._as_str(g.get("sent_num")))
+            self.entry_sent_date.setText(self._as_str(g.get("sent_fecha")))
+            self.entry_resuelvo.setText(self._as_str(g.get("resuelvo")))
+            self.entry_firmantes.setText(self._as_str(g.get("firmantes")))
+
+            # ------- IMPUTADOS -------
+            imps = datos.get("imputados", [])
+            self.combo_n.setCurrentText(str(max(1, len(imps))))
+            self.rebuild_imputados()
+
+            for idx, imp in enumerate(imps):
+                w     = self.imputados_widgets[idx]
+                bruto = imp.get("datos_personales", imp)
+
+                # línea formateada
+                w["datos_personales"].setPlainText(
+                    self._format_datos_personales(bruto)
+                )
 
-            # nombre / DNI
-            nom = self._as_str(imp.get("nombre") or bruto.get("nombre"))
-            dni = self._as_str(imp.get("dni")    or bruto.get("dni"))
-            if not dni:
-                dni = extraer_dni(str(bruto))
-            w["nombre"].setText(nom)
-            w["dni"].setText(normalizar_dni(dni))
+                # nombre / DNI
+                nom = self._as_str(imp.get("nombre") or bruto.get("nombre"))
+                dni = self._as_str(imp.get("dni")    or bruto.get("dni"))
+                if not dni:
+                    dni = extraer_dni(str(bruto))
+                w["nombre"].setText(nom)
+                w["dni"].setText(normalizar_dni(dni))
 
-        self._refresh_imp_names_in_selector()
-        self.update_templates()
+            self._refresh_imp_names_in_selector()
         QMessageBox.information(self, "Listo", "Campos cargados exitosamente.")
 
 
     # ─────────────────── plantillas de oficios ────────────────────
+    @contextmanager
+    def _refresco_diferido(self):
+        """Junta los cambios de varios campos en un solo refresco al final."""
+        previo, self._diferido = self._diferido, True
+        try:
+            yield
+        finally:
+            self._diferido = previo
+        self._render_visible()
+
+    def _on_campo_editado(self, *_):
+        """Marca para regenerar sólo los oficios que usan el campo editado."""
+        campo, idx = self._campo_de.get(self.sender(), (None, None))
+        if campo is None:
+            self._pendientes.update(PLANTILLAS)
+        elif idx is not None and idx != self.selector_imp.currentIndex():
+            return                          # imputado que no se está mostrando
+        else:
+            self._pendientes.update(n for n, (_, campos) in PLANTILLAS.items() if campo in campos)
+        self._render_visible()
+
+    def _render_visible(self, *_):
+        """Regenera el oficio de la pestaña visible si quedó desactualizado."""
+        if self._diferido:
+            return
+        nombre = self.tabs_txt.tabText(self.tabs_txt.currentIndex())
+        if nombre in self._pendientes:
+            self._pendientes.discard(nombre)
+            getattr(self, PLANTILLAS[nombre][0])()
+
     def update_templates(self):
-        """Regenera todas las plantillas de la pestaña derecha."""
-        self._plantilla_migraciones()
-        self._plantilla_juez_electoral()
-        self._plantilla_consulado() 
-        self._plantilla_registro_automotor()  
-        self._plantilla_tsj_secpenal() 
-        self._plantilla_tsj_secpenal_depositos()  
-        self._plantilla_comisaria_traslado() 
-        self._plantilla_tsj_secpenal_elementos()  
-        self._plantilla_automotores_secuestrados()
-        self._plantilla_fiscalia_instruccion()
-        self._plantilla_policia_documentacion()
-        self._plantilla_registro_civil() 
-        self._plantilla_registro_condenados_sexuales()
-        self._plantilla_registro_nacional_reincidencia() 
-        self._plantilla_repat()  
-        self._plantilla_juzgado_ninez()      
-        self._plantilla_complejo_carcelario()
+        """Marca todos los oficios como desactualizados y regenera el visible."""
+        self._pendientes.update(PLANTILLAS)
+        self._render_visible()
 
     def _plantilla_migraciones(self):
         te = self.text_edits["Oficio Migraciones"]
@@ -2351,7 +2079,6 @@ class MainWindow(QMainWindow):
         texto, ok = QInputDialog.getText(self, titulo, titulo, text=widget.text())
         if ok:
             widget.setText(texto.strip())
-            self.update_templates()
 
     def _editar_plaintext(self, widget: QPlainTextEdit, titulo: str):
         texto, ok = QInputDialog.getMultiLineText(
@@ -2359,7 +2086,6 @@ class MainWindow(QMainWindow):
         )
         if ok:
             widget.setPlainText(texto.strip())
-            self.update_templates()
 
     def _editar_combo(self, widget: QComboBox, titulo: str):
         items = [widget.itemText(i) for i in range(widget.count())]
@@ -2385,13 +2111,12 @@ class MainWindow(QMainWindow):
                 widget.setCurrentIndex(idx_new)
             else:
                 widget.setCurrentText(texto)
-            self.update_templates()
 
     def _check_caratula(self) -> None:
         """Valida el formato de la carátula al finalizar la edición."""
         txt = normalizar_caratula(self.entry_caratula.text())
         self.entry_caratula.setText(txt)
-        if txt and not CARATULA_REGEX.match(txt):
+        if txt and not caratula_valida(txt):
             QMessageBox.warning(
                 self,
                 "Carátula inválida",
@@ -2520,7 +2245,10 @@ class MainWindow(QMainWindow):
 
 
     def update_for_imp(self, idx: int):
-        self.update_templates()
+        self._pendientes.update(
+            n for n, (_, campos) in PLANTILLAS.items() if any(c.startswith("imp:") for c in campos)
+        )
+        self._render_visible()
 
 
     # ───────────────────── interceptar cierre ──────────────────────
@@ -2535,25 +2263,17 @@ class MainWindow(QMainWindow):
 # ──────────────────────────── main ───────────────────────────────
 
 def _obtener_api_key() -> str:
-    """Devuelve la API key leída del archivo de configuración."""
+    """Devuelve la API key leída del archivo de configuración (y la deja en el entorno para el motor)."""
     if OPENAI_API_KEY_DEFAULT:
         os.environ["OPENAI_API_KEY"] = OPENAI_API_KEY_DEFAULT
     return OPENAI_API_KEY_DEFAULT
 
-def _configurar_proxy() -> None:
-    """Configura la sesión de requests para usar un proxy si está definido."""
-    if PROXY_URL_DEFAULT and requests:
-        session = requests.Session()
-        session.proxies.update({"http": PROXY_URL_DEFAULT, "https": PROXY_URL_DEFAULT})
-        openai.requestssession = session
 
-    
 def main():
     app = QApplication(sys.argv)
     app.setWindowIcon(QIcon(resource_path("icono4.ico")))
     # ahora SÍ podés usar QMessageBox
-    openai.api_key = _obtener_api_key()
-    _configurar_proxy()
+    _obtener_api_key()
 
 
     win = MainWindow()
@@ -2561,4 +2281,9 @@ def main():
     sys.exit(app.exec())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # En el build de PyInstaller los procesos del pool de extracción (spawn)
+    # arrancan este mismo ejecutable: freeze_support los atiende y sale antes
+    # de abrir otra ventana.
+    import multiprocessing
+    multiprocessing.freeze_support()
+    main()
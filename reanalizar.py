@@ -0,0 +1,142 @@
+# reanalizar.py
+"""
+Vuelve a correr las heurísticas de ``core`` sobre todos los textos guardados.
+
+    python reanalizar.py [--limite N] [--procesos N] [--ejemplos K] [--guardar] [-o informe.json]
+
+No abre ningún PDF: toma el texto crudo de la base de textos
+(``textos_sentencias``), rehace la limpieza y el análisis local y compara
+cada campo con el resumen de referencia guardado.  Emite un informe JSON
+con cuántos documentos cambiaron en cada campo, algunos ejemplos y la
+velocidad.  Con ``--guardar`` la corrida actual pasa a ser la referencia.
+
+El rescate de nombres con el modelo queda apagado (sólo heurísticas) salvo
+que se pase ``--con-modelo``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import core
+from textos_sentencias import obtener_textos
+
+TANDA = 256
+
+
+def _sin_modelo() -> None:
+    core._extraer_nombres_gpt = lambda textos: [""] * len(textos)
+
+
+def _analizar(crudo: str, con_modelo: bool = False) -> dict:
+    if not con_modelo:
+        _sin_modelo()
+    return core.resumen_heuristico(core.limpiar_texto(crudo))
+
+
+def _tandas(iterable, n: int):
+    it = iter(iterable)
+    while tanda := list(islice(it, n)):
+        yield tanda
+
+
+def reanalizar(textos, *, limite=None, procesos=1, con_modelo=False, ejemplos=3, guardar=False) -> dict:
+    """Compara el análisis actual con el de referencia de cada documento."""
+    version = core._version_cache()
+    cambios: Counter[str] = Counter()
+    muestras: dict[str, list] = defaultdict(list)
+    total = nuevos = con_cambios = parciales = 0
+    t0 = time.perf_counter()
+
+    pool = ProcessPoolExecutor(procesos) if procesos > 1 else None
+    try:
+        for tanda in _tandas(textos.recorrer(limite), TANDA):
+            crudos = [doc.crudo for doc in tanda]
+            if pool is None:
+                resumenes = [_analizar(c, con_modelo) for c in crudos]
+            else:
+                resumenes = list(pool.map(_analizar, crudos, [con_modelo] * len(crudos), chunksize=8))
+            for doc, resumen in zip(tanda, resumenes):
+                total += 1
+                parciales += not doc.completo
+                if doc.resumen is None:
+                    nuevos += 1
+                else:
+                    distintos = [c for c in resumen if resumen[c] != doc.resumen.get(c)]
+                    con_cambios += bool(distintos)
+                    for campo in distintos:
+                        cambios[campo] += 1
+                        if len(muestras[campo]) < ejemplos:
+                            muestras[campo].append({
+                                "documento": doc.nombre,
+                                "hash": doc.hash[:12],
+                                "antes": doc.resumen.get(campo),
+                                "ahora": resumen[campo],
+                            })
+                if guardar:
+                    textos.guardar_resumen(doc.hash, resumen, version)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    segundos = time.perf_counter() - t0
+    return {
+        "version": version,
+        "documentos": total,
+        "sin_referencia": nuevos,
+        "texto_parcial": parciales,
+        "con_cambios": con_cambios,
+        "cambios_por_campo": dict(cambios.most_common()),
+        "ejemplos": dict(muestras),
+        "segundos": round(segundos, 3),
+        "docs_por_segundo": round(total / segundos, 1) if segundos else None,
+        "referencia_actualizada": guardar,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Reanaliza el corpus de textos guardados.")
+    parser.add_argument("--limite", type=int, help="procesar sólo los primeros N documentos")
+    parser.add_argument("--procesos", type=int, default=1, help="procesos para el análisis")
+    parser.add_argument("--ejemplos", type=int, default=3, help="ejemplos por campo en el informe")
+    parser.add_argument("--guardar", action="store_true", help="esta corrida pasa a ser la referencia")
+    parser.add_argument("--con-modelo", action="store_true", help="permitir el rescate de nombres con el modelo")
+    parser.add_argument("-o", "--salida", help="archivo JSON del informe (default: stdout)")
+    args = parser.parse_args(argv)
+
+    textos = obtener_textos(core._cfg)
+    if not textos.activa or not len(textos):
+        print(f"No hay textos guardados en {textos.ruta}.", file=sys.stderr)
+        return 1
+    if not args.con_modelo:
+        _sin_modelo()
+
+    informe = reanalizar(
+        textos,
+        limite=args.limite,
+        procesos=args.procesos,
+        con_modelo=args.con_modelo,
+        ejemplos=args.ejemplos,
+        guardar=args.guardar,
+    )
+    salida = json.dumps(informe, ensure_ascii=False, indent=2)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as fh:
+            fh.write(salida + "\n")
+    else:
+        print(salida)
+    print(
+        f"{informe['documentos']} documento(s) en {informe['segundos']} s, "
+        f"{informe['con_cambios']} con cambios.",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
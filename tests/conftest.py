@@ -0,0 +1,46 @@
+import io
+import json
+import os
+import sys
+import types
+import zipfile
+
+import pytest
+
+# Los tests no deben escribir en la base de textos del usuario (~/.cache/ospro)
+os.environ.setdefault("OSPRO_TEXTOS", "0")
+
+_W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+def _docx(*parrafos: str) -> bytes:
+    cuerpo = "".join(f"<w:p><w:r><w:t>{p}</w:t></w:r></w:p>" for p in parrafos)
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr("word/document.xml", f"<w:document {_W}><w:body>{cuerpo}</w:body></w:document>")
+    return buf.getvalue()
+
+
+def _respuesta(contenido: dict, usage=None):
+    msg = types.SimpleNamespace(content=json.dumps(contenido))
+    return types.SimpleNamespace(choices=[types.SimpleNamespace(message=msg)], usage=usage)
+
+
+@pytest.fixture
+def docx():
+    """``docx("párrafo", ...)``: un DOCX mínimo en memoria, un párrafo por argumento."""
+    return _docx
+
+
+@pytest.fixture
+def respuesta_llm():
+    """``respuesta_llm({...}, usage=None)``: respuesta de ``chat.completions.create`` con ese JSON."""
+    return _respuesta
+
+
+@pytest.fixture
+def errores_openai(monkeypatch):
+    """Las excepciones de ``openai`` que core captura, también sobre el stub del módulo."""
+    openai = sys.modules.setdefault("openai", types.ModuleType("openai"))
+    for exc in ("AuthenticationError", "APIStatusError"):
+        monkeypatch.setattr(openai, exc, type(exc, (Exception,), {}), raising=False)
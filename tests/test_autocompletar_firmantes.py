@@ -13,7 +13,7 @@ import core
 def test_autocompletar_converts_firmantes_to_string(monkeypatch):
     st.session_state.clear()
 
-    def fake_procesar_sentencia(_bytes, _name):
+    def fake_procesar_sentencia(_bytes, _name, progreso=None):
         return {
             "generales": {"firmantes": ["Juez", "Secretario"]},
             "imputados": [],
@@ -29,7 +29,7 @@ def test_autocompletar_converts_firmantes_to_string(monkeypatch):
 def test_autocompletar_handles_dict_firmantes(monkeypatch):
     st.session_state.clear()
 
-    def fake_procesar_sentencia(_bytes, _name):
+    def fake_procesar_sentencia(_bytes, _name, progreso=None):
         return {
             "generales": {
                 "firmantes": [
@@ -13,7 +13,7 @@ import core
 def test_autocompletar_formats_resuelvo_and_datos(monkeypatch):
     st.session_state.clear()
 
-    def fake_procesar_sentencia(_bytes, _name):
+    def fake_procesar_sentencia(_bytes, _name, progreso=None):
         return {
             "generales": {"resuelvo": ["Punto 1", "Punto 2"]},
             "imputados": [
@@ -32,7 +32,7 @@ def test_autocompletar_formats_resuelvo_and_datos(monkeypatch):
 def test_autocompletar_flattens_resuelvo_newlines(monkeypatch):
     st.session_state.clear()
 
-    def fake_procesar_sentencia(_bytes, _name):
+    def fake_procesar_sentencia(_bytes, _name, progreso=None):
         return {"generales": {"resuelvo": "Linea 1\nLinea 2"}, "imputados": []}
 
     monkeypatch.setattr(core, "procesar_sentencia", fake_procesar_sentencia)
@@ -0,0 +1,63 @@
+import os
+import sys
+import types
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Stubs for optional dependencies used by core.py
+sys.modules.setdefault("docx2txt", types.ModuleType("docx2txt"))
+sys.modules.setdefault("openai", types.ModuleType("openai"))
+st = types.ModuleType("streamlit")
+st.session_state = {}
+sys.modules.setdefault("streamlit", st)
+pdfminer = types.ModuleType("pdfminer")
+high = types.ModuleType("pdfminer.high_level")
+high.extract_text = lambda *a, **k: ""
+pdfminer.high_level = high
+sys.modules.setdefault("pdfminer", pdfminer)
+sys.modules.setdefault("pdfminer.high_level", high)
+
+import core
+from cache_sentencias import CacheSentencias
+
+
+def test_cache_guarda_y_recupera(tmp_path):
+    cache = CacheSentencias(tmp_path, 1024 * 1024)
+    clave = cache.clave(b"%PDF sentencia", "v1")
+    assert cache.obtener(clave) is None
+    cache.guardar(clave, {"generales": {"caratula": "“X” (SAC N° 1)"}, "imputados": []})
+    assert cache.obtener(clave) == {"generales": {"caratula": "“X” (SAC N° 1)"}, "imputados": []}
+    # otra versión del extractor no comparte la entrada
+    assert cache.obtener(cache.clave(b"%PDF sentencia", "v2")) is None
+
+
+def test_cache_desaloja_la_entrada_menos_usada(tmp_path):
+    cache = CacheSentencias(tmp_path, 250)
+    claves = [cache.clave(bytes([i]), "v1") for i in range(3)]
+    for i, clave in enumerate(claves[:2]):
+        cache.guardar(clave, {"relleno": "x" * 80})
+        ruta = cache._ruta(clave)
+        os.utime(ruta, (1000 + i, 1000 + i))
+    assert cache.obtener(claves[0]) is not None   # la 0 pasa a ser la más reciente
+    cache.guardar(claves[2], {"relleno": "x" * 80})
+    assert cache.obtener(claves[1]) is None
+    assert cache.obtener(claves[0]) is not None
+    assert cache.obtener(claves[2]) is not None
+
+
+def test_procesar_sentencia_usa_la_cache(tmp_path, monkeypatch):
+    llamadas = []
+
+    def fake_procesar(file_bytes, filename, **_kw):
+        llamadas.append(filename)
+        return {"generales": {"sent_num": "12"}, "imputados": []}
+
+    monkeypatch.setattr(core, "_procesar_sentencia_sin_cache", fake_procesar)
+    monkeypatch.setattr(core, "obtener_cache", lambda _cfg=None: CacheSentencias(tmp_path, 1024 * 1024))
+
+    assert core.procesar_sentencia(b"abc", "a.pdf") == {"generales": {"sent_num": "12"}, "imputados": []}
+    assert core.procesar_sentencia(b"abc", "otra.pdf") == {"generales": {"sent_num": "12"}, "imputados": []}
+    assert llamadas == ["a.pdf"]
+    core.procesar_sentencia(b"abc", "a.pdf", usar_cache=False)
+    assert llamadas == ["a.pdf", "a.pdf"]
@@ -0,0 +1,77 @@
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import cliente_motor
+import core
+
+_DATOS = {"generales": {"sent_num": "7"}, "imputados": []}
+
+
+def _servidor(eventos):
+    recibidos = []
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            recibidos.append((self.path, self.rfile.read(int(self.headers["Content-Length"]))))
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.end_headers()
+            for ev in eventos:
+                self.wfile.write((json.dumps(ev) + "\n").encode("utf-8"))
+
+        def log_message(self, *args):
+            pass
+
+    srv = HTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv, recibidos
+
+
+def test_remoto_sigue_eventos_y_devuelve_datos(monkeypatch):
+    srv, recibidos = _servidor([
+        {"evento": "texto_extraido", "caracteres": 1200, "ms": 3.0},
+        {"evento": "llm_inicio", "tokens": 300, "campos": []},
+        {"evento": "listo", "ms": 9.0, "datos": _DATOS},
+    ])
+    monkeypatch.setenv("OSPRO_MOTOR_URL", f"http://127.0.0.1:{srv.server_port}/")
+    vistos = []
+    try:
+        datos = cliente_motor.procesar(b"%PDF-1.4 ...", "s.pdf", progreso=vistos.append)
+    finally:
+        srv.shutdown()
+
+    assert datos == _DATOS
+    assert [ev["evento"] for ev in vistos] == ["texto_extraido", "llm_inicio", "listo"]
+    ruta, cuerpo = recibidos[0]
+    assert ruta == "/autocompletar/stream"
+    assert b'filename="s.pdf"' in cuerpo and b"%PDF-1.4 ..." in cuerpo
+    assert cliente_motor.describir_evento(vistos[0]) == "Texto extraído (1,200 caracteres). Buscando imputados…"
+
+
+def test_remoto_propaga_error_del_servidor(monkeypatch):
+    srv, _ = _servidor([{"evento": "error", "detalle": "ValueError: Formato no soportado"}])
+    try:
+        with pytest.raises(RuntimeError, match="Formato no soportado"):
+            cliente_motor.procesar_remoto(f"http://127.0.0.1:{srv.server_port}", b"x", "s.txt")
+    finally:
+        srv.shutdown()
+
+
+def test_sin_url_usa_el_motor_local(monkeypatch):
+    monkeypatch.delenv("OSPRO_MOTOR_URL", raising=False)
+    llamadas = []
+
+    def _procesar(data, nombre, progreso=None):
+        llamadas.append((data, nombre))
+        return _DATOS
+
+    monkeypatch.setattr(core, "procesar_sentencia", _procesar)
+    assert cliente_motor.procesar(b"abc", "s.docx", cfg={}) == _DATOS
+    assert llamadas == [(b"abc", "s.docx")]
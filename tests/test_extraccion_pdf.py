@@ -0,0 +1,40 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import extraccion_pdf
+
+
+def test_rangos_cubren_todas_las_paginas_en_orden():
+    for n, tareas in ((40, 8), (41, 8), (100, 3), (9, 16)):
+        rangos = extraccion_pdf._rangos(n, tareas)
+        assert rangos[0][0] == 0 and rangos[-1][1] == n
+        assert all(a[1] == b[0] for a, b in zip(rangos, rangos[1:]))
+        assert all(hasta - desde >= extraccion_pdf.PAGINAS_MIN_TAREA for desde, hasta in rangos) or len(rangos) == 1
+
+
+def test_paralelo_une_los_rangos_en_orden(monkeypatch):
+    monkeypatch.setattr(extraccion_pdf, "contar_paginas", lambda data: 50)
+    monkeypatch.setattr(
+        extraccion_pdf, "extraer_paginas",
+        lambda data, desde, hasta: "".join(f"pág {i}\f" for i in range(desde, hasta)),
+    )
+    with ThreadPoolExecutor(4) as pool:
+        texto = extraccion_pdf.extraer_en_paralelo(b"%PDF", procesos=4, executor=pool)
+    assert extraccion_pdf.paginas(texto) == [f"pág {i}" for i in range(50)]
+
+
+def test_no_paraleliza_pdfs_cortos_ni_con_un_proceso(monkeypatch):
+    monkeypatch.setattr(extraccion_pdf, "contar_paginas", lambda data: 12)
+    assert extraccion_pdf.extraer_en_paralelo(b"%PDF", procesos=8) is None
+    monkeypatch.setattr(extraccion_pdf, "contar_paginas", lambda data: 500)
+    assert extraccion_pdf.extraer_en_paralelo(b"%PDF", procesos=1) is None
+
+
+def test_procesos_pdf_desde_entorno_y_config(monkeypatch):
+    monkeypatch.delenv("OSPRO_PROCESOS_PDF", raising=False)
+    assert extraccion_pdf.procesos_pdf({"procesos_pdf": 3}) == 3
+    monkeypatch.setenv("OSPRO_PROCESOS_PDF", "2")
+    assert extraccion_pdf.procesos_pdf({"procesos_pdf": 3}) == 2
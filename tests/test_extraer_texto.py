@@ -0,0 +1,63 @@
+import io
+import sys
+import types
+import zipfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Stubs for optional dependencies used by core.py
+sys.modules.setdefault("docx2txt", types.ModuleType("docx2txt"))
+sys.modules.setdefault("openai", types.ModuleType("openai"))
+st = types.ModuleType("streamlit")
+st.session_state = {}
+sys.modules.setdefault("streamlit", st)
+pdfminer = types.ModuleType("pdfminer")
+high = types.ModuleType("pdfminer.high_level")
+high.extract_text = lambda *a, **k: ""
+pdfminer.high_level = high
+sys.modules.setdefault("pdfminer", pdfminer)
+sys.modules.setdefault("pdfminer.high_level", high)
+
+import core
+
+_W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+def _docx(cuerpo: str, header: str = "") -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr("word/document.xml", f"<w:document {_W}><w:body>{cuerpo}</w:body></w:document>")
+        if header:
+            zf.writestr("word/header1.xml", f"<w:hdr {_W}>{header}</w:hdr>")
+    return buf.getvalue()
+
+
+def test_docx_se_lee_desde_memoria():
+    data = _docx(
+        "<w:p><w:r><w:t>SENTENCIA N° 12</w:t></w:r></w:p>"
+        "<w:p><w:r><w:t>RESUELVO:</w:t><w:tab/><w:t>I) Condenar</w:t><w:br/><w:t>II) Costas</w:t></w:r></w:p>",
+        header="<w:p><w:r><w:t>Poder Judicial</w:t></w:r></w:p>",
+    )
+    texto = core.extraer_texto(data, "Sentencia.DOCX")
+    assert texto == "Poder Judicial\n\nSENTENCIA N° 12\n\nRESUELVO:\tI) Condenar\nII) Costas"
+
+
+def test_pdf_se_pasa_como_buffer(monkeypatch):
+    recibido = []
+
+    def fake_extract_text(fp, *a, **k):
+        recibido.append(fp)
+        return "texto"
+
+    monkeypatch.setattr(core, "extract_text", fake_extract_text)
+    assert core.extraer_texto(b"%PDF-1.7", "s.pdf") == "texto"
+    assert isinstance(recibido[0], io.BytesIO)
+    assert recibido[0].getvalue() == b"%PDF-1.7"
+
+
+def test_formato_no_soportado():
+    with pytest.raises(ValueError):
+        core.extraer_texto(b"", "s.txt")
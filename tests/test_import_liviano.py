@@ -0,0 +1,17 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+
+# Dependencias que core sólo debe cargar al usarlas (UI, PDF, modelo)
+PESADAS = ("streamlit", "pdfminer", "PyQt6", "PyQt5", "openai", "docx2txt")
+
+
+def test_import_core_no_carga_dependencias_pesadas():
+    codigo = f"import json, sys, core; print(json.dumps([m for m in {PESADAS!r} if m in sys.modules]))"
+    res = subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, capture_output=True, text=True)
+
+    assert res.returncode == 0, res.stderr
+    assert json.loads(res.stdout) == []
@@ -0,0 +1,61 @@
+import sys
+import types
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Stubs for optional dependencies used by core.py
+sys.modules.setdefault("docx2txt", types.ModuleType("docx2txt"))
+sys.modules.setdefault("openai", types.ModuleType("openai"))
+st = types.ModuleType("streamlit")
+st.session_state = {}
+sys.modules.setdefault("streamlit", st)
+pdfminer = types.ModuleType("pdfminer")
+high = types.ModuleType("pdfminer.high_level")
+high.extract_text = lambda *a, **k: ""
+pdfminer.high_level = high
+sys.modules.setdefault("pdfminer", pdfminer)
+sys.modules.setdefault("pdfminer.high_level", high)
+
+import core
+
+INICIO = (
+    'En la causa caratulada "PEREZ, Juan p.s.a. robo" (SAC N° 1234567), en la que han sido '
+    "traidos a proceso los imputados: Juan Pérez, de 30 años, D.N.I. N° 30.123.456. "
+    "La audiencia de debate se desarrolló...\f"
+)
+FINAL = "RESUELVO: I) Condenar a Juan Pérez.\f"
+
+
+def _pdf_de_60_paginas(monkeypatch, final):
+    leidas = []
+    monkeypatch.setattr(core, "extraer_extremos", lambda data, cabeza, cola: (INICIO, final, 60))
+    monkeypatch.setattr(core, "extraer_en_paralelo", lambda *a, **k: None)
+
+    def paginas(data, desde, hasta):
+        leidas.append((desde, hasta))
+        return "considerandos\f"
+
+    monkeypatch.setattr(core, "extraer_paginas", paginas)
+    return leidas
+
+
+def test_si_los_extremos_alcanzan_no_se_lee_el_medio(monkeypatch):
+    leidas = _pdf_de_60_paginas(monkeypatch, FINAL)
+    assert core._extraer_texto_dirigido(b"%PDF", "s.pdf") == (INICIO + FINAL, False)
+    assert leidas == []
+
+
+def test_sin_resuelvo_en_la_cola_se_lee_todo(monkeypatch):
+    leidas = _pdf_de_60_paginas(monkeypatch, "Firmado digitalmente\f")
+    texto, completo = core._extraer_texto_dirigido(b"%PDF", "s.pdf")
+    assert texto == INICIO + "considerandos\f" + "Firmado digitalmente\f"
+    assert completo
+    assert leidas == [(core._PAGINAS_CABEZA, 60 - core._PAGINAS_COLA)]
+
+
+def test_lectura_dirigida_desactivable(monkeypatch):
+    monkeypatch.setenv("OSPRO_LECTURA_EXTREMOS", "0")
+    monkeypatch.setattr(core, "extraer_extremos", lambda *a: (_ for _ in ()).throw(AssertionError))
+    monkeypatch.setattr(core, "extraer_texto", lambda data, nombre: "completo")
+    assert core._extraer_texto_dirigido(b"%PDF", "s.pdf") == ("completo", True)
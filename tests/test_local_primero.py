@@ -0,0 +1,112 @@
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Stubs for optional dependencies used by core.py
+sys.modules.setdefault("docx2txt", types.ModuleType("docx2txt"))
+sys.modules.setdefault("openai", types.ModuleType("openai"))
+st = types.ModuleType("streamlit")
+st.session_state = {}
+sys.modules.setdefault("streamlit", st)
+pdfminer = types.ModuleType("pdfminer")
+high = types.ModuleType("pdfminer.high_level")
+high.extract_text = lambda *a, **k: ""
+pdfminer.high_level = high
+sys.modules.setdefault("pdfminer", pdfminer)
+sys.modules.setdefault("pdfminer.high_level", high)
+
+import core
+from cache_sentencias import CacheSentencias
+
+_CABECERA = (
+    "SENTENCIA NÚMERO: 12. En la ciudad de Córdoba, 3 de marzo de 2024, se dan a conocer "
+    'los fundamentos de la sentencia dictada en la causa caratulada "PEREZ, Juan p.s.a. robo" '
+    "(SAC N° 123456), por ante el Juzgado de Control y Faltas N° 7, de esta ciudad."
+)
+
+
+@pytest.fixture
+def llamadas(tmp_path, monkeypatch, respuesta_llm, errores_openai):
+    """Pedidos de generales que llegan al modelo falso."""
+    llamadas: list = []
+
+    def create(**kwargs):
+        if kwargs["messages"][0]["content"] == core._PROMPT_NOMBRES:   # rescate de nombres dudosos
+            return respuesta_llm({})
+        llamadas.append(kwargs)
+        generales = {"caratula": "", "tribunal": "", "sent_num": "99", "sent_fecha": "1 de enero de 2020"}
+        return respuesta_llm({"generales": generales, "imputados": []})
+
+    client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=create)))
+    monkeypatch.setattr(core, "_get_openai_client", lambda: client)
+    monkeypatch.setattr(core, "obtener_cache", lambda _cfg=None: CacheSentencias(tmp_path, 1 << 20, activa=False))
+    monkeypatch.delenv("OSPRO_LOCAL_PRIMERO", raising=False)
+    return llamadas
+
+
+def test_sentencia_completa_no_llama_al_modelo(llamadas, docx):
+    eventos: list = []
+
+    datos = core.procesar_sentencia(docx(_CABECERA, "RESUELVO: I) Absolver."), "s.docx", progreso=eventos.append)
+
+    assert llamadas == []
+    assert "llm_omitido" in [ev["evento"] for ev in eventos]
+    g = datos["generales"]
+    assert (g["sent_num"], g["sent_fecha"]) == ("12", "3 de marzo de 2024")
+    assert "(SAC N° 123456)" in g["caratula"]
+    assert g["tribunal"] == "Juzgado de Control y Faltas N° 7"
+    assert all(datos["origen"][c] == "local" for c in core.CAMPOS_LLM)
+
+
+def test_campos_dudosos_van_al_modelo(llamadas, docx):
+    sin_numero = _CABECERA.replace("SENTENCIA NÚMERO: 12. ", "")
+    datos = core.procesar_sentencia(docx(sin_numero, "RESUELVO: I) Absolver."), "s.docx")
+
+    assert len(llamadas) == 1
+    assert datos["generales"]["sent_num"] == "99"
+    assert datos["origen"]["sent_num"] == "llm"
+    assert datos["origen"]["tribunal"] == "local"
+    assert datos["generales"]["sent_fecha"] == "3 de marzo de 2024"
+
+    formato = llamadas[0]["response_format"]
+    assert formato["type"] == "json_schema" and formato["json_schema"]["strict"] is True
+    pedidos = formato["json_schema"]["schema"]["properties"]["generales"]["required"]
+    assert pedidos == ["sent_num", "firmantes"]    # sin firmantes locales, viajan con el pedido
+
+
+def test_campos_apagados_no_se_piden(monkeypatch, llamadas, docx):
+    monkeypatch.setitem(core._cfg, "llm_campos", {"firmantes": False, "sent_fecha": False})
+    monkeypatch.setenv("OSPRO_LOCAL_PRIMERO", "0")
+
+    core.procesar_sentencia(docx(_CABECERA, "RESUELVO: I) Absolver."), "s.docx")
+
+    esquema = llamadas[0]["response_format"]["json_schema"]["schema"]["properties"]["generales"]
+    assert list(esquema["properties"]) == esquema["required"] == ["caratula", "tribunal", "sent_num"]
+
+
+def test_modo_siempre_llama_al_modelo(monkeypatch, llamadas, docx):
+    monkeypatch.setenv("OSPRO_LOCAL_PRIMERO", "0")
+
+    datos = core.procesar_sentencia(docx(_CABECERA, "RESUELVO: I) Absolver."), "s.docx")
+
+    assert len(llamadas) == 1
+    assert datos["generales"]["sent_num"] == "99"
+
+
+def test_la_version_de_cache_sigue_a_los_ajustes_del_pedido(monkeypatch):
+    versiones = {core._version_cache()}
+    monkeypatch.setitem(core._cfg, "llm_campos", {"firmantes": False})
+    versiones.add(core._version_cache())
+    monkeypatch.setenv("OSPRO_LOCAL_PRIMERO", "0")
+    versiones.add(core._version_cache())
+    monkeypatch.setitem(core._cfg, "umbral_confianza", 0.5)
+    versiones.add(core._version_cache())
+    monkeypatch.setenv("OSPRO_LLM_TOKENS", "1500")
+    versiones.add(core._version_cache())
+
+    assert len(versiones) == 5
+    assert core._version_cache() == core._version_cache()
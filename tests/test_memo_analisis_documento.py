@@ -0,0 +1,58 @@
+import pickle
+import sys
+import types
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Stubs for optional dependencies used by core.py
+sys.modules.setdefault("docx2txt", types.ModuleType("docx2txt"))
+sys.modules.setdefault("openai", types.ModuleType("openai"))
+st = types.ModuleType("streamlit")
+st.session_state = {}
+sys.modules.setdefault("streamlit", st)
+pdfminer = types.ModuleType("pdfminer")
+high = types.ModuleType("pdfminer.high_level")
+high.extract_text = lambda *a, **k: ""
+pdfminer.high_level = high
+sys.modules.setdefault("pdfminer", pdfminer)
+sys.modules.setdefault("pdfminer.high_level", high)
+
+import core
+from cache_sentencias import CacheSentencias
+
+
+
+def test_segmentacion_y_fichas_se_calculan_una_vez(tmp_path, monkeypatch, docx, respuesta_llm, errores_openai):
+    segmentaciones: list = []
+    fichas: list = []
+    orig_seg, orig_dp = core.segmentar_imputados, core._datos_personales_locales
+
+    def contar_seg(texto):
+        segmentaciones.append(texto)
+        return ["Juan Pérez, DNI 30.123.456", "Ana Gómez, DNI 31.222.333"]
+
+    def contar_dp(texto):
+        fichas.append(texto)
+        return orig_dp(texto)
+
+    monkeypatch.setattr(core, "segmentar_imputados", contar_seg)
+    monkeypatch.setattr(core, "_datos_personales_locales", contar_dp)
+    monkeypatch.setattr(core, "_extraer_nombres_gpt", lambda textos: [""] * len(textos))
+    monkeypatch.setattr(core, "obtener_cache", lambda _cfg=None: CacheSentencias(tmp_path, 1 << 20, activa=False))
+    rsp = respuesta_llm({"generales": {}})
+    client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=lambda **k: rsp)))
+    monkeypatch.setattr(core, "_get_openai_client", lambda: client)
+
+    core.procesar_sentencia(docx("Texto previo", "RESUELVO: I) Absolver."), "s.docx")
+
+    assert len(segmentaciones) == 1
+    assert len(fichas) == len(set(fichas))
+
+
+def test_analisis_viaja_por_pickle_con_lo_calculado(monkeypatch):
+    monkeypatch.setattr(core, "_extraer_nombres_gpt", lambda textos: [""] * len(textos))
+    analisis = core.AnalisisDocumento("RESUELVO: I) Absolver.").calcular()
+    copia = pickle.loads(pickle.dumps(analisis))
+    assert "imputados" in vars(copia) and "contexto_llm" in vars(copia)
+    assert copia.resuelvo == analisis.resuelvo
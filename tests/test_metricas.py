@@ -0,0 +1,83 @@
+import sys
+import types
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Stubs for optional dependencies used by core.py
+sys.modules.setdefault("docx2txt", types.ModuleType("docx2txt"))
+sys.modules.setdefault("openai", types.ModuleType("openai"))
+st = types.ModuleType("streamlit")
+st.session_state = {}
+sys.modules.setdefault("streamlit", st)
+pdfminer = types.ModuleType("pdfminer")
+high = types.ModuleType("pdfminer.high_level")
+high.extract_text = lambda *a, **k: ""
+pdfminer.high_level = high
+sys.modules.setdefault("pdfminer", pdfminer)
+sys.modules.setdefault("pdfminer.high_level", high)
+
+import core
+import metricas
+from cache_sentencias import CacheSentencias
+
+
+def test_exportar_prometheus():
+    m = metricas.Metricas()
+    m.describir("cache_total", "Consultas a la caché.")
+    m.contar("cache_total", resultado="acierto")
+    m.contar("cache_total", 2, resultado="acierto")
+    m.observar("etapa_ms", 7.5, etapa="llm")
+    m.observar("etapa_ms", 300, etapa="llm")
+
+    texto = m.exportar_prometheus()
+    assert "# HELP ospro_cache_total Consultas a la caché." in texto
+    assert "# TYPE ospro_cache_total counter" in texto
+    assert 'ospro_cache_total{resultado="acierto"} 3' in texto
+    assert "# TYPE ospro_etapa_ms histogram" in texto
+    assert 'ospro_etapa_ms_bucket{etapa="llm",le="5"} 0' in texto
+    assert 'ospro_etapa_ms_bucket{etapa="llm",le="10"} 1' in texto
+    assert 'ospro_etapa_ms_bucket{etapa="llm",le="+Inf"} 2' in texto
+    assert 'ospro_etapa_ms_sum{etapa="llm"} 307.5' in texto
+    assert 'ospro_etapa_ms_count{etapa="llm"} 2' in texto
+
+
+def test_recolectar_desvia_y_fusionar_aplica():
+    m = metricas.Metricas()
+    with m.recolectar() as registros:
+        m.contar("llm_llamadas_total", tipo="nombre", resultado="ok")
+        m.observar("etapa_ms", 12, etapa="llm_nombre")
+    assert m.instantanea() == {"contadores": {}, "tiempos_ms": {}}
+    m.fusionar(registros)
+    foto = m.instantanea()
+    assert foto["contadores"] == {"llm_llamadas_total[resultado=ok,tipo=nombre]": 1}
+    assert foto["tiempos_ms"]["etapa_ms[etapa=llm_nombre]"]["n"] == 1
+
+
+def test_procesar_sentencia_registra_etapas_tokens_y_cache(tmp_path, monkeypatch, respuesta_llm, errores_openai):
+    def create(**kwargs):
+        uso = types.SimpleNamespace(prompt_tokens=900, completion_tokens=40)
+        return respuesta_llm({"generales": {}, "imputados": []}, usage=uso)
+
+    cliente = types.SimpleNamespace(chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=create)))
+    monkeypatch.setattr(core, "_get_openai_client", lambda: cliente)
+    monkeypatch.setattr(core, "_local_primero", lambda: False)
+    monkeypatch.setattr(core, "extraer_texto", lambda *_a: "RESUELVO: I) Absolver.")
+    monkeypatch.setattr(core, "obtener_cache", lambda _cfg=None: CacheSentencias(tmp_path, 1 << 20))
+    monkeypatch.setattr(core, "metricas", m := metricas.Metricas())
+
+    core.procesar_sentencia(b"sentencia", "s.pdf")
+    core.procesar_sentencia(b"sentencia", "s.pdf")
+
+    foto = m.instantanea()
+    c, t = foto["contadores"], foto["tiempos_ms"]
+    assert c["cache_total[resultado=fallo]"] == 1
+    assert c["cache_total[resultado=acierto]"] == 1
+    assert c["sentencias_total[origen=motor]"] == 1
+    assert c["sentencias_total[origen=cache]"] == 1
+    assert c["llm_llamadas_total[resultado=ok,tipo=generales]"] == 1
+    assert c["llm_tokens_total[clase=prompt,tipo=generales]"] == 900
+    assert c["llm_tokens_total[clase=respuesta,tipo=generales]"] == 40
+    for etapa in ("extraccion", "regex", "llm", "postproceso"):
+        assert t[f"etapa_ms[etapa={etapa}]"]["n"] == 1
+    assert t["etapa_ms[etapa=total,origen=cache]"]["n"] == 1
@@ -0,0 +1,57 @@
+import json
+import sys
+import types
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Stubs for optional dependencies used by core.py
+sys.modules.setdefault("docx2txt", types.ModuleType("docx2txt"))
+sys.modules.setdefault("openai", types.ModuleType("openai"))
+
+import core
+
+DUDOSO_1 = "alias El Gordo, D.N.I. N° 30.123.456, de 30 años, argentino, con domicilio en calle Sol 12"
+DUDOSO_2 = "el imputado, D.N.I. N° 31.222.333, de 40 años de edad, de nacionalidad argentina"
+CLARO = "1) Juan Pérez, D.N.I. N° 32.444.555, de 25 años"
+
+
+def _cliente(pedidos: list):
+    def create(**kwargs):
+        textos = json.loads(kwargs["messages"][1]["content"])
+        pedidos.append(textos)
+        nombres = {i: ("RAÚL GÓMEZ" if "30.123.456" in t else "ana díaz") for i, t in textos.items()}
+        msg = types.SimpleNamespace(content=json.dumps({"nombres": nombres}))
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=msg)], usage=None)
+
+    return types.SimpleNamespace(chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=create)))
+
+
+def test_nombres_dudosos_van_en_un_solo_pedido_y_se_memorizan(monkeypatch):
+    pedidos: list = []
+    monkeypatch.setattr(core, "_get_openai_client", lambda: _cliente(pedidos))
+    monkeypatch.setattr(core, "_NOMBRES_MEMO", {})
+    monkeypatch.setattr(core, "segmentar_imputados", lambda _t: [DUDOSO_1, CLARO, DUDOSO_2])
+    monkeypatch.setattr(core, "_es_bloque_valido", lambda _b: True)
+
+    analisis = core.AnalisisDocumento("\n".join([DUDOSO_1, CLARO, DUDOSO_2]), acotar=False)
+    nombres = [imp["nombre"] for imp in analisis.imputados]
+
+    assert nombres == ["Raúl Gómez", "Juan Pérez", "Ana Díaz"]
+    assert len(pedidos) == 1
+    assert DUDOSO_1 in pedidos[0].values() and DUDOSO_2 in pedidos[0].values()
+    assert CLARO not in pedidos[0].values()
+
+    # mismo bloque con otros saltos de línea: sale de la memoria, sin pedido nuevo
+    assert core.extraer_datos_personales(DUDOSO_2.replace(", ", ",\n"))["nombre"] == "Ana Díaz"
+    assert len(pedidos) == 1
+
+
+def test_sin_cliente_queda_el_nombre_de_las_heuristicas(monkeypatch):
+    def sin_key():
+        raise RuntimeError("sin key")
+
+    monkeypatch.setattr(core, "_get_openai_client", sin_key)
+    monkeypatch.setattr(core, "_NOMBRES_MEMO", {})
+    assert core.extraer_datos_personales(DUDOSO_2)["nombre"] == "El Imputado"
+    assert core._NOMBRES_MEMO == {}
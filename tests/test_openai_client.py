@@ -0,0 +1,47 @@
+import sys
+import types
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Stubs for optional dependencies used by core.py
+sys.modules.setdefault("docx2txt", types.ModuleType("docx2txt"))
+sys.modules.setdefault("openai", types.ModuleType("openai"))
+st = types.ModuleType("streamlit")
+st.session_state = {}
+sys.modules.setdefault("streamlit", st)
+pdfminer = types.ModuleType("pdfminer")
+high = types.ModuleType("pdfminer.high_level")
+high.extract_text = lambda *a, **k: ""
+pdfminer.high_level = high
+sys.modules.setdefault("pdfminer", pdfminer)
+sys.modules.setdefault("pdfminer.high_level", high)
+
+import core
+
+
+def test_cliente_se_crea_una_vez_por_key(monkeypatch):
+    creados = []
+
+    class FakeOpenAI:
+        def __init__(self, **kwargs):
+            creados.append(kwargs)
+
+        @property
+        def models(self):  # pragma: no cover - no debe usarse
+            raise AssertionError("no se debe sondear models.list()")
+
+    monkeypatch.setattr(sys.modules["openai"], "OpenAI", FakeOpenAI, raising=False)
+    monkeypatch.setattr(core, "_OPENAI_CLIENTES", {})
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-proj-uno")
+
+    c1 = core._get_openai_client()
+    c2 = core._get_openai_client()
+    assert c1 is c2
+    assert len(creados) == 1
+    assert creados[0]["api_key"] == "sk-proj-uno"
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-proj-dos")
+    c3 = core._get_openai_client()
+    assert c3 is not c1
+    assert len(creados) == 2
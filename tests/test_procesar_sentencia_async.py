@@ -0,0 +1,153 @@
+import asyncio
+import sys
+import threading
+import types
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Stubs for optional dependencies used by core.py
+sys.modules.setdefault("docx2txt", types.ModuleType("docx2txt"))
+sys.modules.setdefault("openai", types.ModuleType("openai"))
+st = types.ModuleType("streamlit")
+st.session_state = {}
+sys.modules.setdefault("streamlit", st)
+pdfminer = types.ModuleType("pdfminer")
+high = types.ModuleType("pdfminer.high_level")
+high.extract_text = lambda *a, **k: ""
+pdfminer.high_level = high
+sys.modules.setdefault("pdfminer", pdfminer)
+sys.modules.setdefault("pdfminer.high_level", high)
+
+import core
+from cache_sentencias import CacheSentencias
+
+_RESPUESTA = {"generales": {"sent_num": "12", "sent_fecha": "3 de marzo de 2024"}, "imputados": []}
+
+
+def test_async_y_sync_devuelven_lo_mismo(tmp_path, monkeypatch, docx, respuesta_llm, errores_openai):
+    async def acreate(**kwargs):
+        await asyncio.sleep(0)
+        return respuesta_llm(_RESPUESTA)
+
+    async_client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=acreate)))
+    sync_client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=lambda **k: respuesta_llm(_RESPUESTA))))
+    monkeypatch.setattr(core, "_get_async_openai_client", lambda: async_client)
+    monkeypatch.setattr(core, "_get_openai_client", lambda: sync_client)
+    monkeypatch.setattr(core, "obtener_cache", lambda _cfg=None: CacheSentencias(tmp_path, 1 << 20, activa=False))
+
+    data = docx("Texto previo", "RESUELVO:", "I) Condenar a X.", "II) Costas.")
+
+    datos_async = asyncio.run(core.procesar_sentencia_async(data, "s.docx"))
+    datos_sync = core.procesar_sentencia(data, "s.docx")
+
+    assert datos_async == datos_sync
+    assert datos_async["generales"]["sent_num"] == "12"
+    assert datos_async["generales"]["resuelvo"].startswith("I) Condenar a X.")
+
+
+def test_lote_entrega_cada_resultado_y_aisla_errores(tmp_path, monkeypatch, docx, respuesta_llm, errores_openai):
+    en_curso = []
+    maximo = []
+
+    async def acreate(**kwargs):
+        en_curso.append(1)
+        maximo.append(len(en_curso))
+        await asyncio.sleep(0.01)
+        en_curso.pop()
+        return respuesta_llm(_RESPUESTA)
+
+    async_client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=acreate)))
+    monkeypatch.setattr(core, "_get_async_openai_client", lambda: async_client)
+    monkeypatch.setattr(core, "obtener_cache", lambda _cfg=None: CacheSentencias(tmp_path, 1 << 20, activa=False))
+
+    ruta = tmp_path / "disco.docx"
+    ruta.write_bytes(docx("RESUELVO:", "I) Absolver."))
+    archivos = [(f"s{i}.docx", docx("RESUELVO:", f"I) Condenar a {i}.")) for i in range(4)]
+    archivos += [("roto.txt", b"x"), ("disco.docx", ruta)]
+
+    async def _juntar():
+        return [r async for r in core.procesar_lote_async(archivos, max_llm=2)]
+
+    resultados = {r["archivo"]: r for r in asyncio.run(_juntar())}
+
+    assert len(resultados) == 6
+    assert resultados["roto.txt"]["ok"] is False
+    assert "ValueError" in resultados["roto.txt"]["error"]
+    assert resultados["disco.docx"]["datos"]["generales"]["resuelvo"].startswith("I) Absolver.")
+    assert all(resultados[f"s{i}.docx"]["ok"] for i in range(4))
+    assert max(maximo) <= 2
+
+
+def test_eventos_de_progreso(tmp_path, monkeypatch, docx, respuesta_llm, errores_openai):
+    async def acreate(**kwargs):
+        return respuesta_llm(_RESPUESTA)
+
+    async_client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=acreate)))
+    sync_client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=lambda **k: respuesta_llm(_RESPUESTA))))
+    monkeypatch.setattr(core, "_get_async_openai_client", lambda: async_client)
+    monkeypatch.setattr(core, "_get_openai_client", lambda: sync_client)
+    monkeypatch.setattr(core, "obtener_cache", lambda _cfg=None: CacheSentencias(tmp_path, 1 << 20, activa=False))
+
+    data = docx("Texto previo", "RESUELVO:", "I) Condenar a X.")
+
+    async def _juntar():
+        return [ev async for ev in core.procesar_sentencia_eventos(data, "s.docx")]
+
+    eventos = asyncio.run(_juntar())
+    nombres = [ev["evento"] for ev in eventos if ev["evento"] != "imputado"]
+    assert nombres == [
+        "texto_extraido", "pies_limpios", "llm_inicio", "bloque_imputados", "segmentados",
+        "llm_fin", "postproceso", "generales", "listo",
+    ]
+    assert eventos[-1]["datos"]["generales"]["sent_num"] == "12"
+
+    sync_eventos: list = []
+    datos = core.procesar_sentencia(data, "s.docx", progreso=sync_eventos.append)
+    assert [ev["evento"] for ev in sync_eventos if ev["evento"] != "imputado"] == nombres
+    assert sync_eventos[-1]["datos"] == datos == eventos[-1]["datos"]
+
+
+def test_heuristicas_corren_mientras_responde_el_modelo(tmp_path, monkeypatch, docx, respuesta_llm, errores_openai):
+    # El modelo no responde hasta que terminan las heurísticas, y éstas no
+    # terminan hasta que salió el pedido: si las dos etapas corrieran una
+    # detrás de la otra, alguna de las esperas vencería.
+    pedido, heuristicas = threading.Event(), threading.Event()
+    solapadas = []
+
+    async def acreate(**kwargs):
+        pedido.set()
+        solapadas.append(await asyncio.to_thread(heuristicas.wait, 5))
+        return respuesta_llm(_RESPUESTA)
+
+    def create(**kwargs):
+        pedido.set()
+        solapadas.append(heuristicas.wait(5))
+        return respuesta_llm(_RESPUESTA)
+
+    orig = core._segmentar_previo
+
+    def lento(analisis):
+        solapadas.append(pedido.wait(5))
+        heuristicas.set()
+        return orig(analisis)
+
+    async_client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=acreate)))
+    sync_client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=types.SimpleNamespace(create=create)))
+    monkeypatch.setattr(core, "_get_async_openai_client", lambda: async_client)
+    monkeypatch.setattr(core, "_get_openai_client", lambda: sync_client)
+    monkeypatch.setattr(core, "_segmentar_previo", lento)
+    monkeypatch.setattr(core, "obtener_cache", lambda _cfg=None: CacheSentencias(tmp_path, 1 << 20, activa=False))
+    data = docx("Texto previo", "RESUELVO:", "I) Condenar a X.")
+
+    eventos: list = []
+    core.procesar_sentencia(data, "s.docx", usar_cache=False, progreso=eventos.append)
+    assert solapadas == [True, True]
+    fin = next(ev for ev in eventos if ev["evento"] == "llm_fin")
+    assert fin["espera_ms"] <= fin["ms"]
+
+    pedido.clear()
+    heuristicas.clear()
+    solapadas.clear()
+    asyncio.run(core.procesar_sentencia_async(data, "s.docx", usar_cache=False))
+    assert solapadas == [True, True]
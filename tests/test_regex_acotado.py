@@ -0,0 +1,92 @@
+import sys
+import time
+import types
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Stubs for optional dependencies used by core.py
+sys.modules.setdefault("docx2txt", types.ModuleType("docx2txt"))
+sys.modules.setdefault("openai", types.ModuleType("openai"))
+
+import pytest
+
+import core
+import metricas
+
+# OCR sin comas ni saltos: NOMBRE_DNI_ANY y NOMBRE_RE retroceden en forma cuadrática
+OCR_RARO = "Palabras sueltas de un escaneo sin puntuacion " * 5000 + ", fin."
+
+
+def _motor_que_se_agota():
+    class _Compilado:
+        def search(self, *_a, **kw):
+            assert kw["timeout"] == 0.05
+            raise TimeoutError("regex time out")
+
+        finditer = search
+
+    return types.SimpleNamespace(compile=lambda *_a: _Compilado())
+
+
+def test_sin_modulo_regex_se_busca_en_una_ventana(monkeypatch):
+    monkeypatch.setattr(core, "_MOTOR_REGEX", False)
+    patron = core.PatronAcotado("NOMBRE_DNI_ANY", core.NOMBRE_DNI_ANY.re)
+
+    t0 = time.perf_counter()
+    assert patron.search(OCR_RARO) is None
+    assert time.perf_counter() - t0 < 2
+
+    cerca = "Juan Pérez, DNI 30.123.456"
+    assert patron.search(cerca).group(1) == "Juan Pérez"
+    assert patron.search("x" * core._REGEX_VENTANA + cerca) is None
+
+
+def test_la_ventana_que_deja_texto_afuera_se_cuenta(monkeypatch):
+    monkeypatch.setattr(core, "_MOTOR_REGEX", False)
+    monkeypatch.setattr(core, "metricas", m := metricas.Metricas())
+    nombre = core.PatronAcotado("NOMBRE_RE", core.NOMBRE_RE.re)
+    inicio = core.PatronAcotado("_NAME_START_RE", core._NAME_START_RE.re, ventana=core._NAME_START_RE.ventana)
+
+    nombre.search("Juan Pérez, DNI 30.123.456")
+    assert m.instantanea()["contadores"] == {}
+    nombre.search(OCR_RARO)
+    inicio.finditer(OCR_RARO)
+    assert m.instantanea()["contadores"] == {
+        "regex_ventana_total[patron=NOMBRE_RE]": 1,
+        "regex_ventana_total[patron=_NAME_START_RE]": 1,
+    }
+
+
+def test_tiempo_agotado_es_no_encontrado_y_se_cuenta(monkeypatch):
+    monkeypatch.setattr(core, "_MOTOR_REGEX", _motor_que_se_agota())
+    monkeypatch.setattr(core, "metricas", m := metricas.Metricas())
+    monkeypatch.setenv("OSPRO_REGEX_TIMEOUT_MS", "50")
+    patron = core.PatronAcotado("NOMBRE_RE", core.NOMBRE_RE.re)
+
+    assert patron.search(OCR_RARO) is None
+    assert patron.finditer(OCR_RARO) == []
+    assert m.instantanea()["contadores"] == {"regex_timeout_total[patron=NOMBRE_RE]": 2}
+
+
+def test_con_el_modulo_regex_real_se_corta_por_tiempo(monkeypatch):
+    regex = pytest.importorskip("regex")
+    monkeypatch.setattr(core, "_MOTOR_REGEX", regex)
+    monkeypatch.setattr(core, "metricas", m := metricas.Metricas())
+    monkeypatch.setenv("OSPRO_REGEX_TIMEOUT_MS", "50")
+    patron = core.PatronAcotado("NOMBRE_DNI_ANY", core.NOMBRE_DNI_ANY.re)
+
+    assert patron.search("Juan Pérez, DNI 30.123.456").group(1) == "Juan Pérez"
+    t0 = time.perf_counter()
+    assert patron.search(OCR_RARO) is None
+    assert time.perf_counter() - t0 < 2
+    assert m.instantanea()["contadores"] == {"regex_timeout_total[patron=NOMBRE_DNI_ANY]": 1}
+
+
+def test_datos_personales_de_un_ocr_raro_terminan_rapido(monkeypatch):
+    monkeypatch.setattr(core, "_MOTOR_REGEX", False)
+
+    t0 = time.perf_counter()
+    dp, dudoso = core._datos_personales_locales(OCR_RARO)
+    assert time.perf_counter() - t0 < 5
+    assert dudoso and not dp.get("dni")
@@ -0,0 +1,67 @@
+import sys
+import types
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Stubs for optional dependencies used by core.py
+sys.modules.setdefault("docx2txt", types.ModuleType("docx2txt"))
+sys.modules.setdefault("openai", types.ModuleType("openai"))
+
+import core
+
+ENCABEZADO = (
+    "CAMARA EN LO CRIMINAL Y CORRECCIONAL 6a NOM.\n"
+    "SENTENCIA NÚMERO: 12. En la ciudad de Córdoba, 5 de marzo de 2024, se dan a conocer los "
+    'fundamentos de la sentencia dictada en la causa caratulada "PÉREZ, Juan p.s.a. robo" '
+    "(SAC N° 1234567), por ante la Cámara en lo Criminal y Correccional de Sexta Nominación, "
+    "de esta ciudad, en la que han sido traídos a proceso los imputados:\n"
+    "1) Juan Pérez, de 30 años de edad, D.N.I. N° 30.123.456, argentino.\n"
+)
+HECHOS = "CONSIDERANDO:\n" + "Que analizada la prueba incorporada al debate, corresponde condenar. " * 200 + "\n"
+FINAL = (
+    "RESUELVO: I) Declarar a Juan Pérez autor penalmente responsable del delito de robo. "
+    "II) Protocolícese, hágase saber y ofíciese.\n"
+    "Texto Firmado digitalmente por: GARCIA Ana Laura\nVOCAL DE CAMARA\nFecha: 2024.03.05\n"
+)
+
+
+def test_mapa_ubica_cada_seccion():
+    mapa = core.mapear_secciones(ENCABEZADO + HECHOS + FINAL)
+
+    assert mapa.tramo("encabezado") == ENCABEZADO
+    assert mapa.tramo("imputados").strip().startswith("1) Juan Pérez")
+    assert mapa.tramo("hechos") == HECHOS
+    assert mapa.tramo("resuelvo").startswith("RESUELVO: I) Declarar")
+    assert mapa.tramo("cierre").startswith("Protocolícese")
+    assert mapa.tramo("firmas").startswith("Texto Firmado digitalmente")
+    assert mapa.desde("resuelvo") == FINAL
+
+
+def test_extractores_sobre_secciones_dan_lo_mismo_que_sobre_todo():
+    texto = ENCABEZADO + HECHOS + FINAL
+    a = core.AnalisisDocumento(texto)
+
+    assert a.bloque_imputados == core.extraer_bloque_imputados(texto)
+    assert a.resuelvo == core.extraer_resuelvo(texto)
+    assert a.firmantes == core.extraer_firmantes(texto)
+    assert a.generales_locales["caratula"]["valor"] == core.extraer_caratula(texto)
+    assert a.generales_locales["tribunal"]["valor"] == core.extraer_tribunal(texto)
+
+
+def test_tribunal_citado_en_los_considerandos_no_pisa_al_del_encabezado():
+    citado = "CONSIDERANDO:\nQue la resolución dictada por la Corte Suprema de Justicia, de fecha anterior, no aplica.\n"
+    texto = ENCABEZADO + citado + FINAL
+
+    assert core.extraer_tribunal(texto) == "Corte Suprema de Justicia"
+    tribunal = core.extraer_generales_locales(texto)["tribunal"]["valor"]
+    assert "CRIMINAL Y CORRECCIONAL" in tribunal and "Corte" not in tribunal
+
+
+def test_sin_marcas_el_encabezado_es_todo_el_texto():
+    texto = "Oficio sin estructura de sentencia, con el imputado Juan Pérez, D.N.I. N° 30.123.456."
+    mapa = core.mapear_secciones(texto)
+
+    assert mapa.tramo("encabezado") == texto
+    assert mapa.hechos is None and mapa.resuelvo is None and mapa.firmas is None
+    assert mapa.desde("resuelvo") == ""
@@ -0,0 +1,45 @@
+import sys
+import types
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Stubs for optional dependencies used by core.py
+sys.modules.setdefault("docx2txt", types.ModuleType("docx2txt"))
+sys.modules.setdefault("openai", types.ModuleType("openai"))
+st = types.ModuleType("streamlit")
+st.session_state = {}
+sys.modules.setdefault("streamlit", st)
+pdfminer = types.ModuleType("pdfminer")
+high = types.ModuleType("pdfminer.high_level")
+high.extract_text = lambda *a, **k: ""
+pdfminer.high_level = high
+sys.modules.setdefault("pdfminer", pdfminer)
+sys.modules.setdefault("pdfminer.high_level", high)
+
+import core
+
+
+def _sentencia() -> str:
+    cabecera = 'SENTENCIA NÚMERO: 12. En la ciudad de Córdoba, la Cámara en lo Criminal, en autos "PEREZ, Juan p.s.a. robo" (SAC N° 123).\n'
+    considerandos = "CONSIDERANDO: el análisis de la prueba. " * 4000
+    final = "RESUELVO: I) Declarar a Juan Pérez autor penalmente responsable. II) Protocolícese.\nFirmado digitalmente por: GARCIA, Ana - VOCAL"
+    return cabecera + considerandos + final
+
+
+def test_contexto_respeta_el_presupuesto_y_conserva_extremos():
+    texto = _sentencia()
+    ctx = core.seleccionar_contexto(texto, "los imputados: Juan Pérez, DNI 30.123.456", max_tokens=1000)
+
+    assert core.estimar_tokens(ctx) <= 1000 + 20
+    assert core.estimar_tokens(texto) > 10 * core.estimar_tokens(ctx)
+    assert ctx.startswith("SENTENCIA NÚMERO: 12")
+    assert "(SAC N° 123)" in ctx
+    assert "RESUELVO: I) Declarar a Juan Pérez" in ctx
+    assert ctx.endswith("GARCIA, Ana - VOCAL")
+    assert "DNI 30.123.456" in ctx
+
+
+def test_texto_corto_se_envia_completo():
+    texto = "SENTENCIA N° 1. RESUELVO: I) Absolver."
+    assert core.seleccionar_contexto(texto, max_tokens=1000) == texto
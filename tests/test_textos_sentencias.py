@@ -0,0 +1,134 @@
+import os
+import sqlite3
+import sys
+import types
+import zlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Stubs for optional dependencies used by core.py
+sys.modules.setdefault("docx2txt", types.ModuleType("docx2txt"))
+sys.modules.setdefault("openai", types.ModuleType("openai"))
+st = types.ModuleType("streamlit")
+st.session_state = {}
+sys.modules.setdefault("streamlit", st)
+pdfminer = types.ModuleType("pdfminer")
+high = types.ModuleType("pdfminer.high_level")
+high.extract_text = lambda *a, **k: ""
+pdfminer.high_level = high
+sys.modules.setdefault("pdfminer", pdfminer)
+sys.modules.setdefault("pdfminer.high_level", high)
+
+import core
+import reanalizar
+from cache_sentencias import hash_documento
+from textos_sentencias import TextosSentencias
+
+
+def test_guarda_y_recupera_comprimido(tmp_path):
+    textos = TextosSentencias(tmp_path / "t.sqlite3")
+    assert textos.obtener(b"%PDF uno") is None
+    textos.guardar(b"%PDF uno", "uno.pdf", "crudo Ã¡", extremos=(5, 3))
+    doc = textos.obtener(b"%PDF uno")
+    assert (doc.nombre, doc.crudo, doc.extremos, doc.completo) == ("uno.pdf", "crudo Ã¡", (5, 3), False)
+    assert len(textos) == 1
+
+
+def test_poda_los_documentos_usados_hace_mas_tiempo(tmp_path):
+    textos = TextosSentencias(tmp_path / "t.sqlite3", max_bytes=3500)
+    textos.guardar(b"doc0", "doc0.pdf", os.urandom(1500).hex())
+    textos.guardar(b"doc1", "doc1.pdf", os.urandom(1500).hex())
+    textos.obtener(b"doc0")   # el primero se sigue usando
+    textos.guardar(b"doc2", "doc2.pdf", os.urandom(1500).hex())
+
+    assert textos.obtener(b"doc1") is None
+    assert textos.obtener(b"doc0") is not None and textos.obtener(b"doc2") is not None
+
+
+def test_migra_la_base_anterior(tmp_path):
+    ruta = tmp_path / "t.sqlite3"
+    con = sqlite3.connect(ruta)
+    con.execute(
+        "CREATE TABLE textos (hash TEXT PRIMARY KEY, nombre TEXT NOT NULL, crudo BLOB NOT NULL, "
+        "limpio BLOB NOT NULL, completo INTEGER NOT NULL DEFAULT 1, creado REAL NOT NULL, "
+        "resumen TEXT, version TEXT)"
+    )
+    for nombre, completo in (("entero", 1), ("parcial", 0)):
+        blob = zlib.compress(nombre.encode())
+        con.execute(
+            "INSERT INTO textos VALUES (?, ?, ?, ?, ?, 0, NULL, NULL)",
+            (hash_documento(nombre.encode()), nombre, blob, blob, completo),
+        )
+    con.commit()
+    con.close()
+
+    textos = TextosSentencias(ruta)
+    assert textos.obtener(b"entero").crudo == "entero"
+    # de la lectura parcial no se sabe qué páginas se leyeron: se descarta
+    assert textos.obtener(b"parcial") is None
+
+
+def test_texto_limpio_no_vuelve_a_extraer(tmp_path, monkeypatch):
+    textos = TextosSentencias(tmp_path / "t.sqlite3")
+    extracciones = []
+
+    def extraer(data, nombre):
+        extracciones.append(nombre)
+        return "Expediente SAC 123 - Pag. 1 / 2 - Nro. Res. 4 RESUELVO: I) Absolver."
+
+    monkeypatch.setattr(core, "obtener_textos", lambda _cfg=None: textos)
+    monkeypatch.setattr(core, "extraer_texto", extraer)
+
+    primero = core._texto_limpio(b"sentencia", "s.docx")
+    segundo = core._texto_limpio(b"sentencia", "s.docx")
+    assert primero == segundo
+    assert extracciones == ["s.docx"]
+    assert "Expediente SAC" not in primero[1]
+
+
+def test_lectura_parcial_se_reusa_con_los_mismos_extremos(tmp_path, monkeypatch):
+    textos = TextosSentencias(tmp_path / "t.sqlite3")
+    lecturas = []
+
+    def dirigido(data, nombre):
+        lecturas.append(core._paginas_extremos())
+        return "RESUELVO: I) Absolver.", False
+
+    monkeypatch.setattr(core, "obtener_textos", lambda _cfg=None: textos)
+    monkeypatch.setattr(core, "_extraer_texto_dirigido", dirigido)
+    monkeypatch.setitem(core._cfg, "paginas_cabeza", 5)
+
+    core._texto_limpio(b"%PDF largo", "s.pdf")
+    core._texto_limpio(b"%PDF largo", "s.pdf")
+    assert lecturas == [(5, core._PAGINAS_COLA)]
+    assert textos.obtener(b"%PDF largo").extremos == (5, core._PAGINAS_COLA)
+
+    # con otros extremos la lectura parcial guardada ya no sirve
+    monkeypatch.setitem(core._cfg, "paginas_cabeza", 8)
+    core._texto_limpio(b"%PDF largo", "s.pdf")
+    assert lecturas == [(5, core._PAGINAS_COLA), (8, core._PAGINAS_COLA)]
+
+
+def test_reanalizar_informa_campos_cambiados(tmp_path, monkeypatch):
+    textos = TextosSentencias(tmp_path / "t.sqlite3")
+    for i in range(3):
+        textos.guardar(f"doc{i}".encode(), f"doc{i}.pdf", f"SENTENCIA N° {i}")
+
+    monkeypatch.setattr(core, "resumen_heuristico", lambda t: {"sent_num": t[-1], "tribunal": ""})
+    primero = reanalizar.reanalizar(textos, guardar=True)
+    assert primero["documentos"] == 3 and primero["sin_referencia"] == 3
+
+    # una "mejora" de las regex cambia el tribunal de un documento
+    monkeypatch.setattr(
+        core, "resumen_heuristico",
+        lambda t: {"sent_num": t[-1], "tribunal": "Cámara 1" if t.endswith("1") else ""},
+    )
+    informe = reanalizar.reanalizar(textos)
+    assert informe["con_cambios"] == 1
+    assert informe["cambios_por_campo"] == {"tribunal": 1}
+    assert informe["ejemplos"]["tribunal"][0] == {
+        "documento": "doc1.pdf", "hash": informe["ejemplos"]["tribunal"][0]["hash"],
+        "antes": "", "ahora": "Cámara 1",
+    }
+    assert informe["docs_por_segundo"] > 0
@@ -0,0 +1,34 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from validadores import Validador, caratula_valida, tribunal_valido
+
+
+def test_caratula_valida_con_comillas_y_numero():
+    assert caratula_valida('"Pérez, Juan p.s.a. robo" (SAC N° 1.234.567)')
+    assert caratula_valida("“Gómez, Ana” (Expte. 12345)")
+    assert not caratula_valida('"Pérez, Juan p.s.a. robo"')
+    assert not caratula_valida("Cámara en lo Criminal de 1ª Nominación")
+    assert not caratula_valida("")
+
+
+def test_tribunal_valido():
+    assert tribunal_valido("Cámara en lo Criminal y Correccional de 3ª Nominación")
+    assert not tribunal_valido("CAMARA EN LO CRIMINAL")
+    assert not tribunal_valido("cámara en lo criminal")
+
+
+def test_puntajes_por_campo():
+    v = Validador(["la Cámara en lo Criminal de 1ª Nominación"])
+    puntajes = v.puntajes({
+        "caratula": '"Pérez" (SAC N° 99)',
+        "tribunal": "Cámara en lo Criminal de 1ª Nominación",
+        "sent_num": "12",
+        "sent_fecha": "3 de marzo de 2024",
+    })
+    assert puntajes == {"caratula": 0.9, "tribunal": 0.95, "sent_num": 0.9, "sent_fecha": 0.85}
+
+    vacios = v.puntajes({"sent_num": "Sentencia N° 12", "sent_fecha": "el 3/4/2024"})
+    assert vacios == {"caratula": 0.0, "tribunal": 0.0, "sent_num": 0.3, "sent_fecha": 0.3}
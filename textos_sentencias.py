@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""
+textos_sentencias.py – textos extraídos, guardados una vez por documento
+-------------------------------------------------------------------------
+
+Base SQLite con el texto crudo (tal como sale de pdfminer/DOCX) de cada
+sentencia procesada, indexado por el SHA-256 de los bytes del archivo y
+comprimido con ``zlib``.  La limpieza (pies de página, mojibake) no se
+guarda: se rehace en cada lectura, por si cambió.
+
+A diferencia de ``cache_sentencias`` (que guarda el resultado final y se
+invalida al cambiar el extractor o el prompt), estos textos no dependen de
+las heurísticas: sirven para no volver a decodificar un PDF ya visto y para
+correr las regex nuevas sobre todo el corpus histórico (``reanalizar.py``).
+Cada fila guarda además el último resumen de heurísticas, para poder
+informar qué campos cambian de una versión a otra.
+
+Si el PDF se leyó sólo por sus extremos (ver ``core._extraer_texto_dirigido``)
+la fila guarda cuántas páginas se leyeron al principio y al final
+(``cabeza`` / ``cola``); con los mismos bytes y los mismos extremos la
+lectura da el mismo texto, así que la fila sirve mientras no cambien.
+
+El tamaño está acotado igual que en ``cache_sentencias``: al superar el
+límite se borran los documentos usados hace más tiempo.  Son textos con
+datos personales; la base se desactiva con ``OSPRO_TEXTOS=0``.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple
+
+from cache_sentencias import hash_documento
+
+RUTA_DEFAULT = Path.home() / ".cache" / "ospro" / "textos.sqlite3"
+MAX_MB_DEFAULT = 500
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS textos (
+    hash        TEXT PRIMARY KEY,
+    nombre      TEXT NOT NULL,
+    crudo       BLOB NOT NULL,
+    cabeza      INTEGER,
+    cola        INTEGER,
+    creado      REAL NOT NULL,
+    usado       REAL NOT NULL,
+    resumen     TEXT,
+    version     TEXT
+)
+"""
+_COLUMNAS = ["hash", "nombre", "crudo", "cabeza", "cola", "creado", "usado", "resumen", "version"]
+_SELECT = "SELECT hash, nombre, crudo, cabeza, cola, resumen, version FROM textos WHERE hash = ?"
+
+
+def _comprimir(texto: str) -> bytes:
+    return zlib.compress(texto.encode("utf-8"), 6)
+
+
+def _descomprimir(blob: bytes) -> str:
+    return zlib.decompress(blob).decode("utf-8")
+
+
+@dataclass
+class TextoGuardado:
+    hash: str
+    nombre: str
+    crudo: str
+    extremos: Tuple[int, int] | None    # (cabeza, cola) si la lectura fue parcial
+    resumen: Dict[str, Any] | None
+    version: str | None
+
+    @property
+    def completo(self) -> bool:
+        return self.extremos is None
+
+
+class TextosSentencias:
+    """Texto crudo por hash de documento, en una base SQLite de tamaño acotado."""
+
+    def __init__(self, ruta: str | os.PathLike, max_bytes: int = MAX_MB_DEFAULT * 1024 * 1024,
+                 *, activa: bool = True):
+        self.ruta = Path(ruta)
+        self.max_bytes = max_bytes
+        self.activa = activa
+        self._lock = threading.Lock()
+        self._conexiones = threading.local()
+
+    def _conexion(self) -> sqlite3.Connection:
+        # una conexión por hilo; WAL permite leer mientras otro proceso escribe
+        con = getattr(self._conexiones, "con", None)
+        if con is None:
+            self.ruta.parent.mkdir(parents=True, exist_ok=True)
+            con = sqlite3.connect(self.ruta, timeout=30)
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute(_ESQUEMA)
+            self._migrar(con)
+            self._conexiones.con = con
+        return con
+
+    @staticmethod
+    def _migrar(con: sqlite3.Connection) -> None:
+        # bases de la versión anterior (columnas limpio/completo): se conservan
+        # sólo los textos completos, de los parciales no se sabe qué se leyó
+        columnas = [c[1] for c in con.execute("PRAGMA table_info(textos)")]
+        if columnas == _COLUMNAS:
+            return
+        with con:
+            con.execute("ALTER TABLE textos RENAME TO textos_viejos")
+            con.execute(_ESQUEMA)
+            con.execute(
+                "INSERT INTO textos (hash, nombre, crudo, creado, usado, resumen, version) "
+                "SELECT hash, nombre, crudo, creado, creado, resumen, version "
+                "FROM textos_viejos WHERE completo = 1"
+            )
+            con.execute("DROP TABLE textos_viejos")
+
+    # ── lectura / escritura ───────────────────────────────────────
+    def guardar(self, file_bytes: bytes, nombre: str, crudo: str, *,
+                extremos: Tuple[int, int] | None = None) -> None:
+        """Guarda (o reemplaza) el texto del documento; nunca rompe la extracción.
+
+        ``extremos`` es el ``(cabeza, cola)`` de la lectura parcial, o
+        ``None`` si el texto está completo.
+        """
+        if not self.activa:
+            return
+        cabeza, cola = extremos or (None, None)
+        ahora = time.time()
+        try:
+            con = self._conexion()
+            with con:
+                con.execute(
+                    "INSERT INTO textos (hash, nombre, crudo, cabeza, cola, creado, usado) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(hash) DO UPDATE SET nombre=excluded.nombre, crudo=excluded.crudo, "
+                    "cabeza=excluded.cabeza, cola=excluded.cola, usado=excluded.usado",
+                    (hash_documento(file_bytes), nombre, _comprimir(crudo), cabeza, cola, ahora, ahora),
+                )
+            self._podar(con)
+        except (OSError, sqlite3.Error):
+            return
+
+    def obtener(self, file_bytes: bytes) -> TextoGuardado | None:
+        """Textos del documento, o ``None`` si no está (o la base no se puede leer)."""
+        if not self.activa:
+            return None
+        hash_doc = hash_documento(file_bytes)
+        try:
+            con = self._conexion()
+            fila = con.execute(_SELECT, (hash_doc,)).fetchone()
+            if fila:
+                with con:   # "toca" la fila para el LRU
+                    con.execute("UPDATE textos SET usado = ? WHERE hash = ?", (time.time(), hash_doc))
+        except (OSError, sqlite3.Error):
+            return None
+        return self._fila(fila) if fila else None
+
+    def guardar_resumen(self, hash_doc: str, resumen: Dict[str, Any], version: str) -> None:
+        """Resumen de heurísticas de referencia para la próxima comparación."""
+        con = self._conexion()
+        with con:
+            con.execute(
+                "UPDATE textos SET resumen = ?, version = ? WHERE hash = ?",
+                (json.dumps(resumen, ensure_ascii=False), version, hash_doc),
+            )
+
+    def recorrer(self, limite: int | None = None) -> Iterator[TextoGuardado]:
+        """Todos los documentos guardados, del más viejo al más nuevo."""
+        if not self.activa or not self.ruta.exists():
+            return
+        consulta = "SELECT hash FROM textos ORDER BY creado"
+        if limite:
+            consulta += f" LIMIT {int(limite)}"
+        con = self._conexion()
+        # primero las claves: así se puede guardar_resumen() mientras se recorre
+        for (hash_doc,) in con.execute(consulta).fetchall():
+            fila = con.execute(_SELECT, (hash_doc,)).fetchone()
+            if fila:
+                yield self._fila(fila)
+
+    def __len__(self) -> int:
+        if not self.activa or not self.ruta.exists():
+            return 0
+        return self._conexion().execute("SELECT COUNT(*) FROM textos").fetchone()[0]
+
+    @staticmethod
+    def _fila(fila: tuple) -> TextoGuardado:
+        hash_doc, nombre, crudo, cabeza, cola, resumen, version = fila
+        return TextoGuardado(
+            hash=hash_doc,
+            nombre=nombre,
+            crudo=_descomprimir(crudo),
+            extremos=None if cabeza is None else (cabeza, cola),
+            resumen=json.loads(resumen) if resumen else None,
+            version=version,
+        )
+
+    # ── límite de tamaño ─────────────────────────────────────────
+    def _podar(self, con: sqlite3.Connection) -> None:
+        """Borra los documentos usados hace más tiempo hasta entrar en el límite.
+
+        Cuenta el tamaño de los textos comprimidos; SQLite reutiliza las
+        páginas liberadas, así que el archivo deja de crecer aunque no se
+        achique.
+        """
+        total = con.execute("SELECT COALESCE(SUM(LENGTH(crudo)), 0) FROM textos").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        borrar = []
+        for hash_doc, size in con.execute("SELECT hash, LENGTH(crudo) FROM textos ORDER BY usado"):
+            if total <= self.max_bytes:
+                break
+            borrar.append((hash_doc,))
+            total -= size
+        with con:
+            con.executemany("DELETE FROM textos WHERE hash = ?", borrar)
+
+
+# ── instancia compartida por proceso ─────────────────────────────
+_TEXTOS: TextosSentencias | None = None
+_TEXTOS_LOCK = threading.Lock()
+
+
+def obtener_textos(cfg: Dict[str, Any] | None = None) -> TextosSentencias:
+    """Devuelve la base de textos del proceso (se crea una sola vez).
+
+    Prioridad: ``OSPRO_TEXTOS_DB``, ``OSPRO_TEXTOS_MAX_MB``, ``OSPRO_TEXTOS=0``
+    para desactivar → ``config.json`` (``textos_db``, ``textos_max_mb``,
+    ``textos``) → ``~/.cache/ospro/textos.sqlite3`` con 500 MB.
+    """
+    global _TEXTOS
+    with _TEXTOS_LOCK:
+        if _TEXTOS is None:
+            cfg = cfg or {}
+            ruta = os.environ.get("OSPRO_TEXTOS_DB") or cfg.get("textos_db") or RUTA_DEFAULT
+            try:
+                max_mb = float(os.environ.get("OSPRO_TEXTOS_MAX_MB") or cfg.get("textos_max_mb") or MAX_MB_DEFAULT)
+            except ValueError:
+                max_mb = MAX_MB_DEFAULT
+            activa = os.environ.get("OSPRO_TEXTOS", "1") != "0" and cfg.get("textos", True) is not False
+            _TEXTOS = TextosSentencias(ruta, int(max_mb * 1024 * 1024), activa=activa)
+        return _TEXTOS
+
+
+__all__ = ["TextosSentencias", "TextoGuardado", "obtener_textos"]
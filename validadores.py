@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+validadores.py – validación de los datos generales de una sentencia
+--------------------------------------------------------------------
+
+Patrones ``re`` precompilados para decidir si la carátula, el tribunal, el
+número y la fecha de sentencia tienen una forma plausible, y un puntaje
+(0–1) por campo.  Lo usan ``core`` (para decidir entre el valor del modelo
+y el de las heurísticas) y la app de escritorio (``ospro.py``), así las dos
+validan igual sin depender de qué binding de Qt esté instalado.
+
+Los widgets de Qt que necesitan un ``QRegularExpressionValidator`` lo
+arman con los patrones en texto (``CARATULA_PATRON``, ``TRIBUNAL_PATRON``).
+"""
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, Iterable
+
+MESES = "enero|febrero|marzo|abril|mayo|junio|julio|agosto|septiembre|setiembre|octubre|noviembre|diciembre"
+
+# Carátula: título entre comillas (rectas o tipográficas) y el número de
+# expediente o SAC entre paréntesis al final.
+CARATULA_PATRON = r'^["“][^"”]+["”]\s*\(\s*(?:SAC|Expte\.?|EE\.?)\s*(?:N[°º]?\s*)?\d[\d.]*\s*\)$'
+# Tribunal: empieza en mayúscula y tiene al menos una minúscula
+TRIBUNAL_PATRON = r'^(?=.*[a-záéíóúñ])[A-ZÁÉÍÓÚÑ].*$'
+
+CARATULA_RE = re.compile(CARATULA_PATRON)
+TRIBUNAL_RE = re.compile(TRIBUNAL_PATRON)
+_CARAT_NUMERO_RE = re.compile(r"\((?:SAC|EE|Expte)\b[^)]*\d")
+_TRIB_INICIO_RE = re.compile(r"^(?:la\s+|el\s+)?(?:Cámara|Juzgado|Tribunal|Sala|Corte)\b", re.I)
+_ARTICULO_RE = re.compile(r"^(?:la|el)\s+", re.I)
+_NUM_RE = re.compile(r"\d{1,5}")
+_NUM_EN_TEXTO_RE = re.compile(r"\b\d{1,5}\b")
+_FECHA_RE = re.compile(
+    rf"\d{{1,2}}\s+de\s+(?:{MESES})\s+(?:de|del)\s+\d{{4}}|\d{{1,2}}/\d{{1,2}}/\d{{4}}", re.I
+)
+
+
+def caratula_valida(texto: str) -> bool:
+    """``True`` si la carátula tiene la forma ``"Título" (SAC N° 123)``."""
+    return bool(CARATULA_RE.match(texto or ""))
+
+
+def tribunal_valido(texto: str) -> bool:
+    """``True`` si el tribunal empieza en mayúscula y no está todo en mayúsculas."""
+    return bool(TRIBUNAL_RE.match(texto or ""))
+
+
+def _sin_articulo(texto: str) -> str:
+    return _ARTICULO_RE.sub("", texto.strip()).lower()
+
+
+class Validador:
+    """Puntajes por campo; ``tribunales`` es la lista de nombres conocidos."""
+
+    def __init__(self, tribunales: Iterable[str] = ()):
+        self._tribunales = frozenset(_sin_articulo(t) for t in tribunales)
+
+    def caratula(self, valor: str) -> float:
+        if not valor:
+            return 0.0
+        if _CARAT_NUMERO_RE.search(valor):
+            return 0.9
+        return 0.5 if caratula_valida(valor) else 0.3
+
+    def tribunal(self, valor: str) -> float:
+        if not valor:
+            return 0.0
+        if _sin_articulo(valor) in self._tribunales:
+            return 0.95
+        if _TRIB_INICIO_RE.match(valor) and len(valor.split()) >= 3:
+            return 0.85
+        return 0.5
+
+    @staticmethod
+    def sent_num(valor: str) -> float:
+        valor = (valor or "").strip()
+        if _NUM_RE.fullmatch(valor):
+            return 0.9
+        return 0.3 if _NUM_EN_TEXTO_RE.search(valor) else 0.0
+
+    @staticmethod
+    def sent_fecha(valor: str) -> float:
+        valor = (valor or "").strip()
+        if _FECHA_RE.fullmatch(valor):
+            return 0.85
+        return 0.3 if _FECHA_RE.search(valor) else 0.0
+
+    def puntajes(self, generales: Dict[str, Any]) -> Dict[str, float]:
+        """``{"caratula": 0.9, "tribunal": 0.5, "sent_num": 0.9, "sent_fecha": 0.0}``."""
+        return {
+            campo: getattr(self, campo)(str(generales.get(campo) or "").strip())
+            for campo in ("caratula", "tribunal", "sent_num", "sent_fecha")
+        }
+
+
+__all__ = [
+    "CARATULA_PATRON",
+    "TRIBUNAL_PATRON",
+    "CARATULA_RE",
+    "TRIBUNAL_RE",
+    "MESES",
+    "Validador",
+    "caratula_valida",
+    "tribunal_valido",
+]